@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""This module precomputes everything needed on the alternatives of a repetition."""
+
+import hashlib
+import numpy as np
+from alternatives.data_preparation import get_pareto_efficient_mask
+
+class AlternativeSet:
+    """
+    Alternatives of a repetition, with their model-specific form, their
+    pairwise differences and their scores, computed once.
+    """
+
+    def __init__(self, alternatives, model, max_dense_size = 2**20):
+        """
+        Parameters
+        ----------
+        alternatives : array_like
+            Number of rows alternatives, and number of columns criteria.
+        model : Model
+            The aggregation model.
+        max_dense_size : integer, optional
+            Maximal number of values of the dense tensor of differences. Beyond,
+            differences are computed when accessed. The default is 2**20.
+        """
+        self._alternatives = np.asarray(alternatives)
+        self._model = model
+        self._opti_alternatives = model.get_opti_alternatives(self._alternatives)
+        self._scores = model.get_model_score(self._alternatives)
+        self._max_dense_size = max_dense_size
+        self._pareto_mask = None
+        self._diff = None
+        self._hash = None
+
+    def __len__(self):
+        return self._alternatives.shape[0]
+
+    def __getitem__(self, key):
+        return self._alternatives[key]
+
+    def get_alternatives(self):
+        """
+        Get the alternatives.
+        """
+        return self._alternatives
+
+    def get_model(self):
+        """
+        Get the model.
+        """
+        return self._model
+
+    def get_opti_alternatives(self):
+        """
+        Get the alternatives in the correct form for optimisation (sorted for OWA).
+        """
+        return self._opti_alternatives
+
+    def get_scores(self):
+        """
+        Get the score of each alternative according to the model.
+        """
+        return self._scores
+
+    def get_hash(self):
+        """
+        Get a hash of the alternatives in the form for optimisation, the same
+        for the same alternatives in another repetition or run.
+        """
+        if self._hash is None:
+            opti_alternatives = np.ascontiguousarray(self._opti_alternatives, dtype = float)
+            digest = hashlib.sha1(str(opti_alternatives.shape).encode())
+            digest.update(opti_alternatives.tobytes())
+            self._hash = digest.hexdigest()
+        return self._hash
+
+    def get_pareto_efficient_mask(self):
+        """
+        Get a mask of the pareto efficient alternatives.
+        """
+        if self._pareto_mask is None:
+            self._pareto_mask = get_pareto_efficient_mask(self._alternatives)
+        return self._pareto_mask
+
+    def get_pareto_efficient_alternatives(self):
+        """
+        Get the pareto efficient alternatives.
+        """
+        return self._alternatives[self.get_pareto_efficient_mask()]
+
+    def get_diff_tensor(self):
+        """
+        Get the differences between alternatives: [i, j] is the difference
+        between j and i, criterion by criterion (for the PMR of i against j).
+
+        Returns
+        -------
+        array_like
+            Dense (n x n x p) array if small enough, a lazy view otherwise.
+        """
+        if self._diff is None:
+            nb_alternatives, nb_parameters = self._opti_alternatives.shape
+            if nb_alternatives * nb_alternatives * nb_parameters <= self._max_dense_size:
+                self._diff = self._opti_alternatives[np.newaxis,:,:] - self._opti_alternatives[:,np.newaxis,:]
+            else:
+                self._diff = LazyDiffTensor(self._opti_alternatives)
+        return self._diff
+
+class LazyDiffTensor:
+    """
+    View of the differences between alternatives, computed only when accessed.
+    """
+
+    def __init__(self, opti_alternatives):
+        """
+        Parameters
+        ----------
+        opti_alternatives : array_like
+            Alternatives in the correct form for optimisation.
+        """
+        self._opti_alternatives = opti_alternatives
+        nb_alternatives, nb_parameters = opti_alternatives.shape
+        self.shape = (nb_alternatives, nb_alternatives, nb_parameters)
+
+    def __getitem__(self, key):
+        i, j = key[0], key[1]
+        first = self._opti_alternatives[i]
+        second = self._opti_alternatives[j]
+        if first.ndim == 2 and second.ndim == 2:
+            return second[np.newaxis,:,:] - first[:,np.newaxis,:]
+        return second - first
+
+def as_alternative_set(alternatives, model):
+    """
+    Get an AlternativeSet, built if needed.
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    model : Model
+        The aggregation model.
+
+    Returns
+    -------
+    AlternativeSet
+        The alternatives with everything precomputed.
+    """
+    if isinstance(alternatives, AlternativeSet):
+        return alternatives
+    return AlternativeSet(alternatives, model)
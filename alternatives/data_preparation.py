@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 """This module generates multi-criteria alternatives."""
 
+from math import comb, factorial
 import numpy as np
 
-def generate_alternatives_score(nb_alternatives, nb_parameters, value, delta = 0.05, multiplicator = 100):
+def generate_alternatives_score(nb_alternatives, nb_parameters, value, delta = 0.05, multiplicator = 100,
+                                max_rounds = 100, rng = None):
     """Generate alternatives according to an uniform distribution with parameters having a common sum value.
 
+    Alternatives are drawn directly in the slab, and drawn again until there
+    are enough pareto efficient ones.
+
     Parameters
     ----------
     nb_alternatives : integer
-        Number of alternatives you would like to have. Can return less.
+        Number of alternatives you would like to have.
     nb_parameters : integer
         Number of paremeters for each alternative.
     value : float
@@ -17,21 +22,136 @@ def generate_alternatives_score(nb_alternatives, nb_parameters, value, delta = 0
     delta : float
         Relaxation of the value: each alternative has a value between [score - delta, score + delta].    
     multiplicator : integer
-        Number of alternatives generated: nb_alternatives*multiplicator.     
+        Each draw has as many alternatives as nb_alternatives*multiplicator
+        uniform alternatives would have in the slab.
+    max_rounds : integer
+        Maximum number of draws. The default is 100.
+    rng : RandomState, optional
+        Random generator. The default is None (the global one of numpy.random).
         
     Returns
     -------
     array_like
         Pereto efficient alternatives.
+
+    Raises
+    ------
+    ValueError
+        If the slab is empty, or if there are not enough pareto efficient
+        alternatives after max_rounds draws (with one parameter, there is
+        only one).
     """
+    lower = max(value - delta, 0)
+    upper = min(value + delta, nb_parameters)
+    slab_probability = (_irwin_hall_cdf(upper, nb_parameters)
+                        - _irwin_hall_cdf(lower, nb_parameters))
+    if slab_probability <= 0:
+        raise ValueError('No alternative of {} parameters has a sum in [{}, {}].'.format(
+            nb_parameters, value - delta, value + delta))
+    nb_draws = max(int(np.ceil(multiplicator * nb_alternatives * slab_probability)), nb_alternatives)
     alternatives = np.empty((0, nb_parameters))
-    new_alternatives = np.random.uniform(0, 1, (multiplicator * nb_alternatives, nb_parameters))
-    total_score_alternatives = np.sum(new_alternatives, axis = 1)
-    new_alternatives = new_alternatives[(total_score_alternatives >= value - delta) & (total_score_alternatives <= value + delta)]
-    new_alternatives_pareto = get_pareto_efficient_alternatives(new_alternatives)
-    new_alternatives_pareto = new_alternatives_pareto[0:np.minimum(nb_alternatives,new_alternatives_pareto.shape[0]), :]
-    alternatives = np.vstack((alternatives, new_alternatives_pareto))
-    return alternatives
+    for _ in range(0, max_rounds):
+        new_alternatives = sample_uniform_slab(nb_draws, nb_parameters, value, delta, rng)
+        alternatives = get_pareto_efficient_alternatives(np.vstack((alternatives, new_alternatives)))
+        if alternatives.shape[0] >= nb_alternatives:
+            return alternatives[0:nb_alternatives, :]
+    raise ValueError('Only {} pareto efficient alternatives found in {} draws, {} asked.'.format(
+        alternatives.shape[0], max_rounds, nb_alternatives))
+
+def sample_uniform_slab(nb_samples, nb_parameters, value, delta = 0.05, rng = None):
+    """Draw uniformly in the unit cube, restricted to a sum in [value - delta, value + delta].
+
+    The sum is drawn from its (Irwin-Hall) distribution, then each parameter
+    from its distribution given the sum of the remaining ones.
+
+    Parameters
+    ----------
+    nb_samples : integer
+        Number of samples.
+    nb_parameters : integer
+        Number of paremeters for each sample.
+    value : float
+        The sum of parameters each sample should have.
+    delta : float
+        Relaxation of the value: each sample has a value between [score - delta, score + delta].
+    rng : RandomState, optional
+        Random generator. The default is None (the global one of numpy.random).
+
+    Returns
+    -------
+    array_like
+        The samples.
+    """
+    rng = np.random if rng is None else rng
+    lower = np.full(nb_samples, max(value - delta, 0))
+    upper = np.full(nb_samples, min(value + delta, nb_parameters))
+    cdf_lower = _irwin_hall_cdf(lower, nb_parameters)
+    target = cdf_lower + rng.uniform(size = nb_samples) * (_irwin_hall_cdf(upper, nb_parameters) - cdf_lower)
+    remaining_sum = _bisection(lambda x: _irwin_hall_cdf(x, nb_parameters) - target, lower, upper)
+
+    samples = np.zeros((nb_samples, nb_parameters))
+    for i in range(0, nb_parameters - 1):
+        nb_remaining = nb_parameters - i - 1
+        lower = np.maximum(remaining_sum - nb_remaining, 0)
+        upper = np.minimum(remaining_sum, 1)
+        #The density of x is proportional to the one of the sum of the others at (sum - x).
+        cdf_lower = _irwin_hall_cdf(remaining_sum - lower, nb_remaining)
+        total = cdf_lower - _irwin_hall_cdf(remaining_sum - upper, nb_remaining)
+        target = cdf_lower - rng.uniform(size = nb_samples) * total
+        samples[:,i] = _bisection(lambda x: target - _irwin_hall_cdf(remaining_sum - x, nb_remaining),
+                                  lower, upper)
+        remaining_sum = remaining_sum - samples[:,i]
+    samples[:,-1] = np.clip(remaining_sum, 0, 1)
+    return samples
+
+def _irwin_hall_cdf(x, nb_parameters):
+    """CDF of the sum of uniform variables on [0,1].
+
+    Parameters
+    ----------
+    x : array_like
+        Values.
+    nb_parameters : integer
+        Number of uniform variables.
+
+    Returns
+    -------
+    array_like
+        The CDF at x.
+    """
+    x = np.clip(np.asarray(x, dtype = float), 0, nb_parameters)
+    cdf = np.zeros(x.shape)
+    for k in range(0, nb_parameters + 1):
+        cdf = cdf + (-1)**k * comb(nb_parameters, k) * np.maximum(x - k, 0)**nb_parameters
+    return np.clip(cdf / factorial(nb_parameters), 0, 1)
+
+def _bisection(function, lower, upper, nb_iterations = 60):
+    """Find where an increasing function crosses zero, for each value.
+
+    Parameters
+    ----------
+    function : callable
+        Increasing function, vectorised.
+    lower : array_like
+        Lower bounds.
+    upper : array_like
+        Upper bounds.
+    nb_iterations : integer, optional
+        Number of iterations. The default is 60.
+
+    Returns
+    -------
+    array_like
+        The zeros.
+    """
+    lower = np.array(lower, dtype = float)
+    upper = np.array(upper, dtype = float)
+    for _ in range(0, nb_iterations):
+        middle = (lower + upper) / 2
+        is_above = function(middle) >= 0
+        upper = np.where(is_above, middle, upper)
+        lower = np.where(is_above, lower, middle)
+    return (lower + upper) / 2
 
 def generate_alternatives_random(nb_alternatives, nb_parameters, multiplicator = 100):
     """Generate alternatives according to an uniform distribution.
@@ -70,10 +190,60 @@ def get_pareto_efficient_alternatives(alternatives):
     array_like
         Pereto efficient alternatives.
     """
+    return alternatives[get_pareto_efficient_mask(alternatives)]
+
+def get_pareto_efficient_mask(alternatives):
+    """Find the pareto efficient alternatives among a set of alternatives.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Number of rows alternatives and number of columns criteria.
+        
+    Returns
+    -------
+    array_like
+        True for each pareto efficient alternative.
+    """
     is_efficient = np.ones(alternatives.shape[0], dtype = bool)
     for i, nb_c in enumerate(alternatives):
         if is_efficient[i]:
             worse_alternatives = np.all(alternatives <= nb_c, axis=1)
             worse_alternatives[i] = False
             is_efficient = is_efficient & ~worse_alternatives
-    return alternatives[is_efficient]
+    return is_efficient
+
+def get_pareto_efficient_mask_batch(alternatives_all, max_chunk_size = 2**24):
+    """Find the pareto efficient alternatives of several sets of alternatives at once.
+
+    Same result as get_pareto_efficient_mask on each set: among identical
+    alternatives, only the first is kept.
+
+    Parameters
+    ----------
+    alternatives_all : array_like
+        3-D array (sets x alternatives x criteria).
+    max_chunk_size : integer, optional
+        Maximal number of comparisons done at once. The default is 2**24.
+        
+    Returns
+    -------
+    array_like
+        2-D array, True for each pareto efficient alternative.
+    """
+    nb_sets, nb_alternatives, nb_parameters = alternatives_all.shape
+    is_efficient = np.ones((nb_sets, nb_alternatives), dtype = bool)
+    before = np.tril(np.ones((nb_alternatives, nb_alternatives), dtype = bool), -1)
+    chunk = max(1, max_chunk_size // (nb_alternatives * nb_alternatives * nb_parameters))
+    for start in range(0, nb_sets, chunk):
+        alternatives = alternatives_all[start:start + chunk]
+        #[s, i, j]: j is at least as good as i on each criterion, and better on one.
+        at_least = np.ones((alternatives.shape[0], nb_alternatives, nb_alternatives), dtype = bool)
+        better = np.zeros((alternatives.shape[0], nb_alternatives, nb_alternatives), dtype = bool)
+        for k in range(0, nb_parameters):
+            criterion = alternatives[:,:,k]
+            at_least &= criterion[:,np.newaxis,:] >= criterion[:,:,np.newaxis]
+            better |= criterion[:,np.newaxis,:] > criterion[:,:,np.newaxis]
+        dominated = at_least & (better | before[np.newaxis,:,:])
+        is_efficient[start:start + chunk] = ~np.any(dominated, axis = 2)
+    return is_efficient
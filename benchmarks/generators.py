@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Synthetic and reproducible instances for the benchmarks."""
+
+import numpy as np
+from alternatives.data_preparation import generate_alternatives_score
+from elicitation.models import ModelWeightedSum
+from elicitation.elicitation import make_questions_random
+
+def make_rational(nb_questions, nb_errors):
+    """
+    Answers with a given number of errors, at random positions.
+
+    Parameters
+    ----------
+    nb_questions : integer
+        Number of questions.
+    nb_errors : integer
+        Number of irrational answers.
+
+    Returns
+    -------
+    array_like
+        1 if the answer is rational, 0 otherwise.
+    """
+    rational = np.ones(nb_questions, dtype = int)
+    rational[np.random.choice(nb_questions, size = min(nb_errors, nb_questions),
+                              replace = False)] = 0
+    return rational
+
+def make_instance(nb_questions, nb_parameters, nb_alternatives, nb_errors, seed = 0):
+    """
+    Make an elicitation instance as in make_datasets.py, with a fixed seed and
+    a fixed number of errors.
+
+    Parameters
+    ----------
+    nb_questions : integer
+        Number of questions.
+    nb_parameters : integer
+        Number of criteria.
+    nb_alternatives : integer
+        Number of alternatives.
+    nb_errors : integer
+        Number of irrational answers.
+    seed : integer, optional
+        Seed of the instance. The default is 0.
+
+    Returns
+    -------
+    dict
+        Alternatives, model values, confidence degrees, answers, A and b.
+    """
+    np.random.seed(seed)
+    alternatives = generate_alternatives_score(nb_alternatives, nb_parameters = nb_parameters,
+                                               value = nb_parameters/2)
+    model_values = np.random.dirichlet(np.ones(nb_parameters))
+    confidence = np.round(np.random.uniform(0.01, 0.99, size = nb_questions), decimals = 2)
+    rational = make_rational(nb_questions, nb_errors)
+    questions = make_questions_random(alternatives, ModelWeightedSum(model_values),
+                                      nb_questions, rational)
+    d = {}
+    d['alternatives'] = alternatives
+    d['model'] = model_values
+    d['confidence'] = confidence
+    d['rational'] = rational
+    d['A'] = questions['A']
+    d['b'] = questions['b']
+    return d
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of the hot paths of the elicitation, one axis swept at a time.
+
+Run from the root of the repository:
+    python -m benchmarks.hot_paths [results.json]
+Compare two runs:
+    python -m benchmarks.hot_paths old.json new.json
+"""
+
+import sys
+import json
+import time
+import platform
+import tracemalloc
+import numpy as np
+from alternatives.data_preparation import sample_uniform_slab, get_pareto_efficient_alternatives
+from elicitation.models import ModelWeightedSum
+from elicitation.elicitation import get_polytopes
+from elicitation.choice_calculation import pmr_polytope, min_polytope, max_polytope, set_sampling
+from elicitation.focal_set import compute_epmr_emr
+from elicitation.instrumentation import LPCollector
+from fusion.mcs import get_answers, find_all_maximum_coherent_subsets
+from fusion.l_out_n import k_among_n_fusion
+from benchmarks.generators import make_instance
+
+seed = 0
+nb_repeats = 1
+nb_samples = 200 #Of each cell, for the sampled PMR.
+output_file = 'benchmarks/results.json'
+
+base = {'nb_questions': 10, 'nb_parameters': 4, 'nb_alternatives': 20, 'nb_errors': 1}
+grid = {'nb_questions': [5, 10, 15, 20, 30],
+        'nb_parameters': [3, 4, 5, 6, 8],
+        'nb_alternatives': [10, 30, 100, 300, 1000],
+        'nb_errors': [0, 1, 2, 3, 4]}
+
+def bench_get_polytopes(instance):
+    return lambda: get_polytopes(ModelWeightedSum(instance['model']), instance['confidence'],
+                                 instance['A'], instance['b'], reduced = True)
+
+def _most_possible_polytope(instance):
+    polytopes = get_polytopes(ModelWeightedSum(instance['model']), instance['confidence'],
+                              instance['A'], instance['b'], reduced = True)
+    return polytopes['polytope_list'][int(np.argmax(polytopes['possibility_list']))]
+
+def bench_pmr_polytope(instance):
+    polytope = _most_possible_polytope(instance)
+    model = ModelWeightedSum(instance['model'])
+    return lambda: pmr_polytope(instance['alternatives'], polytope, model)
+
+def bench_pmr_polytope_sampled(instance):
+    polytope = _most_possible_polytope(instance)
+    model = ModelWeightedSum(instance['model'])
+    def pmr_polytope_sampled():
+        set_sampling(nb_samples, seed)
+        try:
+            return pmr_polytope(instance['alternatives'], polytope, model)
+        finally:
+            set_sampling(None)
+    return pmr_polytope_sampled
+
+def bench_min_polytope(instance):
+    polytope = _most_possible_polytope(instance)
+    model = ModelWeightedSum(instance['model'])
+    return lambda: min_polytope(instance['alternatives'], polytope, model)
+
+def bench_max_polytope(instance):
+    polytope = _most_possible_polytope(instance)
+    model = ModelWeightedSum(instance['model'])
+    return lambda: max_polytope(instance['alternatives'], polytope, model)
+
+def bench_compute_epmr_emr(instance):
+    polytopes = get_polytopes(ModelWeightedSum(instance['model']), instance['confidence'],
+                              instance['A'], instance['b'], reduced = True)
+    nb_alternatives = instance['alternatives'].shape[0]
+    #Only the number of focal sets and of alternatives matter, not the PMR values.
+    pmr_list = list(np.random.uniform(size = (len(polytopes['polytope_list']),
+                                              nb_alternatives, nb_alternatives)))
+    return lambda: compute_epmr_emr(pmr_list, polytopes['possibility_list'])
+
+def bench_find_all_maximum_coherent_subsets(instance):
+    polytopes = get_polytopes(ModelWeightedSum(instance['model']), instance['confidence'],
+                              instance['A'], instance['b'], reduced = True)
+    nb_questions = instance['A'].shape[0]
+    answers = get_answers(polytopes['polytope_list'], nb_questions)
+    return lambda: find_all_maximum_coherent_subsets(answers, nb_questions)
+
+def bench_k_among_n_fusion(instance):
+    polytopes = get_polytopes(ModelWeightedSum(instance['model']), instance['confidence'],
+                              instance['A'], instance['b'], reduced = True)
+    nb_questions = instance['A'].shape[0]
+    nb_errors = nb_questions - int(np.sum(instance['rational']))
+    return lambda: k_among_n_fusion(polytopes['polytope_list'], nb_questions - nb_errors,
+                                    nb_questions)
+
+def bench_get_pareto_efficient_alternatives(instance):
+    nb_alternatives, nb_parameters = instance['alternatives'].shape
+    #Raw draws, not all of them are pareto efficient.
+    alternatives = sample_uniform_slab(nb_alternatives, nb_parameters, nb_parameters/2)
+    return lambda: get_pareto_efficient_alternatives(alternatives)
+
+#Benchmark and the axes it is swept on, with their maximal values: cells grow
+#exponentially with the questions, the PMR needs n^2 LPs, the fusion goes
+#through combinations of answers.
+benchmarks = {'get_polytopes': (bench_get_polytopes,
+                                {'nb_questions': 20, 'nb_parameters': 8, 'nb_errors': 4}),
+              'pmr_polytope': (bench_pmr_polytope,
+                               {'nb_parameters': 8, 'nb_alternatives': 100}),
+              'pmr_polytope_sampled': (bench_pmr_polytope_sampled,
+                                       {'nb_parameters': 8, 'nb_alternatives': 1000}),
+              'min_polytope': (bench_min_polytope,
+                               {'nb_parameters': 8, 'nb_alternatives': 1000}),
+              'max_polytope': (bench_max_polytope,
+                               {'nb_parameters': 8, 'nb_alternatives': 1000}),
+              'compute_epmr_emr': (bench_compute_epmr_emr,
+                                   {'nb_questions': 20, 'nb_alternatives': 300, 'nb_errors': 4}),
+              'find_all_maximum_coherent_subsets': (bench_find_all_maximum_coherent_subsets,
+                                                    {'nb_questions': 20, 'nb_errors': 4}),
+              'k_among_n_fusion': (bench_k_among_n_fusion,
+                                   {'nb_questions': 20, 'nb_errors': 4}),
+              'get_pareto_efficient_alternatives': (bench_get_pareto_efficient_alternatives,
+                                                    {'nb_parameters': 8, 'nb_alternatives': 1000})}
+
+def measure(function, nb_repeats = 1):
+    """
+    Measure a function: best time over some runs, then LPs and peak memory
+    on one more run (traced, so not timed).
+
+    Parameters
+    ----------
+    function : callable
+        The function, without argument.
+    nb_repeats : integer, optional
+        Number of timed runs. The default is 1.
+
+    Returns
+    -------
+    dict
+        Best time ('time') in seconds, number of LPs ('nb_lp') and peak
+        memory ('peak_memory') in bytes.
+    """
+    times = []
+    for _ in range(0, nb_repeats):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    tracemalloc.start()
+    with LPCollector() as collector:
+        function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    d = {}
+    d['time'] = min(times)
+    d['nb_lp'] = collector.get_nb_lp()
+    d['peak_memory'] = peak_memory
+    return d
+
+def get_configurations(axes):
+    """
+    Configurations of a benchmark: the base one, and each axis swept alone.
+
+    Parameters
+    ----------
+    axes : dict
+        The axes swept, with their maximal values.
+
+    Returns
+    -------
+    list
+        The configurations (dict), without duplicates.
+    """
+    configurations = [dict(base)]
+    for axis, max_value in axes.items():
+        for value in grid[axis]:
+            if value <= max_value and value != base[axis]:
+                configuration = dict(base)
+                configuration[axis] = value
+                configurations.append(configuration)
+    return configurations
+
+def run_benchmarks(names = None):
+    """
+    Run the benchmarks.
+
+    Parameters
+    ----------
+    names : list, optional
+        Benchmarks to run. The default is None (all).
+
+    Returns
+    -------
+    dict
+        The settings ('settings') and one record per benchmark and configuration ('results').
+    """
+    if names is None:
+        names = list(benchmarks)
+    results = []
+    for name in names:
+        make_benchmark, axes = benchmarks[name]
+        for configuration in get_configurations(axes):
+            instance = make_instance(seed = seed, **configuration)
+            np.random.seed(seed)
+            record = {'benchmark': name}
+            record.update(configuration)
+            record.update(measure(make_benchmark(instance), nb_repeats))
+            print(name, configuration, "%.4f s" % record['time'], record['nb_lp'], "LPs",
+                  "%.1f MB" % (record['peak_memory'] / 2**20), flush = True)
+            results.append(record)
+    d = {}
+    d['settings'] = {'seed': seed, 'nb_repeats': nb_repeats, 'nb_samples': nb_samples,
+                     'base': base, 'grid': grid,
+                     'python': platform.python_version(), 'numpy': np.__version__}
+    d['results'] = results
+    return d
+
+def compare_runs(old_file, new_file):
+    """
+    Print the ratio new / old of the time, LPs and peak memory of each record.
+
+    Parameters
+    ----------
+    old_file : string
+        JSON file of the old run.
+    new_file : string
+        JSON file of the new run.
+
+    Returns
+    -------
+    None.
+    """
+    keys = ('benchmark', 'nb_questions', 'nb_parameters', 'nb_alternatives', 'nb_errors')
+    with open(old_file) as f:
+        old_results = {tuple(record[key] for key in keys): record for record in json.load(f)['results']}
+    with open(new_file) as f:
+        new_results = json.load(f)['results']
+    for record in new_results:
+        key = tuple(record[key] for key in keys)
+        if key not in old_results:
+            continue
+        old_record = old_results[key]
+        ratios = ["%s x%.2f" % (measure_key, record[measure_key] / old_record[measure_key])
+                  for measure_key in ('time', 'nb_lp', 'peak_memory') if old_record[measure_key] > 0]
+        print(key, ', '.join(ratios))
+
+if __name__ == '__main__':
+
+    if len(sys.argv) == 3:
+        compare_runs(sys.argv[1], sys.argv[2])
+    else:
+        if len(sys.argv) == 2:
+            output_file = sys.argv[1]
+        res = run_benchmarks()
+        with open(output_file, 'w') as f:
+            json.dump(res, f, indent = 1)
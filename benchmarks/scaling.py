@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Strong and weak scaling of the stages of the elicitation (pipeline/stages.py).
+
+Each stage is run with 1, 2, 4, ... workers, on a fixed number of repetitions
+(strong scaling) and on a number of repetitions growing with the workers
+(weak scaling). The IPC bytes per task (pickled arguments and result) and the
+time without pool tell if a stage is bound by serialisation or pool overhead.
+
+Run from the root of the repository:
+    python -m benchmarks.scaling [results.json]
+"""
+
+import sys
+import json
+import time
+import pickle
+import multiprocessing
+import numpy as np
+import pipeline.stages as stages
+from pipeline.scheduling import estimate_costs, run_stage
+from benchmarks.generators import make_instance
+
+seed = 0
+nb_questions = 6
+nb_parameters = 4
+nb_alternatives = 10
+nb_repetitions_per_worker = 4 #Weak scaling, and strong scaling with the maximal workers.
+max_workers = multiprocessing.cpu_count()
+output_file = 'benchmarks/scaling.json'
+
+def get_worker_counts(max_workers):
+    """
+    Worker counts: powers of two, and the maximal one.
+
+    Parameters
+    ----------
+    max_workers : integer
+        Maximal number of workers.
+
+    Returns
+    -------
+    list
+        1, 2, 4, ... max_workers.
+    """
+    worker_counts = []
+    nb_workers = 1
+    while nb_workers < max_workers:
+        worker_counts.append(nb_workers)
+        nb_workers *= 2
+    worker_counts.append(max_workers)
+    return worker_counts
+
+def make_dataset(nb_repetitions):
+    """
+    Dataset of synthetic repetitions, with 1 to 3 errors.
+
+    Parameters
+    ----------
+    nb_repetitions : integer
+        Number of repetitions.
+
+    Returns
+    -------
+    dict
+        One array or list per field of the instances.
+    """
+    np.random.seed(seed)
+    nb_errors_all = np.random.randint(1, 4, size = nb_repetitions)
+    instances = [make_instance(nb_questions, nb_parameters, nb_alternatives, nb_errors_all[i],
+                               seed = seed + i)
+                 for i in range(0, nb_repetitions)]
+    return {key: np.asarray([instance[key] for instance in instances]) for key in instances[0]}
+
+def get_stages(dataset):
+    """
+    Run the whole pipeline once, to get the arguments of each stage.
+
+    Parameters
+    ----------
+    dataset : dict
+        The dataset.
+
+    Returns
+    -------
+    list
+        Name, function and arguments (one tuple per repetition) of each stage.
+    """
+    costs = estimate_costs(dataset['rational'])
+    stage_list = []
+
+    def add_stage(name, function, arguments):
+        arguments = list(arguments)
+        stage_list.append((name, function, arguments))
+        return run_stage(function, arguments, costs, processes = max_workers)
+
+    polytopes = add_stage('polytopes', stages.polytopes,
+                          zip(dataset['model'], dataset['confidence'], dataset['A'],
+                              dataset['b']))
+    polytope_all = [d['polytope_list'] for d in polytopes]
+    possibility_all = [d['possibility_list'] for d in polytopes]
+    possibilist = add_stage('possibilist', stages.recommendation_possibilist,
+                            zip(polytope_all, possibility_all, dataset['alternatives'],
+                                dataset['model']))
+    detected_errors = add_stage('number_errors', stages.get_number_errors,
+                                zip(dataset['A'], dataset['b'], dataset['model']))
+    l_out_of_n_fusion = add_stage('l_out_of_n', stages.l_out_of_n,
+                                  zip(polytope_all, detected_errors))
+    mcs_all_res = add_stage('mcs', stages.list_all_mcs,
+                            zip(polytope_all, dataset['confidence']))
+    nb_repetitions = len(polytope_all)
+    for criterion, values in (("minimax regret", 'pmr'), ("maximax", 'max'), ("maximin", 'min')):
+        value_all = [d['value_list'][values] for d in possibilist]
+        add_stage(criterion.replace(' ', '_') + '_l_out_of_n', stages.recommendation_l_out_of_n,
+                  zip(value_all, l_out_of_n_fusion, dataset['alternatives'], dataset['model'],
+                      np.repeat(criterion, nb_repetitions)))
+        add_stage(criterion.replace(' ', '_') + '_mcs', stages.recommendation_all_mcs,
+                  zip([d['mcs'] for d in mcs_all_res], polytope_all, value_all,
+                      [d['answers'] for d in mcs_all_res], dataset['alternatives'],
+                      dataset['model'], np.repeat(criterion, nb_repetitions)))
+    add_stage('epsilon', stages.epsilon_consistency,
+              zip(dataset['A'], dataset['b'], dataset['alternatives'], dataset['model']))
+    return stage_list
+
+def measure_stage(function, arguments, costs, worker_counts, nb_repetitions_per_worker):
+    """
+    Scaling of a stage.
+
+    Parameters
+    ----------
+    function : callable
+        The function of the stage.
+    arguments : list
+        Arguments of each repetition.
+    costs : array_like
+        Estimated cost of each repetition.
+    worker_counts : list
+        Numbers of workers.
+    nb_repetitions_per_worker : integer
+        Repetitions per worker for the weak scaling.
+
+    Returns
+    -------
+    dict
+        IPC bytes per task, time without pool, strong and weak scaling.
+    """
+    nb_repetitions = len(arguments)
+    start_time = time.perf_counter()
+    results = [function(*argument) for argument in arguments]
+    serial_time = time.perf_counter() - start_time
+    ipc_bytes = [len(pickle.dumps((function, argument))) + len(pickle.dumps(result))
+                 for argument, result in zip(arguments, results)]
+    d = {}
+    d['ipc_bytes_per_task'] = float(np.mean(ipc_bytes))
+    d['serial_time'] = serial_time
+    d['strong'] = []
+    d['weak'] = []
+    for nb_workers in worker_counts:
+        start_time = time.perf_counter()
+        run_stage(function, arguments, costs, processes = nb_workers)
+        d['strong'].append({'nb_workers': nb_workers, 'nb_repetitions': nb_repetitions,
+                            'time': time.perf_counter() - start_time})
+        nb_weak = min(nb_repetitions_per_worker * nb_workers, nb_repetitions)
+        start_time = time.perf_counter()
+        run_stage(function, arguments[0:nb_weak], costs[0:nb_weak], processes = nb_workers)
+        d['weak'].append({'nb_workers': nb_workers, 'nb_repetitions': nb_weak,
+                          'time': time.perf_counter() - start_time})
+    strong_reference = d['strong'][0]['time']
+    for record in d['strong']:
+        record['speedup'] = strong_reference / record['time']
+        record['efficiency'] = record['speedup'] / record['nb_workers']
+    weak_reference = d['weak'][0]['time'] / d['weak'][0]['nb_repetitions']
+    for record in d['weak']:
+        record['efficiency'] = (weak_reference * record['nb_repetitions']
+                                / (record['time'] * record['nb_workers']))
+    return d
+
+def run_scaling():
+    """
+    Scaling of all the stages.
+
+    Returns
+    -------
+    dict
+        The settings ('settings') and the scaling of each stage ('stages').
+    """
+    worker_counts = get_worker_counts(max_workers)
+    dataset = make_dataset(nb_repetitions_per_worker * max_workers)
+    costs = estimate_costs(dataset['rational'])
+    d = {}
+    d['settings'] = {'seed': seed, 'nb_questions': nb_questions, 'nb_parameters': nb_parameters,
+                     'nb_alternatives': nb_alternatives,
+                     'nb_repetitions_per_worker': nb_repetitions_per_worker,
+                     'worker_counts': worker_counts}
+    d['stages'] = {}
+    for name, function, arguments in get_stages(dataset):
+        res = measure_stage(function, arguments, costs, worker_counts, nb_repetitions_per_worker)
+        d['stages'][name] = res
+        print(name, "%.0f IPC bytes/task," % res['ipc_bytes_per_task'],
+              "%.3f s without pool" % res['serial_time'])
+        for strong, weak in zip(res['strong'], res['weak']):
+            print("    %d workers: strong %.3f s (speedup %.2f, efficiency %.2f),"
+                  " weak %.3f s (efficiency %.2f)" % (strong['nb_workers'], strong['time'],
+                                                     strong['speedup'], strong['efficiency'],
+                                                     weak['time'], weak['efficiency']),
+                  flush = True)
+    return d
+
+if __name__ == '__main__':
+
+    if len(sys.argv) == 2:
+        output_file = sys.argv[1]
+    res = run_scaling()
+    with open(output_file, 'w') as f:
+        json.dump(res, f, indent = 1)
@@ -8,11 +8,12 @@ import matplotlib.pyplot as plt
 import numpy as np
 import tikzplotlib
 import seaborn
+from pipeline.config import get_data_path
 
 conf_type = 'strong'
 nb_questions = 15
 nb_parameters = 4
-path_data = 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
+path_data = get_data_path(nb_parameters, conf_type, nb_questions)
 path_results = 'results/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
     
 if __name__ == '__main__':
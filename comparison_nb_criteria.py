@@ -11,12 +11,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import tikzplotlib
 import matplotlib.lines as mlines
+from pipeline.config import get_data_path
 
 conf_type = 'strong'
 criterion = 'minimax_regret'
 nb_questions = 15
-path_data_4 = 'data/criteria_' + str(4) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
-path_data_5 = 'data/criteria_' + str(5) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
+path_data_4 = get_data_path(4, conf_type, nb_questions)
+path_data_5 = get_data_path(5, conf_type, nb_questions)
 path_results = 'results/comparison_nb_criteria/'
 
 if __name__ == '__main__':
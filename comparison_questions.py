@@ -11,13 +11,14 @@ import matplotlib.pyplot as plt
 import numpy as np
 import tikzplotlib
 import matplotlib.lines as mlines
+from pipeline.config import get_data_path
 
 conf_type = 'uniform'
 nb_parameters = 4
 criterion = 'maximin'
-path_data_5 = 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(5) + '/'
-path_data_10 = 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(10) + '/'
-path_data_15 = 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(15) + '/'
+path_data_5 = get_data_path(nb_parameters, conf_type, 5)
+path_data_10 = get_data_path(nb_parameters, conf_type, 10)
+path_data_15 = get_data_path(nb_parameters, conf_type, 15)
 path_results = 'results/comparison_nb_questions/'
 
 if __name__ == '__main__':
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Time and LP budget of a repetition, checked cooperatively."""
+
+import time
+
+class Budget:
+    """
+    Wall-clock and LP-count budget. The functions given a budget check it and
+    degrade gracefully (partial result) once it is exhausted.
+    """
+
+    def __init__(self, max_time = None, max_lp = None):
+        """
+        Parameters
+        ----------
+        max_time : float, optional
+            Maximal wall-clock time in seconds. The default is None (no limit).
+        max_lp : integer, optional
+            Maximal number of LPs. The default is None (no limit).
+        """
+        self._max_time = max_time
+        self._max_lp = max_lp
+        self._start_time = time.time()
+        self._nb_lp = 0
+        self._exhausted = False
+
+    def add_lp(self, nb_lp = 1):
+        """
+        Count solved LPs.
+
+        Parameters
+        ----------
+        nb_lp : integer, optional
+            Number of LPs. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._nb_lp += nb_lp
+
+    def is_exhausted(self):
+        """
+        Check the budget. Once exhausted, it stays exhausted.
+
+        Returns
+        -------
+        bool
+            If the budget is exhausted.
+
+        """
+        if not self._exhausted:
+            if self._max_lp is not None and self._nb_lp >= self._max_lp:
+                self._exhausted = True
+            elif self._max_time is not None and time.time() - self._start_time >= self._max_time:
+                self._exhausted = True
+        return self._exhausted
+
+    def get_nb_lp(self):
+        """
+        Get the number of LPs solved.
+        """
+        return self._nb_lp
+
+    def get_time(self):
+        """
+        Get the time spent.
+        """
+        return time.time() - self._start_time
+
+def is_exhausted(budget):
+    """
+    Check a budget which can be None (no limit).
+
+    Parameters
+    ----------
+    budget : Budget
+        The budget, or None.
+
+    Returns
+    -------
+    bool
+        If the budget is exhausted.
+
+    """
+    return budget is not None and budget.is_exhausted()
+
+def add_lp(budget, nb_lp = 1):
+    """
+    Count solved LPs on a budget which can be None (no limit).
+
+    Parameters
+    ----------
+    budget : Budget
+        The budget, or None.
+    nb_lp : integer, optional
+        Number of LPs. The default is 1.
+
+    Returns
+    -------
+    None.
+
+    """
+    if budget is not None:
+        budget.add_lp(nb_lp)
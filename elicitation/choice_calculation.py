@@ -3,19 +3,114 @@
 
 import numpy as np
 from scipy.optimize import linprog
+from alternatives.alternative_set import as_alternative_set
+from elicitation.budget import is_exhausted, add_lp
+from elicitation.geometry import ReducedSpace
+from elicitation.instrumentation import solve_lp, record_event
+from elicitation.lp_cache import get_cell_key
+from elicitation.sampling import sample_polytope
 
-def pmr_polytope(alternatives, polytope, model):
+_lp_cache = None
+_sampling = None
+screening_nb_samples = 100 #Samples of each cell, for the lower and upper values.
+
+def set_lp_cache(cache):
+    """
+    Set the cache of the values of the cells solved with LPs (also the
+    initializer of the workers).
+
+    Parameters
+    ----------
+    cache : LPCache
+        The cache, None to stop caching.
+
+    Returns
+    -------
+    None.
+    """
+    global _lp_cache
+    _lp_cache = cache
+
+def set_sampling(nb_samples = None, seed = None):
+    """
+    Evaluate the cells without vertices from weights drawn inside them
+    (see sample_polytope) instead of LPs: one LP for the center, then the
+    values of all the alternatives on all the samples at once. The PMR and
+    the max are lower bounds, the min an upper bound. For many parameters,
+    where the n^2 LPs of each cell are too slow.
+
+    Parameters
+    ----------
+    nb_samples : integer, optional
+        Number of samples of each cell. The default is None (LPs).
+    seed : integer, optional
+        Seed of the samples, each task having its own generator (see
+        set_sampling_task). The default is None (not reproducible).
+
+    Returns
+    -------
+    None.
+    """
+    global _sampling
+    _sampling = None
+    if nb_samples is not None:
+        entropy = np.random.SeedSequence(seed).entropy
+        _sampling = {'nb_samples': nb_samples, 'entropy': entropy,
+                     'rng': np.random.default_rng(entropy)}
+
+def set_sampling_task(task):
+    """
+    Start the samples of a task: its generator only depends on the seed and
+    the task, not on the worker running it or on its previous tasks.
+
+    Parameters
+    ----------
+    task : integer
+        Position of the task (the repetition) in its stage.
+
+    Returns
+    -------
+    None.
+    """
+    if _sampling is not None:
+        _sampling['rng'] = np.random.default_rng([_sampling['entropy'], task])
+
+def set_evaluation(cache = None, nb_samples = None, seed = None):
+    """
+    Set how the cells are evaluated: the cache of their values and their
+    sampling (also the initializer of the workers).
+
+    Parameters
+    ----------
+    cache : LPCache, optional
+        The cache (see set_lp_cache). The default is None.
+    nb_samples : integer, optional
+        Number of samples of each cell (see set_sampling). The default is None (LPs).
+    seed : integer, optional
+        Seed of the samples (see set_sampling). The default is None.
+
+    Returns
+    -------
+    None.
+    """
+    set_lp_cache(cache)
+    set_sampling(nb_samples, seed)
+
+def pmr_polytope(alternatives, polytope, model, budget = None):
     """
     Compute the PMR.
 
     Parameters
     ----------
-    alternatives : array_like
+    alternatives : array_like or AlternativeSet
         Alternatives.
     polytope : Polyope
         The Polytope.
     model : Model
         The Model.
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, the remaining values are bounded
+        on the whole model space instead of solved. The default is None.
 
     Returns
     -------
@@ -23,22 +118,28 @@ def pmr_polytope(alternatives, polytope, model):
         PMR.
 
     """
-    nb_alternatives = len(alternatives)
+    alternative_set = as_alternative_set(alternatives, model)
+    if polytope.get_vertices() is not None:
+        return _evaluate_vertices(alternative_set, polytope.get_vertices())['pmr']
+    values = _get_cached_values(polytope, alternative_set, ('pmr',))
+    if values is not None:
+        return values['pmr']
+    if _sampling is not None and not is_exhausted(budget):
+        return _evaluate_samples(alternative_set, polytope, _sampling['nb_samples'],
+                                 _sampling['rng'], budget)['pmr']
+    alternatives_diff = alternative_set.get_diff_tensor()
+    nb_alternatives = len(alternative_set)
     pmr = np.zeros((nb_alternatives, nb_alternatives))
-    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq= polytope.get_constrainsts()
-    poly_bounds = polytope.get_bounds()
+    constrainsts = _get_lp_constrainsts(polytope)
     for i in range(0, nb_alternatives):
         for j in range(0, nb_alternatives):
             if i != j:
-                alternatives_diff = model.get_diff(alternatives[j], alternatives[i])
-                linprog_res = linprog(c = -alternatives_diff, A_ub = poly_a_ub, b_ub = poly_b_ub,
-                                      A_eq = poly_a_eq, b_eq = poly_b_eq,
-                                      bounds = poly_bounds,
-                                      method = 'highs')
-                if linprog_res.fun is None:
+                fun = _minimize(-alternatives_diff[i,j], constrainsts, budget, 'pmr_polytope')
+                if fun is None:
                     pmr[i,j] = float('inf')
                 else:
-                    pmr[i,j] = -linprog_res.fun
+                    pmr[i,j] = -fun
+    _cache_values(polytope, alternative_set, {'pmr': pmr}, budget)
     return pmr
 
 def mr_polytope(pmr):
@@ -58,18 +159,21 @@ def mr_polytope(pmr):
     """
     return np.max(pmr, axis = 1)
 
-def min_polytope(alternatives, polytope, model):
+def min_polytope(alternatives, polytope, model, budget = None):
     """
     Compute the min of each alternative on a polytope.
 
     Parameters
     ----------
-    alternatives : array_like
+    alternatives : array_like or AlternativeSet
         Alternatives.
     polytope : Polyope
         The Polytope.
     model : Model
         The Model.
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, the remaining values are bounded
+        on the whole model space instead of solved. The default is None.
 
     Returns
     -------
@@ -77,34 +181,43 @@ def min_polytope(alternatives, polytope, model):
         Min.
 
     """
-    nb_alternatives = len(alternatives)
+    alternative_set = as_alternative_set(alternatives, model)
+    if polytope.get_vertices() is not None:
+        return _evaluate_vertices(alternative_set, polytope.get_vertices())['min']
+    values = _get_cached_values(polytope, alternative_set, ('min',))
+    if values is not None:
+        return values['min']
+    if _sampling is not None and not is_exhausted(budget):
+        return _evaluate_samples(alternative_set, polytope, _sampling['nb_samples'],
+                                 _sampling['rng'], budget)['min']
+    opti_alternatives = alternative_set.get_opti_alternatives()
+    nb_alternatives = len(alternative_set)
     min_list = np.zeros((nb_alternatives))
-    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq= polytope.get_constrainsts()
-    poly_bounds = polytope.get_bounds()
+    constrainsts = _get_lp_constrainsts(polytope)
     for i in range(0, nb_alternatives):
-        linprog_res = linprog(c = model.get_opti_alternative(alternatives[i,:]),
-                              A_ub = poly_a_ub, b_ub = poly_b_ub,
-                              A_eq = poly_a_eq, b_eq = poly_b_eq,
-                              bounds = poly_bounds,
-                              method = 'highs')
-        if linprog_res.fun is None:
+        fun = _minimize(opti_alternatives[i], constrainsts, budget, 'min_polytope')
+        if fun is None:
             min_list[i] = float('-inf')
         else:
-            min_list[i] = linprog_res.fun
+            min_list[i] = fun
+    _cache_values(polytope, alternative_set, {'min': min_list}, budget)
     return min_list
 
-def max_polytope(alternatives, polytope, model):
+def max_polytope(alternatives, polytope, model, budget = None):
     """
     Compute the max of each alternative on a polytope.
 
     Parameters
     ----------
-    alternatives : array_like
+    alternatives : array_like or AlternativeSet
         Alternatives.
     polytope : Polyope
         The Polytope.
     model : Model
         The Model.
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, the remaining values are bounded
+        on the whole model space instead of solved. The default is None.
 
     Returns
     -------
@@ -112,18 +225,489 @@ def max_polytope(alternatives, polytope, model):
         Max.
 
     """
-    nb_alternatives = len(alternatives)
+    alternative_set = as_alternative_set(alternatives, model)
+    if polytope.get_vertices() is not None:
+        return _evaluate_vertices(alternative_set, polytope.get_vertices())['max']
+    values = _get_cached_values(polytope, alternative_set, ('max',))
+    if values is not None:
+        return values['max']
+    if _sampling is not None and not is_exhausted(budget):
+        return _evaluate_samples(alternative_set, polytope, _sampling['nb_samples'],
+                                 _sampling['rng'], budget)['max']
+    opti_alternatives = alternative_set.get_opti_alternatives()
+    nb_alternatives = len(alternative_set)
     max_list = np.zeros((nb_alternatives))
-    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq= polytope.get_constrainsts()
-    poly_bounds = polytope.get_bounds()
+    constrainsts = _get_lp_constrainsts(polytope)
     for i in range(0, nb_alternatives):
-        linprog_res = linprog(c = -model.get_opti_alternative(alternatives[i,:]),
-                              A_ub = poly_a_ub, b_ub = poly_b_ub,
-                              A_eq = poly_a_eq, b_eq = poly_b_eq,
-                              bounds = poly_bounds,
-                              method = 'highs')
-        if linprog_res.fun is None:
+        fun = _minimize(-opti_alternatives[i], constrainsts, budget, 'max_polytope')
+        if fun is None:
             max_list[i] = float('inf')
         else:
-            max_list[i] = -linprog_res.fun
+            max_list[i] = -fun
+    _cache_values(polytope, alternative_set, {'max': max_list}, budget)
     return max_list
+
+def evaluate_polytope(alternatives, polytope, model, budget = None):
+    """
+    Compute the PMR, the min and the max of each alternative on a polytope in
+    one sweep, with the constrainsts prepared once.
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, the remaining values are bounded
+        on the whole model space instead of solved. The default is None.
+
+    Returns
+    -------
+    dict
+        PMR ('pmr'), min ('min') and max ('max').
+
+    """
+    alternative_set = as_alternative_set(alternatives, model)
+    if polytope.get_vertices() is not None:
+        return _evaluate_vertices(alternative_set, polytope.get_vertices())
+    values = _get_cached_values(polytope, alternative_set, ('pmr', 'min', 'max'))
+    if values is not None:
+        return values
+    if _sampling is not None and not is_exhausted(budget):
+        return _evaluate_samples(alternative_set, polytope, _sampling['nb_samples'],
+                                 _sampling['rng'], budget)
+    nb_alternatives = len(alternative_set)
+    opti_alternatives = alternative_set.get_opti_alternatives()
+    alternatives_diff = alternative_set.get_diff_tensor()
+    constrainsts = _get_lp_constrainsts(polytope)
+
+    def solve(c, site):
+        return _minimize(c, constrainsts, budget, site)
+
+    pmr = np.zeros((nb_alternatives, nb_alternatives))
+    min_list = np.zeros((nb_alternatives))
+    max_list = np.zeros((nb_alternatives))
+    for i in range(0, nb_alternatives):
+        fun = solve(opti_alternatives[i], 'min_polytope')
+        min_list[i] = float('-inf') if fun is None else fun
+        fun = solve(-opti_alternatives[i], 'max_polytope')
+        max_list[i] = float('inf') if fun is None else -fun
+        for j in range(0, nb_alternatives):
+            if i != j:
+                fun = solve(-alternatives_diff[i,j], 'pmr_polytope')
+                pmr[i,j] = float('inf') if fun is None else -fun
+    d = {}
+    d['pmr'] = pmr
+    d['min'] = min_list
+    d['max'] = max_list
+    _cache_values(polytope, alternative_set, d, budget)
+    return d
+
+def evaluate_polytopes(alternatives, polytope_list, model, budget = None):
+    """
+    Compute the PMR, the min and the max of each alternative on each polytope,
+    to be used by all the criteria.
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    polytope_list : list
+        The Polytopes.
+    model : Model
+        The Model.
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, the remaining values are bounded
+        on the whole model space instead of solved. The default is None.
+
+    Returns
+    -------
+    dict
+        List of PMR ('pmr'), min ('min') and max ('max'), one per polytope.
+
+    """
+    alternative_set = as_alternative_set(alternatives, model)
+    d = {}
+    d['pmr'] = []
+    d['min'] = []
+    d['max'] = []
+    for polytope in polytope_list:
+        values = evaluate_polytope(alternative_set, polytope, model, budget)
+        d['pmr'].append(values['pmr'])
+        d['min'].append(values['min'])
+        d['max'].append(values['max'])
+    return d
+
+def get_model_space_range(alternatives, model):
+    """
+    Range of the PMR, the min and the max of each alternative over any
+    polytope of the model space, without LP (see _model_space_lower_bound).
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    model : Model
+        The Model.
+
+    Returns
+    -------
+    dict
+        Lower and upper values of the PMR ('pmr'), min ('min') and max ('max').
+
+    """
+    alternative_set = as_alternative_set(alternatives, model)
+    nb_alternatives = len(alternative_set)
+    opti_alternatives = alternative_set.get_opti_alternatives()
+    alternatives_diff = alternative_set.get_diff_tensor()
+    constraints = model.get_model_constrainsts()
+    constrainsts = {'A_eq': constraints['A_eq'], 'b_eq': constraints['b_eq'],
+                    'bounds': constraints['bounds']}
+    pmr_lower = np.zeros((nb_alternatives, nb_alternatives))
+    pmr_upper = np.zeros((nb_alternatives, nb_alternatives))
+    value_lower = np.zeros((nb_alternatives))
+    value_upper = np.zeros((nb_alternatives))
+    for i in range(0, nb_alternatives):
+        value_lower[i] = _model_space_lower_bound(opti_alternatives[i], constrainsts)
+        value_upper[i] = -_model_space_lower_bound(-opti_alternatives[i], constrainsts)
+        for j in range(0, nb_alternatives):
+            if i != j:
+                pmr_lower[i,j] = _model_space_lower_bound(alternatives_diff[i,j], constrainsts)
+                pmr_upper[i,j] = -_model_space_lower_bound(-alternatives_diff[i,j], constrainsts)
+    d = {}
+    d['pmr'] = (pmr_lower, pmr_upper)
+    d['min'] = (value_lower, value_upper)
+    d['max'] = (value_lower, value_upper)
+    return d
+
+def get_value_bounds(alternatives, polytope, model, kind, value_range, screening = 'bounds',
+                     budget = None):
+    """
+    Lower and upper values of each alternative on a polytope, without solving
+    their LPs: exact with vertices or cached values, otherwise the range on
+    the model space, tightened by samples with 'sampling' (lower PMR and max,
+    upper min, see sample_polytope).
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+    kind : string
+        Kind of values ('pmr', 'min' or 'max').
+    value_range : tuple
+        Lower and upper values on the model space (see get_model_space_range).
+    screening : string, optional
+        'bounds' or 'sampling' (one LP for the center). The default is 'bounds'.
+    budget : Budget, optional
+        LP budget, for the center of the polytope. The default is None.
+
+    Returns
+    -------
+    array_like
+        Lower values.
+    array_like
+        Upper values.
+
+    """
+    alternative_set = as_alternative_set(alternatives, model)
+    if polytope.get_vertices() is not None:
+        values = _evaluate_vertices(alternative_set, polytope.get_vertices())[kind]
+        return values, values
+    values = _get_cached_values(polytope, alternative_set, (kind,))
+    if values is not None:
+        return values[kind], values[kind]
+    lower = np.copy(value_range[0])
+    upper = np.copy(value_range[1])
+    if screening == 'sampling' and not is_exhausted(budget):
+        #Seeded, so that the same cell gets the same bounds.
+        rng = np.random.default_rng(0)
+        values = _evaluate_samples(alternative_set, polytope, screening_nb_samples, rng, budget)[kind]
+        if kind == 'min':
+            upper = np.minimum(upper, values)
+        else:
+            lower = np.maximum(lower, values)
+    return lower, upper
+
+def evaluate_alternative(alternatives, polytope, model, alternative_id, kind, budget = None):
+    """
+    Compute the values of one alternative on a polytope: its row of the PMR,
+    its min or its max.
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+    alternative_id : integer
+        Id of the alternative.
+    kind : string
+        Kind of values ('pmr', 'min' or 'max').
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, the remaining values are bounded
+        on the whole model space instead of solved. The default is None.
+
+    Returns
+    -------
+    array_like or float
+        Its PMR against each alternative, or its min or max.
+
+    """
+    alternative_set = as_alternative_set(alternatives, model)
+    constrainsts = _get_lp_constrainsts(polytope)
+    i = alternative_id
+    if kind == 'pmr':
+        alternatives_diff = alternative_set.get_diff_tensor()
+        pmr = np.zeros(len(alternative_set))
+        for j in range(0, len(alternative_set)):
+            if i != j:
+                fun = _minimize(-alternatives_diff[i,j], constrainsts, budget, 'pmr_polytope')
+                pmr[j] = float('inf') if fun is None else -fun
+        return pmr
+    opti_alternatives = alternative_set.get_opti_alternatives()
+    if kind == 'min':
+        fun = _minimize(opti_alternatives[i], constrainsts, budget, 'min_polytope')
+        return float('-inf') if fun is None else fun
+    if kind == 'max':
+        fun = _minimize(-opti_alternatives[i], constrainsts, budget, 'max_polytope')
+        return float('inf') if fun is None else -fun
+    raise NotImplementedError(kind, 'is an unknown kind of values.')
+
+def _evaluate_vertices(alternative_set, vertices):
+    """
+    Compute the PMR, the min and the max of each alternative from the vertices
+    of a polytope (the optimum of a LP is on one of them).
+
+    Parameters
+    ----------
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    vertices : array_like
+        2-D array, one vertex per row.
+    model : Model
+        The Model.
+
+    Returns
+    -------
+    dict
+        PMR ('pmr'), min ('min') and max ('max').
+
+    """
+    record_event('evaluate_vertices')
+    nb_alternatives = len(alternative_set)
+    opti_alternatives = alternative_set.get_opti_alternatives()
+    d = {}
+    if len(vertices) == 0:
+        d['pmr'] = np.full((nb_alternatives, nb_alternatives), float('inf'))
+        np.fill_diagonal(d['pmr'], 0)
+        d['min'] = np.full(nb_alternatives, float('-inf'))
+        d['max'] = np.full(nb_alternatives, float('inf'))
+        return d
+    values = opti_alternatives @ np.asarray(vertices).T
+    d['pmr'] = np.max(values[np.newaxis,:,:] - values[:,np.newaxis,:], axis = 2)
+    np.fill_diagonal(d['pmr'], 0)
+    d['min'] = np.min(values, axis = 1)
+    d['max'] = np.max(values, axis = 1)
+    return d
+
+def _evaluate_samples(alternative_set, polytope, nb_samples, rng, budget = None):
+    """
+    Compute the PMR, the min and the max of each alternative on weights drawn
+    inside a polytope (see set_sampling).
+
+    Parameters
+    ----------
+    alternative_set : AlternativeSet
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    nb_samples : integer
+        Number of samples.
+    rng : Generator
+        Random generator.
+    budget : Budget, optional
+        LP budget, for the center of the polytope. The default is None.
+
+    Returns
+    -------
+    dict
+        PMR ('pmr'), min ('min') and max ('max'), bounds of the exact ones.
+
+    """
+    record_event('evaluate_samples')
+    samples = sample_polytope(polytope, nb_samples, rng, budget)
+    if len(samples) == 0:
+        return _evaluate_vertices(alternative_set, samples)
+    values = alternative_set.get_opti_alternatives() @ samples.T
+    nb_alternatives = len(alternative_set)
+    #One row at a time, there are many more samples than vertices.
+    pmr = np.zeros((nb_alternatives, nb_alternatives))
+    for i in range(0, nb_alternatives):
+        pmr[i] = np.max(values - values[i], axis = 1)
+    np.fill_diagonal(pmr, 0)
+    d = {}
+    d['pmr'] = pmr
+    d['min'] = np.min(values, axis = 1)
+    d['max'] = np.max(values, axis = 1)
+    return d
+
+def _get_cached_values(polytope, alternative_set, kinds):
+    """
+    Get values of a cell from the cache.
+
+    Parameters
+    ----------
+    polytope : Polyope
+        The Polytope.
+    alternative_set : AlternativeSet
+        The alternatives.
+    kinds : tuple
+        Kinds of values needed ('pmr', 'min', 'max').
+
+    Returns
+    -------
+    dict
+        A copy of each kind of values, None if one of them is not cached.
+
+    """
+    if _lp_cache is None:
+        return None
+    d = {}
+    for kind in kinds:
+        values = _lp_cache.get(get_cell_key(polytope, alternative_set, kind))
+        if values is None:
+            record_event('lp_cache_miss')
+            return None
+        d[kind] = np.copy(values)
+    record_event('lp_cache_hit')
+    return d
+
+def _cache_values(polytope, alternative_set, d, budget = None):
+    """
+    Cache values of a cell, unless the budget was exhausted (some of them may
+    only be bounds).
+
+    Parameters
+    ----------
+    polytope : Polyope
+        The Polytope.
+    alternative_set : AlternativeSet
+        The alternatives.
+    d : dict
+        Values of each kind ('pmr', 'min', 'max').
+    budget : Budget, optional
+        Time and LP budget. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    if _lp_cache is None or is_exhausted(budget):
+        return
+    for kind, values in d.items():
+        _lp_cache.put(get_cell_key(polytope, alternative_set, kind), np.copy(values))
+
+def _get_lp_constrainsts(polytope):
+    """
+    Get the constrainsts of a polytope, ready for the LPs.
+
+    Parameters
+    ----------
+    polytope : Polyope
+        The Polytope.
+
+    Returns
+    -------
+    dict
+        A_ub, b_ub, A_eq, b_eq, bounds and space (the ReducedSpace if there is
+        one equality constrainst, None otherwise).
+
+    """
+    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq = polytope.get_constrainsts()
+    if poly_a_ub is not None:
+        poly_a_ub = np.atleast_2d(poly_a_ub)
+        poly_b_ub = np.asarray(poly_b_ub).reshape(-1)
+    d = {}
+    d['A_ub'] = poly_a_ub
+    d['b_ub'] = poly_b_ub
+    d['A_eq'] = poly_a_eq
+    d['b_eq'] = poly_b_eq
+    d['bounds'] = polytope.get_bounds()
+    d['space'] = None
+    if poly_a_eq is not None and np.atleast_2d(poly_a_eq).shape[0] == 1:
+        d['space'] = ReducedSpace(poly_a_eq, poly_b_eq, d['bounds'])
+    return d
+
+def _minimize(c, constrainsts, budget = None, site = 'polytope'):
+    """
+    Minimise cx on a polytope, or bound it on the whole model space if the
+    budget is exhausted. The LP is solved on the reduced space if there is one.
+
+    Parameters
+    ----------
+    c : array_like
+        The objective.
+    constrainsts : dict
+        The constrainsts of the polytope.
+    budget : Budget, optional
+        Time and LP budget. The default is None.
+    site : string, optional
+        Where the LP is counted. The default is 'polytope'.
+
+    Returns
+    -------
+    float
+        The min (a lower bound if the budget is exhausted), None if infeasible.
+
+    """
+    if is_exhausted(budget):
+        record_event(site + '_budget_bound')
+        return _model_space_lower_bound(c, constrainsts)
+    add_lp(budget)
+    if constrainsts['space'] is not None:
+        fun, _, _ = constrainsts['space'].linprog(c, constrainsts['A_ub'], constrainsts['b_ub'],
+                                                  site = site)
+        return fun
+    linprog_res = solve_lp(site, linprog, c = c,
+                           A_ub = constrainsts['A_ub'], b_ub = constrainsts['b_ub'],
+                           A_eq = constrainsts['A_eq'], b_eq = constrainsts['b_eq'],
+                           bounds = constrainsts['bounds'],
+                           method = 'highs')
+    return linprog_res.fun
+
+def _model_space_lower_bound(c, constrainsts):
+    """
+    Lower bound of cx on the model space, without LP: exact on the simplex,
+    from the bounds otherwise.
+
+    Parameters
+    ----------
+    c : array_like
+        The objective.
+    constrainsts : dict
+        The constrainsts of the polytope.
+
+    Returns
+    -------
+    float
+        The lower bound.
+
+    """
+    c = np.asarray(c, dtype = float)
+    bounds = np.asarray(constrainsts['bounds'], dtype = float)
+    A_eq = constrainsts['A_eq']
+    if (A_eq is not None and np.shape(A_eq)[0] == 1 and np.all(np.asarray(A_eq) == 1)
+            and np.all(np.asarray(constrainsts['b_eq']) == 1)
+            and np.all(bounds[:,0] == 0) and np.all(bounds[:,1] >= 1)):
+        return np.min(c)
+    return np.sum(np.minimum(c * bounds[:,0], c * bounds[:,1]))
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Datasets store the questions as pairs of alternatives, constrainsts are derived from them."""
+
+import numpy as np
+from elicitation.models import ModelWeightedSum
+from elicitation.polytope import construct_constrainst
+
+def make_questions_array(candidates, opponents, accepted, nb_alternatives):
+    """
+    Pack the questions as small integers.
+
+    Parameters
+    ----------
+    candidates : array_like
+        Indice of the candidate alternative of each question.
+    opponents : array_like
+        Indice of the opponent alternative of each question.
+    accepted : array_like
+        True if the candidate was prefered.
+    nb_alternatives : integer
+        Number of alternatives.
+
+    Returns
+    -------
+    array_like
+        Array with a last axis of size 3: (candidate, opponent, accepted).
+    """
+    dtype = np.promote_types(np.min_scalar_type(nb_alternatives), np.uint8)
+    return np.stack((np.asarray(candidates), np.asarray(opponents),
+                     np.asarray(accepted)), axis = -1).astype(dtype)
+
+def get_questions_constrainsts(alternatives, questions, model):
+    """
+    Get the constrainsts given by the answers to the questions of a repetition.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    questions : array_like
+        2-D array, (candidate, opponent, accepted) for each question.
+    model : Model
+        The aggregation model.
+
+    Returns
+    -------
+    array_like
+        2-D array of values representing A for the constrainsts Ax <= b.
+    array_like
+        1-D array of values representing b for the constrainsts Ax <= b.
+    """
+    nb_questions = questions.shape[0]
+    A_list = np.zeros((nb_questions, alternatives.shape[1]))
+    b_list = np.zeros((nb_questions))
+    for ite in range(0, nb_questions):
+        candidate_alt_id, worst_alt_id, best_prefered = questions[ite]
+        new_constraint_a, new_constraint_b = construct_constrainst(alternatives[candidate_alt_id],
+                                                                   alternatives[worst_alt_id],
+                                                                   bool(best_prefered), model)
+        A_list[ite] = new_constraint_a
+        b_list[ite] = new_constraint_b
+    return A_list, b_list
+
+def get_dataset_constrainsts(dataset, model_class = ModelWeightedSum):
+    """
+    Get the constrainsts of all the repetitions of a dataset.
+
+    Datasets made before the questions were stored only have the constrainsts
+    for the weighted sum, which are returned as they are.
+
+    Parameters
+    ----------
+    dataset : dict
+        The dataset.
+    model_class : class, optional
+        The aggregation model. The default is ModelWeightedSum.
+
+    Returns
+    -------
+    array_like
+        3-D array, A for each repetition.
+    array_like
+        2-D array, b for each repetition.
+
+    Raises
+    ------
+    NotImplementedError
+        If an old dataset is used with another model than the weighted sum.
+    """
+    if 'questions' not in dataset:
+        if model_class is not ModelWeightedSum:
+            raise NotImplementedError("This dataset only has the constrainsts of the weighted sum.")
+        return dataset['A'], dataset['b']
+    alternatives_all = dataset['alternatives']
+    questions_all = dataset['questions']
+    nb_repetitions, nb_questions, _ = questions_all.shape
+    A_all = np.zeros((nb_repetitions, nb_questions, alternatives_all.shape[2]))
+    b_all = np.zeros((nb_repetitions, nb_questions))
+    for i in range(0, nb_repetitions):
+        A_all[i], b_all[i] = get_questions_constrainsts(alternatives_all[i], questions_all[i],
+                                                        model_class(dataset['model'][i]))
+    return A_all, b_all
@@ -98,3 +98,51 @@ def get_choice_fixed(alternative_1, alternative_2, rational, model):
     else:
         res['accepted'] = not rational
     return res
+
+def get_confidence_rational(conf_type, nb_repetitions, nb_questions, rng = None):
+    """
+    Draw the confidence degrees of the answers of the DM, and if each answer
+    is rational (the more confident, the more likely). Each repetition has at
+    least one irrational answer.
+
+    Parameters
+    ----------
+    conf_type : string
+        Distribution of the confidence degrees: 'strong', 'weak', 'intermediate' or 'uniform'.
+    nb_repetitions : integer
+        Number of repetitions.
+    nb_questions : integer
+        Number of questions.
+    rng : RandomState, optional
+        Random generator. The default is None (the global one of numpy.random).
+
+    Returns
+    -------
+    array_like
+        2-D array, confidence degree of each answer of each repetition.
+    array_like
+        2-D array, 1 if the answer is rational, 0 otherwise.
+    """
+    rng = np.random if rng is None else rng
+    if conf_type == "strong":
+        confidence_values = np.round(rng.beta(7, 2, size = ((nb_repetitions, nb_questions))),
+                                     decimals = 2)
+    elif conf_type == "weak":
+        confidence_values = np.round(rng.beta(2, 7, size = ((nb_repetitions, nb_questions))),
+                                     decimals = 2)
+    elif conf_type == "intermediate":
+        confidence_values = np.round(rng.beta(5, 5, size = ((nb_repetitions, nb_questions))),
+                                     decimals = 2)
+    elif conf_type == "uniform":
+        confidence_values = np.round(rng.uniform(0.01, 0.99, size = ((nb_repetitions, nb_questions))),
+                                     decimals = 2)
+    else:
+        raise NotImplementedError("I did not code that.")
+
+    random_mask = rng.uniform(size = (nb_repetitions, nb_questions))
+    rational = np.where(random_mask <= confidence_values + (1-confidence_values)/2, 1, 0)
+    non_zeros_lines = np.count_nonzero(rational, axis = 1) #We add an error if none.
+    for j in range(0, nb_repetitions):
+        if non_zeros_lines[j] == nb_questions:
+            rational[j, rng.randint(0, nb_questions)] = 0
+    return confidence_values, rational
@@ -2,16 +2,38 @@
 """Elicitation"""
 
 import time
+import hashlib
 import numpy as np
-from alternatives.data_preparation import get_pareto_efficient_alternatives
+from alternatives.data_preparation import get_pareto_efficient_mask, get_pareto_efficient_mask_batch
+from alternatives.alternative_set import as_alternative_set
 from elicitation.question_strategies import RandomQuestionStrategy
 from elicitation.dm import get_choice_fixed
-from elicitation.choice_calculation import pmr_polytope, min_polytope, max_polytope
-from elicitation.focal_set import compute_epmr_emr, compute_emax_emin
+from elicitation.choice_calculation import (pmr_polytope, min_polytope, max_polytope, evaluate_polytopes,
+                                            get_model_space_range, get_value_bounds,
+                                            evaluate_alternative)
+from elicitation.focal_set import compute_epmr_emr, compute_emax_emin, truncate_levels
 from elicitation.choice_strategies import minimax_regret_choice, maximax_choice, maximin_choice
-from elicitation.polytope import Polytope, construct_constrainst, cut_polytope, intersection_checker
+from elicitation.polytope import (Polytope, PolytopeList, construct_constrainst, cut_polytope,
+                                  classify_constrainst, remove_redundant_constrainsts)
+from elicitation.geometry import ReducedSpace
+from elicitation.quantization import quantize, dequantize, possibility_scale
+from elicitation.budget import is_exhausted
+from elicitation.instrumentation import record_event, record_cells
+from elicitation.memo import LRUMemo
+from elicitation.models import ModelWeightedSum
+from elicitation.dataset import make_questions_array
 
-def make_questions_random(alternatives, model, nb_questions, rational):
+#Recommendations from values already computed, the same possibilities often
+#come back (MCSs differing only by answers no cell violates, l-out-of-n).
+_recommendation_memo = LRUMemo(128)
+
+def clear_recommendation_memo():
+    """
+    Forget the recommendations kept.
+    """
+    _recommendation_memo.clear()
+
+def make_questions_random(alternatives, model, nb_questions, rational, rng = None):
     """
     Possibilist elicitation with CSS.
 
@@ -25,31 +47,137 @@ def make_questions_random(alternatives, model, nb_questions, rational):
         Number of questions.
     rational : list
         To know if some answers should be rational or not.
+    rng : RandomState, optional
+        Random generator. The default is None (the global one of numpy.random).
+
     Returns
     -------
     dict
-        Questions, answers and some info.
+        Questions (indices in the given alternatives), answers and some info.
 
     """
-    alternatives = get_pareto_efficient_alternatives(alternatives) #Get rid of non optimal solutions.
-    question_strategy = RandomQuestionStrategy(alternatives)
+    pareto_idx = np.where(get_pareto_efficient_mask(alternatives))[0]
+    nb_alternatives = alternatives.shape[0]
+    alternatives = alternatives[pareto_idx] #Get rid of non optimal solutions.
+    question_strategy = RandomQuestionStrategy(alternatives, rng)
     A_list = np.zeros((nb_questions, alternatives.shape[1]))
     b_list = np.zeros((nb_questions))
+    candidates = np.zeros(nb_questions, dtype = int)
+    opponents = np.zeros(nb_questions, dtype = int)
+    accepted = np.zeros(nb_questions, dtype = bool)
     for ite in range(0, nb_questions):
         candidate_alt, candidate_alt_id = question_strategy.give_candidate()
-        worst_alt, _ = question_strategy.give_oponent(candidate_alt_id)
+        worst_alt, worst_alt_id = question_strategy.give_oponent(candidate_alt_id)
         choice = get_choice_fixed(candidate_alt, worst_alt, rational[ite], model)
         best_prefered = choice['accepted']
         new_constraint_a, new_constraint_b = construct_constrainst(candidate_alt, worst_alt, best_prefered, model)
         A_list[ite] = new_constraint_a
         b_list[ite] = new_constraint_b
+        candidates[ite] = pareto_idx[candidate_alt_id]
+        opponents[ite] = pareto_idx[worst_alt_id]
+        accepted[ite] = best_prefered
     d = {}
     d['A'] = A_list
     d['b'] = b_list
+    d['questions'] = make_questions_array(candidates, opponents, accepted, nb_alternatives)
+    return d
+
+def make_questions_random_batch(alternatives_all, model_values_all, nb_questions,
+                                rational_all, model_class = ModelWeightedSum,
+                                pareto_mask_all = None, rng = None):
+    """
+    Possibilist elicitation with random questions, for all the repetitions at
+    once with whole-array operations.
+
+    Questions follow the same distribution as make_questions_random: the
+    candidate is uniform among the pareto efficient alternatives, the opponent
+    uniform among the ones not compared yet with it.
+
+    Parameters
+    ----------
+    alternatives_all : array_like
+        3-D array (repetitions x alternatives x criteria).
+    model_values_all : array_like
+        2-D array, the parameters of the model for each repetition.
+    nb_questions : integer
+        Number of questions.
+    rational_all : array_like
+        2-D array, to know if some answers should be rational or not.
+    model_class : class, optional
+        The aggregation model. The default is ModelWeightedSum.
+    pareto_mask_all : array_like, optional
+        2-D array, the pareto efficient alternatives of each repetition, if
+        already known. The default is None.
+    rng : RandomState, optional
+        Random generator. The default is None (the global one of numpy.random).
+
+    Returns
+    -------
+    dict
+        Questions (candidate, opponent, accepted) and answers for each repetition.
+
+    """
+    rng = np.random if rng is None else rng
+    alternatives_all = np.asarray(alternatives_all)
+    model_values_all = np.asarray(model_values_all)
+    nb_repetitions, nb_alternatives, nb_parameters = alternatives_all.shape
+    rows = np.arange(0, nb_repetitions)
+
+    #Pareto efficient alternatives first, the others are never picked.
+    if pareto_mask_all is None:
+        pareto_mask_all = get_pareto_efficient_mask_batch(alternatives_all)
+    pareto_mask = pareto_mask_all
+    pareto_order = np.argsort(~pareto_mask, axis = 1, kind = 'stable')
+    nb_pareto = np.sum(pareto_mask, axis = 1)
+    #The form for optimisation does not depend on the parameters of the model.
+    opti_alternatives = model_class(model_values_all[0]).get_opti_alternatives(alternatives_all)
+    scores = np.sum(opti_alternatives * model_values_all[:,np.newaxis,:], axis = 2)
+
+    batch_rows = np.where(nb_pareto > nb_questions)[0]
+    candidates = np.zeros((nb_repetitions, nb_questions), dtype = int)
+    opponents = np.zeros((nb_repetitions, nb_questions), dtype = int)
+    for ite in range(0, nb_questions):
+        #No candidate can have all its pairs visited as long as ite < nb_pareto - 1.
+        candidate_pos = np.floor(rng.uniform(size = nb_repetitions) * nb_pareto).astype(int)
+        candidates[:,ite] = pareto_order[rows, candidate_pos]
+        to_draw = batch_rows
+        while len(to_draw) > 0:
+            opponent_pos = np.floor(rng.uniform(size = len(to_draw))
+                                    * (nb_pareto[to_draw] - 1)).astype(int)
+            opponent_pos = opponent_pos + (opponent_pos >= candidate_pos[to_draw])
+            opponents[to_draw,ite] = pareto_order[to_draw, opponent_pos]
+            visited = (((candidates[to_draw,:ite] == candidates[to_draw,ite][:,np.newaxis])
+                        & (opponents[to_draw,:ite] == opponents[to_draw,ite][:,np.newaxis]))
+                       | ((candidates[to_draw,:ite] == opponents[to_draw,ite][:,np.newaxis])
+                          & (opponents[to_draw,:ite] == candidates[to_draw,ite][:,np.newaxis])))
+            to_draw = to_draw[np.any(visited, axis = 1)]
+
+    rational_all = np.asarray(rational_all).astype(bool)
+    candidate_best = scores[rows[:,np.newaxis], candidates] >= scores[rows[:,np.newaxis], opponents]
+    accepted = candidate_best == rational_all
+    diff = (opti_alternatives[rows[:,np.newaxis], candidates]
+            - opti_alternatives[rows[:,np.newaxis], opponents])
+    A_all = np.where(accepted[:,:,np.newaxis], -diff, diff)
+    b_all = np.zeros((nb_repetitions, nb_questions))
+    questions_all = make_questions_array(candidates, opponents, accepted, nb_alternatives)
+
+    #Too few alternatives to be sure to find new pairs: one by one.
+    for i in np.where(nb_pareto <= nb_questions)[0]:
+        res = make_questions_random(alternatives_all[i], model_class(model_values_all[i]),
+                                    nb_questions, rational_all[i], rng)
+        A_all[i] = res['A']
+        b_all[i] = res['b']
+        questions_all[i] = res['questions']
+
+    d = {}
+    d['A'] = A_all
+    d['b'] = b_all
+    d['questions'] = questions_all
     return d
 
 def get_polytopes(model, confidence, A_ub, b_ub, t_norm = 'product',
-                  min_possibility = 0):
+                  min_possibility = 0, reduced = False, tolerance = 1e-9,
+                  budget = None, beam_width = 10, prune = False, quantized = False):
     '''
     Get all the poytopes used in an elicitation
 
@@ -67,6 +195,30 @@ def get_polytopes(model, confidence, A_ub, b_ub, t_norm = 'product',
         Which T-norm to use. The default is 'product'.
     min_possibility : float, optional
         Min possibility to consider a polytope. The default is 0.
+    reduced : bool, optional
+        Eliminate the equality constrainst of the model: LPs have one variable
+        less, and polygons (up to 3 parameters) are clipped exactly without LP.
+        The default is False.
+    tolerance : float, optional
+        A polytope is cut only if it goes beyond a constrainst by more than it.
+        The default is 1e-9.
+    budget : Budget, optional
+        Time and LP budget. Once exhausted, only the beam_width most possible
+        polytopes (of the ones not classified yet) are kept for each question,
+        and the result is flagged as partial: it may miss the polytopes with
+        the fewest errors. The default is None (no limit).
+    beam_width : integer, optional
+        Number of polytopes kept once the budget is exhausted. The default is 10.
+    prune : bool, optional
+        Keep only the constrainsts of each polytope that are not implied by the
+        others: an answer that does not cut a polytope adds no constrainst, and
+        the redundant ones are removed at the end (see
+        remove_redundant_constrainsts). The LPs on the polytopes are smaller,
+        with the same results. The default is False.
+    quantized : bool, optional
+        Possibilities in fixed point (see elicitation.quantization): exact
+        levels and comparisons, 4 times less memory, the product rounded to
+        1e-4 at each answer. The default is False.
 
     Returns
     -------
@@ -80,11 +232,23 @@ def get_polytopes(model, confidence, A_ub, b_ub, t_norm = 'product',
     constraints_a = constraints['A_eq']
     constraints_b = constraints['b_eq']
     bounds = constraints['bounds']
-    first_polytope = Polytope(None,None,constraints_a, constraints_b, bounds)
+    if quantized is True:
+        confidence = quantize(confidence)
+        min_possibility = quantize(min_possibility)
+    full = np.uint16(possibility_scale) if quantized is True else 1
+    first_polytope = Polytope(None,None,constraints_a, constraints_b, bounds, quantized = quantized)
+    space = None
+    if reduced is True:
+        space = ReducedSpace(constraints_a, constraints_b, bounds)
+        if space.get_dimension() <= 2:
+            first_polytope.set_vertices(space.get_vertices())
 
     polytope_list = []
     polytope_list.append(first_polytope)
     inconsistency_list = np.zeros(nb_questions)
+    nb_cells = np.zeros(nb_questions, dtype = int)
+    nb_degenerate = 0
+    partial = False
 
     start_time = time.time()
 
@@ -94,10 +258,27 @@ def get_polytopes(model, confidence, A_ub, b_ub, t_norm = 'product',
         possibility_list = []
         new_polytope_list = []
 
-        for polytope in polytope_list:
-            side = intersection_checker(polytope, A, b)
+        truncated = False
+        position = 0
+        while position < len(polytope_list):
+            #Checked before each polytope: the budget can run out during a question.
+            if (not truncated and is_exhausted(budget)
+                    and len(polytope_list) - position > beam_width):
+                polytope_list = polytope_list[0:position] + sorted(
+                    polytope_list[position:], key = lambda polytope: polytope.get_possibility(),
+                    reverse = True)[0:beam_width]
+                truncated = True
+                partial = True
+                record_event('beam_truncation')
+            polytope = polytope_list[position]
+            position += 1
+            side, degenerate = classify_constrainst(polytope, A, b, space, tolerance, budget)
+            nb_degenerate += degenerate
+            #Empty (infeasible LP): dropped, its possibility does not count.
             if side is None:
-                return None
+                record_event('empty_cell_dropped')
+                del polytope
+                continue
             '''If the new constrainst intersects with the current polytope:
             - Create two new ones,
             - Keep those with a suffissant possibility,
@@ -118,28 +299,36 @@ def get_polytopes(model, confidence, A_ub, b_ub, t_norm = 'product',
             #Else, just update the possibility.
             else:
                 if side == 1:
-                    polytope.add_answer(A, b, 1, t_norm)
+                    polytope.add_answer(A, b, full, t_norm, implied = prune)
                 else:
-                    polytope.add_answer(-A, -b, 1-confidence[ite], t_norm)
+                    polytope.add_answer(-A, -b, full-confidence[ite], t_norm, implied = prune)
                 if polytope.get_possibility() > min_possibility:
                     new_polytope_list.append(polytope)
                     possibility_list.append(polytope.get_possibility())
                 else:
                     del polytope
 
-        inconsistency_list[ite] = 1-np.max(possibility_list)
+        inconsistency_list[ite] = 1-dequantize(np.max(possibility_list))
+        nb_cells[ite] = len(new_polytope_list)
         polytope_list = new_polytope_list
+    record_cells(nb_cells)
+
+    if prune is True:
+        for polytope in polytope_list:
+            remove_redundant_constrainsts(polytope, space, tolerance, budget)
 
     d = {}
     d['time'] = time.time() - start_time
     d['inconsistency'] = inconsistency_list
+    d['nb_degenerate'] = nb_degenerate
+    d['partial'] = partial
     d['possibility_list'] = possibility_list
-    d['polytope_list'] = polytope_list
+    d['polytope_list'] = PolytopeList(polytope_list)
     return d
 
 def get_recommendation(things_list, possibility_list, alternatives, model,
                        criterion = "minimax regret", inconsistency_type = 'zero',
-                       polytopes = True):
+                       polytopes = True, budget = None, epsilon = 0, screening = None):
     """
     Determine the optimal recommendation according to some criterion from polytopes or values.
 
@@ -149,7 +338,7 @@ def get_recommendation(things_list, possibility_list, alternatives, model,
         List of polytopes or values.
     possibility_list : list
         List of possibility for each polytope.
-    alternatives : array_like
+    alternatives : array_like or AlternativeSet
         Alternatives.
     model : Model
         The model.
@@ -159,6 +348,20 @@ def get_recommendation(things_list, possibility_list, alternatives, model,
         Inconsistency in the EPMR/Emax. The default is 'zero'.
     polytopes : bool, optional
         Do we use polytopes in things_list. The default is True.
+    budget : Budget, optional
+        Time and LP budget for the values of the polytopes. The default is None.
+    epsilon : float, optional
+        Error allowed on the expected criterion: the polytopes of the lowest
+        levels are neither evaluated nor aggregated (see truncate_levels), and
+        the bound of the error is given ('bound'). The default is 0 (all the
+        polytopes).
+    screening : string, optional
+        Bound the values of the polytopes first, without their LPs ('bounds'
+        or 'sampling', see get_value_bounds), and solve the LPs only for the
+        alternatives that can still be the best (see _get_screened_values).
+        The recommendation is the same, but the values are only bounds for
+        the alternatives left out: they are given as 'value_bounds' instead
+        of 'value_list'. The default is None (all the LPs).
         
     Returns
     -------
@@ -166,42 +369,238 @@ def get_recommendation(things_list, possibility_list, alternatives, model,
         Information about the recommended alternative.
 
     """
-    scores = model.get_model_score(alternatives)
+    alternatives = as_alternative_set(alternatives, model)
+    scores = alternatives.get_scores()
     if criterion == "minimax regret":
         f_value = pmr_polytope
         f_ecompute = compute_epmr_emr
         f_choice = minimax_regret_choice
+        kind = 'pmr'
     elif criterion == 'maximax':
         f_value = max_polytope
         f_ecompute = compute_emax_emin
         f_choice = maximax_choice
+        kind = 'max'
     elif criterion == "maximin":
         f_value = min_polytope
         f_ecompute = compute_emax_emin
         f_choice = maximin_choice
+        kind = 'min'
     else:
         raise NotImplementedError("I didn't do that.")
 
-    if polytopes is True:
+    bound = 0
+    if epsilon > 0:
+        value_range = get_model_space_range(alternatives, model)[kind]
+        kept_ids, bound = truncate_levels(possibility_list, epsilon, value_range, inconsistency_type)
+        if len(kept_ids) < len(possibility_list):
+            record_event('level_truncation_skipped', len(possibility_list) - len(kept_ids))
+            things_list = [things_list[i] for i in kept_ids]
+            possibility_list = [possibility_list[i] for i in kept_ids]
+
+    memo_key = None
+    if polytopes is True and screening is not None:
+        value_list = _get_screened_values(things_list, possibility_list, alternatives, model,
+                                          criterion, kind, f_ecompute, inconsistency_type,
+                                          screening, budget)
+    elif polytopes is True:
         value_list = []
         for polytope in things_list:
-            value_list.append(f_value(alternatives, polytope, model))
+            value_list.append(f_value(alternatives, polytope, model, budget))
     else:
         value_list = things_list
+        memo_key = _get_memo_key(value_list, alternatives, possibility_list, criterion,
+                                 inconsistency_type)
 
-    if criterion in ('maximax', 'maximin'):
-        ecriterion = f_ecompute(value_list, possibility_list, criterion, inconsistency_type)
-    elif criterion == "minimax regret":
-        _, ecriterion = f_ecompute(value_list, possibility_list, inconsistency_type)
+    best_alt_id = _recommendation_memo.get(memo_key) if memo_key is not None else None
+    if best_alt_id is not None:
+        record_event('recommendation_memo_hit')
     else:
-        raise NotImplementedError("I didn't do that.")
-
-    _, best_alt_id, _ = f_choice(alternatives, ecriterion)
+        ecriterion = _get_ecriterion(f_ecompute, value_list, possibility_list, criterion,
+                                     inconsistency_type)
+        _, best_alt_id, _ = f_choice(alternatives, ecriterion)
+        if memo_key is not None:
+            _recommendation_memo.put(memo_key, best_alt_id)
+            record_event('recommendation_memo_miss')
     regret = np.max(scores) - scores[best_alt_id]
 
     result = {}
     result['best_alternative'] = best_alt_id
     result['real_regret'] = regret
-    if polytopes is True:
+    if epsilon > 0:
+        result['bound'] = bound
+    if polytopes is True and screening is not None:
+        #Not exact for the alternatives left out: not to be reused as values.
+        result['value_bounds'] = value_list
+    elif polytopes is True:
+        #Only the values of the polytopes kept, if some levels are skipped.
         result['value_list'] = value_list
     return result
+
+def _get_memo_key(value_list, alternative_set, possibility_list, criterion, inconsistency_type):
+    """
+    Key of a recommendation from values in the memo: a hash of the values,
+    the alternatives and the possibilities (the same objects are not always
+    given again, and their ids can be reused).
+    """
+    digest = hashlib.sha1((criterion + inconsistency_type + alternative_set.get_hash()).encode())
+    for values in value_list:
+        values = np.ascontiguousarray(values, dtype = float)
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes())
+    possibility_list = np.ascontiguousarray(dequantize(possibility_list), dtype = float)
+    digest.update(str(possibility_list.shape).encode())
+    digest.update(possibility_list.tobytes())
+    return digest.hexdigest()
+
+def _get_ecriterion(f_ecompute, value_list, possibility_list, criterion, inconsistency_type):
+    """
+    Expected criterion of each alternative (EMR, Emax or Emin).
+    """
+    if criterion in ('maximax', 'maximin'):
+        return f_ecompute(value_list, possibility_list, criterion, inconsistency_type)
+    if criterion == "minimax regret":
+        _, ecriterion = f_ecompute(value_list, possibility_list, inconsistency_type)
+        return ecriterion
+    raise NotImplementedError("I didn't do that.")
+
+def _get_screened_values(polytope_list, possibility_list, alternatives, model, criterion,
+                         kind, f_ecompute, inconsistency_type, screening, budget = None):
+    """
+    Values of the polytopes, solved only for the alternatives that can be the
+    best. The expected criterion of an alternative only depends on its own
+    values (its row of the PMR), and is monotone in them: with the bounds of
+    the values (see get_value_bounds), the best criterion each alternative
+    can reach is known. The alternatives are solved from the most promising
+    one, until the others cannot beat the best solved one.
+
+    Parameters
+    ----------
+    polytope_list : list
+        List of polytopes.
+    possibility_list : list
+        List of possibility for each polytope.
+    alternatives : AlternativeSet
+        Alternatives.
+    model : Model
+        The model.
+    criterion : string
+        Which criterion to use.
+    kind : string
+        Kind of values of the criterion ('pmr', 'min' or 'max').
+    f_ecompute : callable
+        Expected criterion from the values.
+    inconsistency_type : string
+        Inconsistency in the EPMR/Emax.
+    screening : string
+        'bounds' or 'sampling'.
+    budget : Budget, optional
+        Time and LP budget. The default is None.
+
+    Returns
+    -------
+    list
+        The values of each polytope: exact for the alternatives solved, the
+        most favourable bounds for the others.
+
+    """
+    value_range = get_model_space_range(alternatives, model)[kind]
+    bounds = [get_value_bounds(alternatives, polytope, model, kind, value_range, screening, budget)
+              for polytope in polytope_list]
+    #Low PMR, high max or min: the best criterion each alternative can reach.
+    value_list = [np.copy(lower) if kind == 'pmr' else np.copy(upper) for lower, upper in bounds]
+    sign = 1 if criterion == "minimax regret" else -1
+    reachable = sign * _get_ecriterion(f_ecompute, value_list, possibility_list, criterion,
+                                       inconsistency_type)
+    best = np.inf
+    nb_solved = 0
+    for i in np.argsort(reachable, kind = 'stable'):
+        if reachable[i] > best:
+            break
+        for polytope, (lower, upper), values in zip(polytope_list, bounds, value_list):
+            if not np.array_equal(lower[i], upper[i]):
+                values[i] = evaluate_alternative(alternatives, polytope, model, i, kind, budget)
+        best = min(best, sign * _get_ecriterion(f_ecompute, value_list, possibility_list,
+                                                criterion, inconsistency_type)[i])
+        nb_solved += 1
+    record_event('screening_recommendation')
+    record_event('screening_alternative', len(alternatives))
+    record_event('screening_escalation', nb_solved)
+    if nb_solved > 1:
+        record_event('screening_ambiguous')
+    return value_list
+
+def get_criterion_values(values, criterion = "minimax regret"):
+    """
+    Get the values a criterion needs from the record of evaluate_polytopes.
+
+    Parameters
+    ----------
+    values : dict
+        PMR, min and max for each polytope.
+    criterion : string, optional
+        Which criterion to use. The default is 'minimax regret'.
+
+    Returns
+    -------
+    list
+        The values for each polytope.
+
+    """
+    if criterion == "minimax regret":
+        return values['pmr']
+    if criterion == 'maximax':
+        return values['max']
+    if criterion == "maximin":
+        return values['min']
+    raise NotImplementedError("I didn't do that.")
+
+def get_recommendations(things, possibility_list, alternatives, model,
+                        criteria = ("minimax regret", "maximax", "maximin"),
+                        inconsistency_types = ('zero', 'ignorance'),
+                        polytopes = True, budget = None):
+    """
+    Determine the optimal recommendation for several criteria and inconsistency
+    types, with each polytope evaluated only once.
+
+    Parameters
+    ----------
+    things : list or dict
+        List of polytopes, or PMR, min and max for each polytope (from evaluate_polytopes).
+    possibility_list : list
+        List of possibility for each polytope.
+    alternatives : array_like or AlternativeSet
+        Alternatives.
+    model : Model
+        The model.
+    criteria : sequence, optional
+        Which criteria to use. The default is all of them.
+    inconsistency_types : sequence, optional
+        Inconsistency in the EPMR/Emax. The default is both 'zero' and 'ignorance'.
+    polytopes : bool, optional
+        Do we use polytopes in things. The default is True.
+    budget : Budget, optional
+        Time and LP budget for the values of the polytopes. The default is None.
+
+    Returns
+    -------
+    dict
+        Information about the recommended alternative, for each criterion then
+        each inconsistency type, and the values of the polytopes ('value_list').
+
+    """
+    alternatives = as_alternative_set(alternatives, model)
+    if polytopes is True:
+        values = evaluate_polytopes(alternatives, things, model, budget)
+    else:
+        values = things
+    result = {}
+    for criterion in criteria:
+        result[criterion] = {}
+        for inconsistency_type in inconsistency_types:
+            result[criterion][inconsistency_type] = get_recommendation(get_criterion_values(values, criterion),
+                                                                       possibility_list, alternatives,
+                                                                       model, criterion, inconsistency_type,
+                                                                       polytopes = False)
+    result['value_list'] = values
+    return result
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 """This module gives tools for focal sets (compute empr notably)."""
 
-from copy import deepcopy
 import numpy as np
+from elicitation.quantization import is_quantized, dequantize, get_full_possibility, possibility_scale
 
 def _compute_levels(possibility_list):
     """
@@ -19,6 +19,11 @@ def _compute_levels(possibility_list):
         Levels.
 
     """
+    if is_quantized(possibility_list):
+        #Counting sort of the quantized possibilities: exact levels, no float ties.
+        counts = np.bincount(np.asarray(possibility_list), minlength = possibility_scale + 1)
+        counts[0] = 1
+        return np.flatnonzero(counts)[::-1].astype(np.uint16)
     ind_sort = np.asarray(possibility_list).argsort()
     sorted_possibility_list = np.asarray(possibility_list)[ind_sort[::-1]]
     levels = np.unique(sorted_possibility_list)
@@ -27,9 +32,82 @@ def _compute_levels(possibility_list):
     levels = np.sort(levels)[::-1]
     return levels
 
+def _get_weights(levels):
+    """
+    Weight of each focal set: the difference between its level and the next one.
+
+    Parameters
+    ----------
+    levels : array_like
+        Levels, in decreasing order.
+
+    Returns
+    -------
+    array_like
+        Weights (float, quantized levels or not).
+
+    """
+    return dequantize(levels[0:-1] - levels[1:])
+
+def truncate_levels(possibility_list, epsilon, value_range, inconsistency_type = 'ignorance'):
+    """
+    Polytopes needed for an expected criterion within epsilon. Without the
+    polytopes below a level, the focal set of the lowest level kept also
+    stands for the lower ones: each focal value missed is in value_range, and
+    the lower levels weigh the highest possibility skipped. With 'ignorance'
+    and inconsistent answers, the polytope added for the inconsistency (see
+    _update_pmr_mr) depends on all the polytopes and is in all the focal sets,
+    so all the polytopes are kept (unless epsilon bounds the whole range). The
+    polytopes with the max possibility are always kept.
+
+    Parameters
+    ----------
+    possibility_list : list
+        Possibility for each polytope.
+    epsilon : float
+        Error allowed on the expected criterion.
+    value_range : tuple
+        Lower and upper values of each polytope (see get_model_space_range).
+    inconsistency_type : string, optional
+        How uncertainty is handeled. The default is 'ignorance'.
+
+    Returns
+    -------
+    kept_ids : array_like
+        Ids of the polytopes kept.
+    bound : float
+        Bound of the error on the expected criterion (below epsilon).
+
+    """
+    possibilities = dequantize(possibility_list)
+    span = np.max(np.asarray(value_range[1]) - np.asarray(value_range[0]))
+    max_possibility = np.max(possibilities)
+    inconsistency_weight = 1 if inconsistency_type == 'ignorance' and max_possibility != 1 else 0
+    cutoff = 0
+    if span > 0:
+        cutoff = min(epsilon / span - inconsistency_weight, max_possibility)
+    kept = possibilities >= cutoff
+    if np.all(kept):
+        return np.arange(0, len(possibilities)), 0
+    bound = (np.max(possibilities[~kept]) + inconsistency_weight) * span
+    return np.flatnonzero(kept), bound
+
+def _truncate(value_list, possibility_list, epsilon, value_range, inconsistency_type):
+    """
+    Values and possibilities of the polytopes kept by truncate_levels, and the bound.
+    """
+    if value_range is None:
+        raise ValueError('The range of the values is needed to truncate the levels.')
+    kept_ids, bound = truncate_levels(possibility_list, epsilon, value_range, inconsistency_type)
+    if len(kept_ids) < len(possibility_list):
+        value_list = [value_list[i] for i in kept_ids]
+        possibility_list = [possibility_list[i] for i in kept_ids]
+    return value_list, possibility_list, bound
+
 ### Minmax regret ###
 
-def compute_epmr_emr(pmr_list, possibility_list, inconsistency_type = 'ignorance'):
+def compute_epmr_emr(pmr_list, possibility_list, inconsistency_type = 'ignorance',
+                     epsilon = 0, value_range = None):
     """
     Compute the EMPR and EMR
 
@@ -41,6 +119,12 @@ def compute_epmr_emr(pmr_list, possibility_list, inconsistency_type = 'ignorance
         Possibility for each polytope.
     inconsistency_type : string, optional
         How uncertainty is handeled. The default is 'ignorance'.
+    epsilon : float, optional
+        Error allowed on the EPMR and EMR: the lowest levels are skipped (see
+        truncate_levels). The default is 0 (all the levels).
+    value_range : tuple, optional
+        Lower and upper PMR of each polytope, needed if epsilon > 0. The
+        default is None.
 
     Returns
     -------
@@ -48,8 +132,14 @@ def compute_epmr_emr(pmr_list, possibility_list, inconsistency_type = 'ignorance
         epmr.
     emr : float
         emr.
+    bound : float
+        Bound of the error of the truncation, only if epsilon > 0.
 
     """
+    if epsilon > 0:
+        pmr_list, possibility_list, bound = _truncate(pmr_list, possibility_list, epsilon,
+                                                      value_range, inconsistency_type)
+        return compute_epmr_emr(pmr_list, possibility_list, inconsistency_type) + (bound,)
     new_pmr_list, mr_list, new_possibility_list = _update_pmr_mr(pmr_list, possibility_list, inconsistency_type)
     levels = _compute_levels(new_possibility_list)
     epmr = _epmr_compute(new_pmr_list, new_possibility_list, levels)
@@ -79,10 +169,12 @@ def _update_pmr_mr(pmr_list, possibility_list, inconsistency_type = 'ignorance')
         Updated possibility list.
 
     """
-    new_pmr_list = deepcopy(pmr_list)
-    new_possibility_list = deepcopy(possibility_list)
-    if np.max(possibility_list) != 1:
-        new_possibility_list.append(1)
+    #Lists (they may be arrays), the values of the inconsistency are appended.
+    new_pmr_list = list(pmr_list)
+    new_possibility_list = list(possibility_list)
+    full = get_full_possibility(possibility_list)
+    if np.max(possibility_list) != full:
+        new_possibility_list.append(full)
         if inconsistency_type == 'ignorance':
             new_pmr_list.append(np.max(pmr_list, axis = 0))
         elif inconsistency_type == 'zero':
@@ -117,7 +209,7 @@ def _epmr_compute(pmr_list, possibility_list, levels):
     for i in range(len(levels) - 1):
         idx_in_focal_sets = np.where(possibility_list >= levels[i])[0]
         new_pmr_list[i] = np.max(np.asarray([pmr_list[j] for j in idx_in_focal_sets]), axis = 0)
-    res = np.sum(new_pmr_list * (levels[0:-1] - levels[1:])[:,None,None], axis = 0)
+    res = np.sum(new_pmr_list * _get_weights(levels)[:,None,None], axis = 0)
     return res
 
 def _emr_compute(mr_list, possibility_list, levels):
@@ -145,13 +237,13 @@ def _emr_compute(mr_list, possibility_list, levels):
     for i in range(len(levels) - 1):
         idx_in_focal_sets = np.where(possibility_list >= levels[i])[0]
         new_mr_list[i] = np.max(np.asarray([mr_list[j] for j in idx_in_focal_sets]), axis = 0)
-    res = np.sum(new_mr_list * (levels[0:-1] - levels[1:])[:,None], axis = 0)
+    res = np.sum(new_mr_list * _get_weights(levels)[:,None], axis = 0)
     return res
 
 ### Maximax or Maximin ###
 
 def compute_emax_emin(max_list, possibility_list, criterion = 'maximax',
-                      inconsistency_type = 'ignorance'):
+                      inconsistency_type = 'ignorance', epsilon = 0, value_range = None):
     """
     Compute the emax (or emin)
 
@@ -165,12 +257,24 @@ def compute_emax_emin(max_list, possibility_list, criterion = 'maximax',
         Maximax or Maximin. The default is 'maximax'.
     inconsistency_type : string, optional
         How uncertainty is handeled. The default is 'ignorance'.
+    epsilon : float, optional
+        Error allowed on the emax (or emin): the lowest levels are skipped
+        (see truncate_levels). The default is 0 (all the levels).
+    value_range : tuple, optional
+        Lower and upper max (or min) of each polytope, needed if epsilon > 0.
+        The default is None.
 
     Returns
     -------
     emax : float
         emax (or emin).
+    bound : float
+        Bound of the error of the truncation, only if epsilon > 0.
     """
+    if epsilon > 0:
+        max_list, possibility_list, bound = _truncate(max_list, possibility_list, epsilon,
+                                                      value_range, inconsistency_type)
+        return compute_emax_emin(max_list, possibility_list, criterion, inconsistency_type), bound
     new_max_list, new_possibility_list = _update_max_min(max_list, possibility_list,
                                                          criterion, inconsistency_type)
     levels = _compute_levels(new_possibility_list)
@@ -201,10 +305,12 @@ def _update_max_min(max_list, possibility_list, criterion = 'maximax',
         Updated possibility list.
 
     """
-    new_max_list = deepcopy(max_list)
-    new_possibility_list = deepcopy(possibility_list)
-    if np.max(possibility_list) != 1:
-        new_possibility_list.append(1)
+    #Lists (they may be arrays), the values of the inconsistency are appended.
+    new_max_list = list(max_list)
+    new_possibility_list = list(possibility_list)
+    full = get_full_possibility(possibility_list)
+    if np.max(possibility_list) != full:
+        new_possibility_list.append(full)
         if inconsistency_type == 'ignorance':
             if criterion == 'maximax':
                 new_max_list.append(np.max(max_list, axis = 0))
@@ -248,5 +354,5 @@ def _emax_emin_compute(max_list, possibility_list, levels, criterion = 'maximax'
             new_max_list[i] = np.max(np.asarray([max_list[j] for j in idx_in_focal_sets]), axis = 0)
         elif criterion == "maximin":
             new_max_list[i] = np.min(np.asarray([max_list[j] for j in idx_in_focal_sets]), axis = 0)
-    res = np.sum(new_max_list * (levels[0:-1] - levels[1:])[:,None], axis = 0)
+    res = np.sum(new_max_list * _get_weights(levels)[:,None], axis = 0)
     return res
@@ -2,6 +2,7 @@
 """This module manipulated T-norms and T-conorms."""
 
 import numpy as np
+from elicitation.quantization import is_quantized, possibility_scale
 
 def tnorm(information, fusion_rule = "product"):
     """T-norm of pieces of information.
@@ -23,6 +24,8 @@ def tnorm(information, fusion_rule = "product"):
     NotImplementedError
         If the rule given during initialisation is not known.
     """
+    if is_quantized(information):
+        return _quantized_tnorm(information, fusion_rule)
     if np.min(information) == 0: #If one zero: stop.
         return 0
     if fusion_rule == 'minimum':
@@ -56,6 +59,8 @@ def tconorm(information, fusion_rule = "probabilistic"):
     NotImplementedError
         If the rule given during initialisation is not known.
     """
+    if is_quantized(information):
+        return _quantized_tconorm(information, fusion_rule)
     if np.max(information) == 1:  #If one one: stop.
         return 1
     if fusion_rule == 'maximum':
@@ -71,4 +76,51 @@ def tconorm(information, fusion_rule = "probabilistic"):
             bound = np.minimum(1, bound + info)
         return bound
     raise NotImplementedError(fusion_rule, 'is an unknown rule.')
-    
\ No newline at end of file
+
+def _quantized_tnorm(information, fusion_rule = "product"):
+    """
+    T-norm of quantized pieces of information (see tnorm), quantized.
+    """
+    information = np.asarray(information, dtype = np.int64)
+    if np.min(information) == 0:
+        return np.uint16(0)
+    if fusion_rule == 'minimum':
+        return np.uint16(np.min(information))
+    if fusion_rule == 'product':
+        #A product of non zero possibilities is not rounded to 0.
+        return np.uint16(max(1, _quantized_product(information)))
+    if fusion_rule == 'lukasiewicz':
+        luk = possibility_scale
+        for info in information:
+            luk = max(0, luk + info - possibility_scale)
+        return np.uint16(luk)
+    raise NotImplementedError(fusion_rule, 'is an unknown rule.')
+
+def _quantized_product(information):
+    """
+    Product of quantized pieces of information, quantized: computed on
+    integers, then rounded once (half up), so it is within half a unit of
+    the exact product.
+    """
+    product = 1
+    for info in information:
+        product *= int(info)
+    unit = possibility_scale ** (len(information) - 1)
+    return (product + unit // 2) // unit
+
+def _quantized_tconorm(information, fusion_rule = "probabilistic"):
+    """
+    T-conorm of quantized pieces of information (see tconorm), quantized.
+    """
+    information = np.asarray(information, dtype = np.int64)
+    if np.max(information) == possibility_scale:
+        return np.uint16(possibility_scale)
+    if fusion_rule == 'maximum':
+        return np.uint16(np.max(information))
+    if fusion_rule == 'probabilistic':
+        complement = _quantized_product(possibility_scale - information)
+        #Nor rounded to 1 without a possibility of 1.
+        return np.uint16(possibility_scale - max(1, complement))
+    if fusion_rule == 'bounded':
+        return np.uint16(min(possibility_scale, np.sum(information)))
+    raise NotImplementedError(fusion_rule, 'is an unknown rule.')
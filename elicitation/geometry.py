@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""Exact geometry of the model space, once its equality constrainst is eliminated."""
+
+import numpy as np
+from scipy.optimize import linprog
+from elicitation.instrumentation import solve_lp
+
+class ReducedSpace:
+    """
+    Model space parametrised without its equality constrainst.
+
+    One parameter w_k is expressed with the others (u), so the model space
+    lives in p-1 dimensions and the LPs have one variable less.
+    """
+
+    def __init__(self, constraints_A_eq, constraints_b_eq, bounds):
+        """
+        Parameters
+        ----------
+        constraints_A_eq : array_like
+            2-D array (only one row) representing A for the constrainst Ax = b.
+        constraints_b_eq : array_like
+            1-D array (only one value) representing b for the constrainst Ax = b.
+        bounds : sequence
+            Minimum and maximum values for each parameters of the model space.
+
+        Raises
+        ------
+        NotImplementedError
+            If there is more than one equality constrainst.
+        """
+        constraints_A_eq = np.atleast_2d(np.asarray(constraints_A_eq, dtype = float))
+        if constraints_A_eq.shape[0] != 1:
+            raise NotImplementedError("Only one equality constrainst can be eliminated.")
+        a_eq = constraints_A_eq[0]
+        self._nb_parameters = len(a_eq)
+        self._pivot = int(np.argmax(np.abs(a_eq)))
+        self._free = np.delete(np.arange(self._nb_parameters), self._pivot)
+        self._a_pivot = a_eq[self._pivot]
+        self._a_free = a_eq[self._free]
+        self._b_eq = float(np.asarray(constraints_b_eq, dtype = float).reshape(-1)[0])
+        self._bounds = tuple(tuple(bound) for bound in bounds)
+        self._free_bounds = tuple(self._bounds[i] for i in self._free)
+        #The bounds of the pivot become inequality constrainsts on u.
+        pivot_a = []
+        pivot_b = []
+        pivot_min, pivot_max = self._bounds[self._pivot]
+        if pivot_max is not None:
+            row_a, row_b = self.reduce_constraints(np.eye(self._nb_parameters)[self._pivot],
+                                                   np.asarray([pivot_max]))
+            pivot_a.append(row_a[0])
+            pivot_b.append(row_b[0])
+        if pivot_min is not None:
+            row_a, row_b = self.reduce_constraints(-np.eye(self._nb_parameters)[self._pivot],
+                                                   np.asarray([-pivot_min]))
+            pivot_a.append(row_a[0])
+            pivot_b.append(row_b[0])
+        self._constraints_A_ub = np.asarray(pivot_a).reshape(-1, self.get_dimension())
+        self._constraints_b_ub = np.asarray(pivot_b)
+
+    def get_dimension(self):
+        """
+        Get the dimension of the reduced space.
+        """
+        return self._nb_parameters - 1
+
+    def reduce_constraints(self, constraints_A, constraints_b):
+        """
+        Express constrainsts Aw <= b on the parameters u of the reduced space.
+
+        Parameters
+        ----------
+        constraints_A : array_like
+            2-D array of values representing A for the constrainst Aw <= b.
+        constraints_b : array_like
+            1-D array of values representing b for the constrainst Aw <= b.
+
+        Returns
+        -------
+        array_like
+            2-D array representing A for the constrainst Au <= b.
+        array_like
+            1-D array representing b for the constrainst Au <= b.
+        """
+        constraints_A = np.atleast_2d(np.asarray(constraints_A, dtype = float))
+        constraints_b = np.asarray(constraints_b, dtype = float).reshape(-1)
+        a_pivot = constraints_A[:,self._pivot] / self._a_pivot
+        reduced_a = constraints_A[:,self._free] - np.outer(a_pivot, self._a_free)
+        reduced_b = constraints_b - a_pivot * self._b_eq
+        return reduced_a, reduced_b
+
+    def reduce_objective(self, c):
+        """
+        Express an objective c.w on the parameters u of the reduced space.
+
+        Parameters
+        ----------
+        c : array_like
+            1-D array, the objective.
+
+        Returns
+        -------
+        array_like
+            The objective on u.
+        float
+            The constant part of the objective.
+        """
+        c = np.asarray(c, dtype = float).reshape(-1)
+        c_pivot = c[self._pivot] / self._a_pivot
+        return c[self._free] - c_pivot * self._a_free, c_pivot * self._b_eq
+
+    def expand(self, u):
+        """
+        Get the parameters w of the model from the parameters u of the reduced space.
+
+        Parameters
+        ----------
+        u : array_like
+            1-D array (or 2-D, one row per point) of parameters of the reduced space.
+
+        Returns
+        -------
+        array_like
+            The parameters of the model.
+        """
+        u = np.asarray(u, dtype = float)
+        w = np.zeros(u.shape[:-1] + (self._nb_parameters,))
+        w[...,self._free] = u
+        w[...,self._pivot] = (self._b_eq - u @ self._a_free) / self._a_pivot
+        return w
+
+    def linprog(self, c, constraints_A_ub = None, constraints_b_ub = None,
+                site = 'reduced_space'):
+        """
+        Minimise c.w on the model space with additionnal constrainsts Aw <= b,
+        solved on the reduced space.
+
+        Parameters
+        ----------
+        c : array_like
+            1-D array, the objective.
+        constraints_A_ub : array_like, optional
+            2-D array of values representing A for the constrainst Aw <= b.
+        constraints_b_ub : array_like, optional
+            1-D array of values representing b for the constrainst Aw <= b.
+        site : string, optional
+            Where the LP is counted. The default is 'reduced_space'.
+
+        Returns
+        -------
+        float
+            The minimum, None if the problem is not solved.
+        array_like
+            The parameters of the model reaching the minimum, None if not solved.
+        integer
+            Status of the solver: 0 if solved, 2 if infeasible (see linprog).
+        """
+        reduced_c, offset = self.reduce_objective(c)
+        reduced_a = self._constraints_A_ub
+        reduced_b = self._constraints_b_ub
+        if constraints_A_ub is not None:
+            new_a, new_b = self.reduce_constraints(constraints_A_ub, constraints_b_ub)
+            reduced_a = np.vstack((reduced_a, new_a))
+            reduced_b = np.concatenate((reduced_b, new_b))
+        if reduced_a.shape[0] == 0:
+            reduced_a = None
+            reduced_b = None
+        linprog_res = solve_lp(site, linprog, reduced_c, reduced_a, reduced_b,
+                               bounds = self._free_bounds, method = 'highs')
+        if linprog_res.status != 0:
+            return None, None, linprog_res.status
+        return linprog_res.fun + offset, self.expand(linprog_res.x), linprog_res.status
+
+    def get_vertices(self):
+        """
+        Get the vertices of the model space, in order, if it is at most a polygon.
+
+        Returns
+        -------
+        array_like
+            2-D array, one vertex (in the model parameters) per row.
+
+        Raises
+        ------
+        NotImplementedError
+            If the reduced space has more than two dimensions.
+        """
+        dimension = self.get_dimension()
+        if dimension > 2:
+            raise NotImplementedError("Vertices are only handled up to polygons.")
+        if any(bound is None for free_bound in self._free_bounds for bound in free_bound):
+            raise NotImplementedError("Vertices need bounded parameters.")
+        if dimension == 0:
+            vertices = np.zeros((1, 0))
+        elif dimension == 1:
+            vertices = np.asarray([[self._free_bounds[0][0]], [self._free_bounds[0][1]]],
+                                  dtype = float)
+        else:
+            (min_0, max_0), (min_1, max_1) = self._free_bounds
+            vertices = np.asarray([[min_0, min_1], [max_0, min_1],
+                                   [max_0, max_1], [min_0, max_1]], dtype = float)
+        for row_a, row_b in zip(self._constraints_A_ub, self._constraints_b_ub):
+            vertices = clip_polygon(vertices, row_a, row_b)
+        return self.expand(vertices)
+
+def clip_polygon(vertices, constraint_a, constraint_b, tolerance = 1e-12):
+    """
+    Clip a convex polygon (or segment) by a half space Ax <= b, Sutherland–Hodgman style.
+
+    Works on vertices of any dimension as long as they are in the same plane
+    (or line), and keeps them in order.
+
+    Parameters
+    ----------
+    vertices : array_like
+        2-D array, one vertex per row, in order.
+    constraint_a : array_like
+        1-D array of values representing A for the constrainst Ax <= b.
+    constraint_b : float
+        Value representing b for the constrainst Ax <= b.
+    tolerance : float, optional
+        Under it, two vertices are the same. The default is 1e-12.
+
+    Returns
+    -------
+    array_like
+        The vertices of the clipped polygon (no row if empty).
+    """
+    vertices = np.asarray(vertices, dtype = float)
+    nb_vertices = vertices.shape[0]
+    if nb_vertices == 0:
+        return vertices
+    constraint_a = np.asarray(constraint_a, dtype = float).reshape(-1)
+    constraint_b = float(np.asarray(constraint_b, dtype = float).reshape(-1)[0])
+    values = vertices @ constraint_a - constraint_b
+    inside = values <= 0
+    if np.all(inside):
+        return vertices
+    if not np.any(inside):
+        return vertices[0:0]
+    clipped = []
+    for i in range(0, nb_vertices):
+        start = i - 1
+        if inside[i]:
+            if not inside[start]:
+                clipped.append(_edge_intersection(vertices[start], vertices[i],
+                                                  values[start], values[i]))
+            clipped.append(vertices[i])
+        elif inside[start]:
+            clipped.append(_edge_intersection(vertices[start], vertices[i],
+                                              values[start], values[i]))
+    clipped = np.asarray(clipped)
+    #Consecutive duplicates (segments, or vertices on the line) are removed.
+    is_new = np.ones(len(clipped), dtype = bool)
+    is_new[1:] = np.max(np.abs(np.diff(clipped, axis = 0)), axis = 1) > tolerance
+    if len(clipped) > 1 and np.max(np.abs(clipped[-1] - clipped[0])) <= tolerance:
+        is_new[-1] = False
+    return clipped[is_new]
+
+def _edge_intersection(vertex_1, vertex_2, value_1, value_2):
+    """
+    Intersection between an edge and the line Ax = b.
+
+    Parameters
+    ----------
+    vertex_1 : array_like
+        First vertex of the edge.
+    vertex_2 : array_like
+        Second vertex of the edge.
+    value_1 : float
+        Ax - b for the first vertex.
+    value_2 : float
+        Ax - b for the second vertex.
+
+    Returns
+    -------
+    array_like
+        The intersection.
+    """
+    ratio = value_1 / (value_1 - value_2)
+    return vertex_1 + ratio * (vertex_2 - vertex_1)
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""Count and time the LPs by call site, to see where the solver time goes."""
+
+import json
+import time
+
+_collectors = []
+
+class LPCollector:
+    """
+    Collect the LPs solved, the fallback events and the number of cells while
+    it is active (in a with statement). Collectors of several workers can be
+    merged.
+    """
+
+    def __init__(self):
+        self._lp = {}
+        self._events = {}
+        self._cells = []
+
+    def __enter__(self):
+        _collectors.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _collectors.remove(self)
+        return False
+
+    def add_lp(self, site, duration, status):
+        """
+        Count a LP.
+
+        Parameters
+        ----------
+        site : string
+            Where the LP was solved.
+        duration : float
+            Time spent in the solver, in seconds.
+        status : integer
+            Status of the solver (0 if solved).
+
+        Returns
+        -------
+        None.
+
+        """
+        if site not in self._lp:
+            self._lp[site] = {'count': 0, 'time': 0.0, 'status': {}}
+        stats = self._lp[site]
+        stats['count'] += 1
+        stats['time'] += duration
+        status = str(status)
+        stats['status'][status] = stats['status'].get(status, 0) + 1
+
+    def add_event(self, event, nb = 1):
+        """
+        Count an event (a fallback instead of a LP for instance).
+
+        Parameters
+        ----------
+        event : string
+            The event.
+        nb : integer, optional
+            Number of times it happened. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._events[event] = self._events.get(event, 0) + nb
+
+    def add_cells(self, nb_cells):
+        """
+        Keep the number of cells after each question of an elicitation.
+
+        Parameters
+        ----------
+        nb_cells : list
+            Number of cells after each question.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._cells.append([int(nb) for nb in nb_cells])
+
+    def merge(self, other):
+        """
+        Add what another collector collected.
+
+        Parameters
+        ----------
+        other : LPCollector or dict
+            The other collector, or its dict.
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(other, LPCollector):
+            other = other.to_dict()
+        for site, other_stats in other['lp'].items():
+            if site not in self._lp:
+                self._lp[site] = {'count': 0, 'time': 0.0, 'status': {}}
+            stats = self._lp[site]
+            stats['count'] += other_stats['count']
+            stats['time'] += other_stats['time']
+            for status, nb in other_stats['status'].items():
+                stats['status'][status] = stats['status'].get(status, 0) + nb
+        for event, nb in other['events'].items():
+            self.add_event(event, nb)
+        for nb_cells in other['cells']:
+            self.add_cells(nb_cells)
+
+    def get_nb_lp(self):
+        """
+        Get the number of LPs, all sites together.
+        """
+        return sum(stats['count'] for stats in self._lp.values())
+
+    def to_dict(self):
+        """
+        Get everything collected (JSON serialisable).
+
+        Returns
+        -------
+        dict
+            LPs by site ('lp'), events ('events') and number of cells after
+            each question for each elicitation ('cells').
+
+        """
+        d = {}
+        d['lp'] = {site: {'count': stats['count'], 'time': stats['time'],
+                          'status': dict(stats['status'])}
+                   for site, stats in self._lp.items()}
+        d['events'] = dict(self._events)
+        d['cells'] = [list(nb_cells) for nb_cells in self._cells]
+        return d
+
+    def dump(self, file_path):
+        """
+        Write everything collected in a JSON file.
+
+        Parameters
+        ----------
+        file_path : string
+            The file.
+
+        Returns
+        -------
+        None.
+
+        """
+        with open(file_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent = 1)
+
+def solve_lp(site, solver, *args, **kwargs):
+    """
+    Call a solver (linprog, milp) and count the LP on the active collectors.
+
+    Parameters
+    ----------
+    site : string
+        Where the LP is solved.
+    solver : callable
+        The solver, returning a result with a status.
+    *args, **kwargs
+        Arguments of the solver.
+
+    Returns
+    -------
+    OptimizeResult
+        The result of the solver.
+
+    """
+    if not _collectors:
+        return solver(*args, **kwargs)
+    start_time = time.perf_counter()
+    res = solver(*args, **kwargs)
+    duration = time.perf_counter() - start_time
+    for collector in _collectors:
+        collector.add_lp(site, duration, res.status)
+    return res
+
+def record_event(event, nb = 1):
+    """
+    Count an event on the active collectors.
+
+    Parameters
+    ----------
+    event : string
+        The event.
+    nb : integer, optional
+        Number of times it happened. The default is 1.
+
+    Returns
+    -------
+    None.
+
+    """
+    for collector in _collectors:
+        collector.add_event(event, nb)
+
+def record_cells(nb_cells):
+    """
+    Keep the number of cells after each question on the active collectors.
+
+    Parameters
+    ----------
+    nb_cells : list
+        Number of cells after each question.
+
+    Returns
+    -------
+    None.
+
+    """
+    for collector in _collectors:
+        collector.add_cells(nb_cells)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Cache of the values of the cells (PMR, min, max), across repetitions and runs."""
+
+import os
+import pickle
+import hashlib
+import tempfile
+import numpy as np
+from elicitation.memo import LRUMemo
+
+class LPCache:
+    """
+    Keep the values of the last cells in memory, and optionally all of them
+    in a folder (one file per cell and kind of value), shared by the workers
+    and the runs.
+    """
+
+    def __init__(self, max_size = 1024, path = None):
+        """
+        Parameters
+        ----------
+        max_size : integer, optional
+            Number of values kept in memory. The default is 1024.
+        path : string, optional
+            Folder where the values are also kept. The default is None (only
+            in memory).
+        """
+        self._memo = LRUMemo(max_size)
+        self._path = path
+        if path is not None and not os.path.exists(path):
+            os.makedirs(path, exist_ok = True)
+
+    def get(self, key):
+        """
+        Get the values of a key, from memory or from the folder.
+
+        Parameters
+        ----------
+        key : string
+            The key, as given by get_cell_key.
+
+        Returns
+        -------
+        object
+            The values, None if they are not kept.
+        """
+        values = self._memo.get(key)
+        if values is None and self._path is not None:
+            try:
+                with open(os.path.join(self._path, key + '.pk'), 'rb') as f:
+                    values = pickle.load(f)
+            except (IOError, EOFError, pickle.UnpicklingError):
+                return None
+            self._memo.put(key, values)
+        return values
+
+    def put(self, key, values):
+        """
+        Keep the values of a key, in memory and in the folder.
+
+        Parameters
+        ----------
+        key : string
+            The key, as given by get_cell_key.
+        values : object
+            The values.
+
+        Returns
+        -------
+        None.
+        """
+        self._memo.put(key, values)
+        if self._path is not None:
+            #Written then renamed, so that a worker never reads a partial file.
+            fd, temp_path = tempfile.mkstemp(dir = self._path, suffix = '.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(values, f)
+            os.replace(temp_path, os.path.join(self._path, key + '.pk'))
+
+    def __getstate__(self):
+        #Sent to the workers without what is in memory.
+        return {'max_size': self._memo.get_max_size(), 'path': self._path}
+
+    def __setstate__(self, state):
+        self._memo = LRUMemo(state['max_size'])
+        self._path = state['path']
+
+def get_cell_key(polytope, alternative_set, kind):
+    """
+    Key of the values of a cell: the constrainsts normalised (each row of
+    [A_ub b_ub] divided by the largest absolute value of A_ub), sorted and
+    without duplicates, the equality constrainsts, the bounds, the
+    alternatives and the kind of values.
+
+    Parameters
+    ----------
+    polytope : Polytope
+        The cell.
+    alternative_set : AlternativeSet
+        The alternatives.
+    kind : string
+        Kind of values ('pmr', 'min' or 'max').
+
+    Returns
+    -------
+    string
+        The key.
+    """
+    A_ub, b_ub, A_eq, b_eq = polytope.get_constrainsts()
+    digest = hashlib.sha1((kind + alternative_set.get_hash()).encode())
+    if A_ub is not None:
+        rows = np.hstack((np.atleast_2d(A_ub), np.reshape(b_ub, (-1, 1)))).astype(float)
+        scales = np.max(np.abs(rows[:,0:-1]), axis = 1)
+        rows = rows / np.where(scales > 0, scales, 1)[:,np.newaxis]
+        #+ 0.0 makes the -0.0 zeros.
+        rows = np.unique(rows + 0.0, axis = 0)
+        digest.update(str(rows.shape).encode())
+        digest.update(np.ascontiguousarray(rows).tobytes())
+    for constraint in (A_eq, b_eq):
+        constraint = np.ascontiguousarray(constraint, dtype = float)
+        digest.update(str(constraint.shape).encode())
+        digest.update(constraint.tobytes())
+    digest.update(repr(polytope.get_bounds()).encode())
+    return digest.hexdigest()
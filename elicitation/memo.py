@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Least recently used memo, for results asked again with the same inputs."""
+
+from collections import OrderedDict
+
+class LRUMemo:
+    """
+    Keep the results of the last max_size keys.
+    """
+
+    def __init__(self, max_size = 128):
+        """
+        Parameters
+        ----------
+        max_size : integer, optional
+            Maximal number of results kept. The default is 128.
+        """
+        self._max_size = max_size
+        self._results = OrderedDict()
+
+    def get(self, key):
+        """
+        Get the result of a key.
+
+        Parameters
+        ----------
+        key : hashable
+            The key.
+
+        Returns
+        -------
+        object
+            The result, None if it is not kept.
+        """
+        if key not in self._results:
+            return None
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key, result):
+        """
+        Keep the result of a key, forgetting the least recently used one if full.
+
+        Parameters
+        ----------
+        key : hashable
+            The key.
+        result : object
+            The result.
+
+        Returns
+        -------
+        None.
+        """
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self._max_size:
+            self._results.popitem(last = False)
+
+    def get_max_size(self):
+        """
+        Get the maximal number of results kept.
+        """
+        return self._max_size
+
+    def clear(self):
+        """
+        Forget all the results.
+        """
+        self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
@@ -32,6 +32,22 @@ class ModelWeightedSum():
         """
         return alternative
 
+    def get_opti_alternatives(self, alternatives):
+        """
+        The correct form of several alternatives for optimisation.
+        
+        Parameters
+        ----------
+        alternatives : array_like
+            Alternatives represented by their criteria (last axis).
+            
+        Returns
+        ----------
+        array_like
+            The correct form, for each alternative.
+        """
+        return np.asarray(alternatives)
+
     def get_diff(self, alternative_1, alternative_2, best_prefered = True):
         """
         Difference between two alternatives.
@@ -142,6 +158,22 @@ class ModelOWA():
         """
         return np.sort(alternative)[::-1]
 
+    def get_opti_alternatives(self, alternatives):
+        """
+        The correct form of several alternatives for optimisation.
+        
+        Parameters
+        ----------
+        alternatives : array_like
+            Alternatives represented by their criteria (last axis).
+            
+        Returns
+        ----------
+        array_like
+            The correct form, for each alternative.
+        """
+        return -np.sort(-np.asarray(alternatives), axis = -1)
+
     def get_diff(self, alternative_1, alternative_2, best_prefered = True):
         """
         Difference between two alternatives.
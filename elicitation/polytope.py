@@ -5,6 +5,10 @@ from copy import deepcopy
 import numpy as np
 from scipy.optimize import linprog
 from elicitation.fusion import tnorm
+from elicitation.quantization import is_quantized, get_full_possibility, possibility_scale
+from elicitation.geometry import clip_polygon
+from elicitation.budget import add_lp, is_exhausted
+from elicitation.instrumentation import solve_lp, record_event
 
 class Polytope:
     """
@@ -14,7 +18,7 @@ class Polytope:
 
     def __init__(self, constraints_A_ub, constraints_b_ub,
                  constraints_A_eq, constraints_b_eq,
-                 bounds):
+                 bounds, vertices = None, quantized = False):
         """
         Parameters
         ----------
@@ -28,16 +32,24 @@ class Polytope:
             1-D array of values representing b for the constrainst Ax = b.
         bounds : sequence
             Minimum and maximum values for each parameters of the model space.
+        vertices : array_like, optional
+            2-D array of the vertices, in order, when the polytope is at most a
+            polygon. The default is None (only the constrainsts are known).
+        quantized : bool, optional
+            The possibility and the answers are quantized (see
+            elicitation.quantization). The default is False.
         """
         self._answers = []
-        self._possibility = 1
+        self._possibility = np.uint16(possibility_scale) if quantized is True else 1
         self._constraints_A_ub = constraints_A_ub
         self._constraints_b_ub = constraints_b_ub
         self._constraints_A_eq = constraints_A_eq
         self._constraints_b_eq = constraints_b_eq
         self._bounds = bounds
+        self._vertices = vertices
 
-    def add_answer(self, constraint_A, constraint_b, confidence, tnorm_rule = 'minimum'):
+    def add_answer(self, constraint_A, constraint_b, confidence, tnorm_rule = 'minimum',
+                   implied = False):
         """
         Add a new answer properly
 
@@ -51,18 +63,22 @@ class Polytope:
             Certainty degree.
         fusion_rule : string, optional
             The T-norm to apply. The default is 'product'.
+        implied : bool, optional
+            The constrainst is implied by the others (the whole polytope is on
+            its side): only the answer is kept. The default is False.
 
         Returns
         -------
         None.
 
         """
-        if self._constraints_A_ub is None:
-            self._constraints_A_ub = constraint_A
-            self._constraints_b_ub = constraint_b
-        else:
-            self._constraints_A_ub = np.vstack((self._constraints_A_ub, constraint_A))
-            self._constraints_b_ub = np.vstack((self._constraints_b_ub, constraint_b))
+        if not implied:
+            if self._constraints_A_ub is None:
+                self._constraints_A_ub = constraint_A
+                self._constraints_b_ub = constraint_b
+            else:
+                self._constraints_A_ub = np.vstack((self._constraints_A_ub, constraint_A))
+                self._constraints_b_ub = np.vstack((self._constraints_b_ub, constraint_b))
         self._answers.append(confidence)
         self._possibility = tnorm([self._possibility,confidence],tnorm_rule)
 
@@ -88,6 +104,30 @@ class Polytope:
             possibility = tnorm([possibility, self._answers[i]], fusion_rule)
         self._possibility = possibility
 
+    def delete_constrainsts(self, constrainst_ids):
+        """
+        Removes inequality constrainsts (not their answers).
+
+        Parameters
+        ----------
+        constrainst_ids : array_like
+            Rows of A_ub to remove.
+
+        Returns
+        -------
+        None.
+
+        """
+        if len(constrainst_ids) == 0:
+            return
+        A_ub = np.delete(np.atleast_2d(self._constraints_A_ub), constrainst_ids, axis = 0)
+        b_ub = np.delete(np.reshape(self._constraints_b_ub, (-1, 1)), constrainst_ids, axis = 0)
+        if A_ub.shape[0] == 0:
+            A_ub = None
+            b_ub = None
+        self._constraints_A_ub = A_ub
+        self._constraints_b_ub = b_ub
+
     def get_constrainsts(self):
         """
         Get the constrainsts.
@@ -100,6 +140,18 @@ class Polytope:
         """
         return self._bounds
 
+    def get_vertices(self):
+        """
+        Get the vertices (None if unknown).
+        """
+        return self._vertices
+
+    def set_vertices(self, vertices):
+        """
+        Set the vertices.
+        """
+        self._vertices = vertices
+
     def get_possibility(self):
         """
         Get the possibility.
@@ -112,6 +164,152 @@ class Polytope:
         """
         return self._answers
 
+class PolytopeList(list):
+    """
+    List of polytopes sharing the same equality constrainsts and bounds, as
+    made by get_polytopes. It is pickled as a few contiguous arrays (see
+    pack_polytopes) instead of one object per polytope.
+    """
+
+    def __reduce__(self):
+        packed = pack_polytopes(self)
+        if packed is None:
+            return (PolytopeList, (list(self),))
+        return (unpack_polytopes, (packed,))
+
+def _concatenate(arrays, dtype = float):
+    """
+    Concatenate arrays along their first axis, with the offset of each one.
+    """
+    offsets = np.zeros(len(arrays) + 1, dtype = np.int32)
+    offsets[1:] = np.cumsum([len(array) for array in arrays])
+    return np.concatenate(arrays).astype(dtype, copy = False), offsets
+
+def pack_polytopes(polytope_list):
+    """Pack polytopes sharing the same equality constrainsts and bounds into
+    contiguous arrays. The cells of an elicitation are cut by the same
+    questions, so each constrainst and each value of the answers is kept once
+    (the constrainsts up to their sign), like each vertex shared by neighbour
+    polygons, and each polytope only has the ids of its constrainsts, answers
+    and vertices, with their offsets.
+
+    Parameters
+    ----------
+    polytope_list : list
+        The polytopes.
+
+    Returns
+    -------
+    dict
+        The packed polytopes, None if the list is empty or if the equality
+        constrainsts or bounds are not shared.
+    """
+    if len(polytope_list) == 0:
+        return None
+    _, _, A_eq, b_eq = polytope_list[0].get_constrainsts()
+    bounds = polytope_list[0].get_bounds()
+    nb_columns = np.shape(A_eq)[-1]
+    constraints = [polytope.get_constrainsts() for polytope in polytope_list]
+    if (any(polytope.get_bounds() != bounds for polytope in polytope_list)
+            or not np.array_equal(np.asarray([constraint[2] for constraint in constraints]),
+                                  np.broadcast_to(A_eq, (len(constraints),) + np.shape(A_eq)))
+            or not np.array_equal(np.asarray([constraint[3] for constraint in constraints]),
+                                  np.broadcast_to(b_eq, (len(constraints),) + np.shape(b_eq)))):
+        return None
+    ndim = np.asarray([(np.ndim(A_ub), np.ndim(b_ub)) if A_ub is not None else (0, 0)
+                       for A_ub, b_ub, _, _ in constraints], dtype = np.int8)
+    A_ub_list = [np.zeros((0, nb_columns)) if A_ub is None else np.atleast_2d(A_ub)
+                 for A_ub, _, _, _ in constraints]
+    b_ub_list = [np.zeros(0) if b_ub is None else np.ravel(b_ub)
+                 for _, b_ub, _, _ in constraints]
+    vertices_list = [polytope.get_vertices() for polytope in polytope_list]
+    has_vertices = np.asarray([vertices is not None for vertices in vertices_list], dtype = bool)
+
+    A_ub_all, row_offsets = _concatenate(A_ub_list)
+    rows = np.hstack((A_ub_all, np.concatenate(b_ub_list)[:,np.newaxis]))
+    #Each constrainst is kept with the sign making its first non zero value positive.
+    first_values = rows[np.arange(0, len(rows)), np.argmax(rows != 0, axis = 1)]
+    signs = np.where(first_values < 0, -1, 1)
+    unique_rows, row_ids = np.unique(rows * signs[:,np.newaxis], axis = 0, return_inverse = True)
+
+    d = {}
+    d['A_eq'] = A_eq
+    d['b_eq'] = b_eq
+    d['bounds'] = bounds
+    d['A_rows'] = unique_rows[:,0:nb_columns]
+    d['b_rows'] = unique_rows[:,nb_columns]
+    #Id + 1 of the constrainst in A_rows, negative if it is the opposite one.
+    row_ids = (np.ravel(row_ids) + 1) * signs
+    d['row_ids'] = row_ids.astype(np.min_scalar_type(-len(unique_rows)))
+    d['row_offsets'] = row_offsets
+    d['ndim'] = ndim
+    #Quantized possibilities stay in uint16.
+    dtype = np.uint16 if is_quantized(polytope_list[0].get_possibility()) else float
+    answers, d['answer_offsets'] = _concatenate([np.asarray(polytope.get_answers(), dtype = dtype)
+                                                 for polytope in polytope_list], dtype)
+    #The answers only take a few values (1 or 1 - confidence of each question).
+    d['answer_values'], answer_ids = np.unique(answers, return_inverse = True)
+    d['answer_ids'] = answer_ids.astype(np.min_scalar_type(len(d['answer_values'])))
+    d['possibility'] = np.asarray([polytope.get_possibility() for polytope in polytope_list],
+                                  dtype = dtype)
+    d['has_vertices'] = has_vertices
+    if np.any(has_vertices):
+        vertex_columns = vertices_list[int(np.argmax(has_vertices))].shape[1]
+        vertices_list = [vertices if has_vertices[i] else np.zeros((0, vertex_columns))
+                         for i, vertices in enumerate(vertices_list)]
+        vertices, d['vertex_offsets'] = _concatenate(vertices_list)
+        #Neighbour polygons share their vertices.
+        d['vertex_values'], vertex_ids = np.unique(vertices, axis = 0, return_inverse = True)
+        d['vertex_ids'] = np.ravel(vertex_ids).astype(np.min_scalar_type(len(d['vertex_values'])))
+    return d
+
+def unpack_polytopes(packed):
+    """Rebuild the polytopes packed by pack_polytopes.
+
+    Parameters
+    ----------
+    packed : dict
+        The packed polytopes.
+
+    Returns
+    -------
+    PolytopeList
+        The polytopes, sharing the same equality constrainsts and bounds.
+    """
+    row_offsets = packed['row_offsets']
+    answer_offsets = packed['answer_offsets']
+    answers = packed['answer_values'][packed['answer_ids']]
+    quantized = is_quantized(answers)
+    row_ids = packed['row_ids'].astype(np.int64)
+    signs = np.sign(row_ids)
+    A_ub_all = packed['A_rows'][np.abs(row_ids) - 1] * signs[:,np.newaxis]
+    b_ub_all = packed['b_rows'][np.abs(row_ids) - 1] * signs
+    polytope_list = PolytopeList()
+    for i in range(0, len(packed['possibility'])):
+        A_ub = None
+        b_ub = None
+        if row_offsets[i+1] > row_offsets[i]:
+            A_ub = A_ub_all[row_offsets[i]:row_offsets[i+1]]
+            b_ub = b_ub_all[row_offsets[i]:row_offsets[i+1]]
+            A_ndim, b_ndim = packed['ndim'][i]
+            if A_ndim == 1:
+                A_ub = A_ub[0]
+            if b_ndim == 0:
+                b_ub = b_ub[0]
+            elif b_ndim == 2:
+                b_ub = b_ub.reshape(-1, 1)
+        vertices = None
+        if packed['has_vertices'][i]:
+            vertex_offsets = packed['vertex_offsets']
+            vertices = packed['vertex_values'][packed['vertex_ids'][vertex_offsets[i]:vertex_offsets[i+1]]]
+        polytope = Polytope(A_ub, b_ub, packed['A_eq'], packed['b_eq'], packed['bounds'], vertices)
+        polytope_answers = answers[answer_offsets[i]:answer_offsets[i+1]]
+        #Quantized answers keep their dtype.
+        polytope._answers = list(polytope_answers) if quantized else polytope_answers.tolist()
+        polytope._possibility = packed['possibility'][i]
+        polytope_list.append(polytope)
+    return polytope_list
+
 def construct_constrainst(alt_1, alt_2, alt_1_prefered, model):
     """Construct a constrainst according to Current Solution Strategy.
 
@@ -140,7 +338,7 @@ def construct_constrainst(alt_1, alt_2, alt_1_prefered, model):
         new_constrainst_a = new_constrainst_a[np.newaxis,:]
     return np.asarray(new_constrainst_a), np.asarray(new_constraints_b)
 
-def is_polytope_not_empty(A_ub, b_ub, A_eq, b_eq, bounds):
+def is_polytope_not_empty(A_ub, b_ub, A_eq, b_eq, bounds, space = None):
     """
     Check if a polytope is not empty
 
@@ -156,13 +354,21 @@ def is_polytope_not_empty(A_ub, b_ub, A_eq, b_eq, bounds):
         b_eq.
     bounds : tuple
         bounds.
+    space : ReducedSpace, optional
+        If given, the LP is solved without the equality constrainsts (which are
+        the ones of the space). The default is None.
 
     Returns
     -------
     bool
-        If it is empty.
+        If it is not empty. Only an infeasible LP makes it empty, a polytope
+        on which the LP fails is kept.
 
     """
+    if space is not None:
+        _, _, status = space.linprog(np.zeros(A_ub.shape[-1]), A_ub, b_ub,
+                                     site = 'is_polytope_not_empty')
+        return _is_feasible(status, 'is_polytope_not_empty')
     if A_ub.ndim == 1:
         A_ub = A_ub[np.newaxis,:]
     if A_eq.ndim == 1:
@@ -173,11 +379,181 @@ def is_polytope_not_empty(A_ub, b_ub, A_eq, b_eq, bounds):
     if b_eq.ndim == 2:
         b_eq = b_eq[:,0]
     c = np.ones((p,1))
-    linprog_res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
-                          method = 'highs')
-    return linprog_res.fun is not None
+    linprog_res = solve_lp('is_polytope_not_empty', linprog, c, A_ub, b_ub, A_eq, b_eq,
+                           bounds, method = 'highs')
+    return _is_feasible(linprog_res.status, 'is_polytope_not_empty')
+
+def _is_feasible(status, site):
+    """
+    Check the status of a LP: only an infeasible LP (status 2) means an empty
+    polytope, the other failures are counted as site + '_failure'.
+    """
+    if status not in (0, 2):
+        record_event(site + '_failure')
+    return status != 2
+
+def _minimize_on_polytope(polytope, c, space = None, budget = None):
+    """Min of cx on a polytope.
 
-def intersection_checker(polytope, constrainst_a, constrainst_b):
+    Parameters
+    ----------
+    polytope : ElementaryPolytope
+        A polytope of interest.
+    c : array_like
+        1-D array, the objective.
+    space : ReducedSpace, optional
+        If given, the LP is solved without the equality constrainsts. The default is None.
+    budget : Budget, optional
+        Budget on which the LP is counted. The default is None.
+
+    Returns
+    -------
+    float
+        Min of cx, None if the LP is not solved.
+    integer
+        Status of the LP: 0 if solved, 2 if the polytope is empty (see linprog).
+    """
+    vertices = polytope.get_vertices()
+    if vertices is not None:
+        record_event('classify_constrainst_vertices')
+        if len(vertices) == 0:
+            return None, 2
+        return np.min(vertices @ c), 0
+    A_ub, b_ub, A_eq, b_eq = polytope.get_constrainsts()
+    if A_ub is not None:
+        A_ub = np.atleast_2d(A_ub)
+        b_ub = np.asarray(b_ub).reshape(-1)
+    add_lp(budget)
+    if space is not None:
+        min_value, _, status = space.linprog(c, A_ub, b_ub, site = 'classify_constrainst')
+        return min_value, status
+    linprog_res = solve_lp('classify_constrainst', linprog, c, A_ub, b_ub, A_eq, b_eq,
+                           polytope.get_bounds(), method = 'highs')
+    return linprog_res.fun, linprog_res.status
+
+def remove_redundant_constrainsts(polytope, space = None, tolerance = 1e-9, budget = None):
+    """Remove the inequality constrainsts of a polytope implied by the others.
+
+    With the vertices, a constrainst is kept without LP if it is tight on at
+    least as many vertices as the dimension of the polygon (it holds an edge).
+    The others are checked one at a time: the max of Ax is computed on the
+    polytope with only the constrainsts still kept, and the constrainst is
+    removed if it does not go beyond b by more than the tolerance.
+
+    Parameters
+    ----------
+    polytope : ElementaryPolytope
+        A polytope of interest.
+    space : ReducedSpace, optional
+        If given, LPs are solved without the equality constrainsts. The default is None.
+    tolerance : float, optional
+        Tolerance on b. The default is 1e-9.
+    budget : Budget, optional
+        Budget on which the LPs are counted. Once exhausted, the remaining
+        constrainsts are kept. The default is None.
+
+    Returns
+    -------
+    integer
+        Number of constrainsts removed.
+    """
+    A_ub, b_ub, A_eq, b_eq = polytope.get_constrainsts()
+    if A_ub is None:
+        return 0
+    A_ub = np.atleast_2d(A_ub)
+    b_ub = np.asarray(b_ub).reshape(-1)
+    nb_constrainsts = A_ub.shape[0]
+    vertices = polytope.get_vertices()
+    if vertices is not None:
+        record_event('remove_redundant_vertices')
+        if len(vertices) == 0:
+            return 0
+        dimension = np.linalg.matrix_rank(vertices - vertices[0], tol = tolerance)
+        nb_tight = np.sum(np.abs(vertices @ A_ub.T - b_ub) <= tolerance, axis = 0)
+        #Not removed together: two constrainsts can each seem redundant
+        #because of the other (the same vertex).
+        candidates = np.where(nb_tight < max(dimension, 1))[0]
+    else:
+        candidates = range(0, nb_constrainsts)
+    keep = np.ones(nb_constrainsts, dtype = bool)
+    for i in candidates:
+        if is_exhausted(budget):
+            break
+        keep[i] = False
+        add_lp(budget)
+        others_A = A_ub[keep] if np.any(keep) else None
+        others_b = b_ub[keep] if np.any(keep) else None
+        if space is not None:
+            max_value, _, _ = space.linprog(-A_ub[i], others_A, others_b,
+                                            site = 'remove_redundant_constrainsts')
+        else:
+            max_value = solve_lp('remove_redundant_constrainsts', linprog, -A_ub[i],
+                                 others_A, others_b, A_eq, b_eq, polytope.get_bounds(),
+                                 method = 'highs').fun
+        if max_value is None or -max_value > b_ub[i] + tolerance:
+            keep[i] = True
+    redundant = np.where(~keep)[0]
+    polytope.delete_constrainsts(redundant)
+    return len(redundant)
+
+def classify_constrainst(polytope, constrainst_a, constrainst_b, space = None,
+                         tolerance = 1e-9, budget = None):
+    """Find on which side of a constrainst Ax < b a polytope is, from the range of Ax.
+
+    The max of Ax is only computed if the min does not already decide.
+
+    Parameters
+    ----------
+    polytope : ElementaryPolytope
+        A polytope of interest.
+    constrainst_a : array_like
+        1-D array of values representing A for the constrainst Ax <= b.
+    constrainst_b : float
+        Value representing b for the constrainst Ax <= b.
+    space : ReducedSpace, optional
+        If given, LPs are solved without the equality constrainsts. The default is None.
+    tolerance : float, optional
+        The polytope has to go beyond b by more than it on both sides to be cut.
+        The default is 1e-9.
+    budget : Budget, optional
+        Budget on which the LPs are counted. The default is None.
+
+    Returns
+    -------
+    integer
+        0 if the constrainst intersects (or if a LP fails, the polytope is
+        then cut).
+        -1 if b < min(Ax) given the constrainsts and bounds of the polytope.
+        1 if b > max(Ax) given the constrainsts and bounds of the polytope.
+        None if the polytope is empty (infeasible LP): it has to be dropped.
+    bool
+        If the polytope is near-degenerate: it only touches b (within the
+        tolerance) or is empty.
+    """
+    constrainst_a = np.asarray(constrainst_a).reshape(-1)
+    constrainst_b = np.asarray(constrainst_b).reshape(-1)[0]
+    min_value, status = _minimize_on_polytope(polytope, constrainst_a, space, budget)
+    if status == 2:
+        record_event('classify_constrainst_empty')
+        return None, True
+    if status != 0:
+        record_event('classify_constrainst_failure')
+        return 0, False
+    if min_value >= constrainst_b + tolerance:
+        return -1, False
+    max_value, status = _minimize_on_polytope(polytope, -constrainst_a, space, budget)
+    if status != 0:
+        record_event('classify_constrainst_failure')
+        return 0, False
+    max_value = -max_value
+    if max_value <= constrainst_b + tolerance:
+        return 1, max_value > constrainst_b - tolerance
+    if min_value >= constrainst_b - tolerance:
+        return -1, True
+    return 0, False
+
+def intersection_checker(polytope, constrainst_a, constrainst_b, space = None,
+                         tolerance = 1e-9):
     """Check if a constrainst Ax < b intersects with a polytope.
 
     Parameters
@@ -188,6 +564,11 @@ def intersection_checker(polytope, constrainst_a, constrainst_b):
         1-D array of values representing A for the constrainst Ax <= b.
     constrainst_b : float
         Value representing b for the constrainst Ax <= b.
+    space : ReducedSpace, optional
+        If given, LPs are solved without the equality constrainsts. The default is None.
+    tolerance : float, optional
+        The polytope has to go beyond b by more than it on both sides to be cut.
+        The default is 1e-9.
         
     Returns
     -------
@@ -195,42 +576,10 @@ def intersection_checker(polytope, constrainst_a, constrainst_b):
         0 if the constrainst intersects. 
         -1 if b < min(Ax) given the constrainsts and bounds of the polytope.
         1 if b > max(Ax) given the constrainsts and bounds of the polytope.
+        None if the polytope is empty.
     """
-    A_ub, b_ub, A_eq, b_eq = polytope.get_constrainsts()
-    polytope_bounds = polytope.get_bounds()
-    Aplus = constrainst_a
-    Amoins = -constrainst_a
-    bplus = constrainst_b
-    bmoins = -constrainst_b
-    if A_ub is not None:
-        Aplus = np.vstack((Aplus, A_ub))
-        Amoins = np.vstack((Amoins, A_ub))
-        bplus = np.vstack((bplus, b_ub))
-        bmoins = np.vstack((bmoins, b_ub))
-    first_side = is_polytope_not_empty(Aplus, bplus, A_eq, b_eq, polytope_bounds)
-    second_side = is_polytope_not_empty(Amoins, bmoins, A_eq, b_eq, polytope_bounds)
-    if first_side and second_side :
-        return 0
-    if first_side:
-        return 1
-    if second_side:
-        return -1
-    
-    #Case it does not work: add some noise.
-    Aplus = Aplus + np.random.normal(0.0, 10**-8, size = Aplus.shape)
-    Amoins = Amoins + np.random.normal(0.0, 10**-8, size = Amoins.shape)
-    bplus = bplus + np.random.normal(0.0, 10**-8, size = bplus.shape)
-    bmoins = bmoins + np.random.normal(0.0, 10**-8, size = bmoins.shape)
-    first_side = is_polytope_not_empty(Aplus, bplus, A_eq, b_eq, polytope_bounds)
-    second_side = is_polytope_not_empty(Amoins, bmoins, A_eq, b_eq, polytope_bounds)
-    if first_side and second_side :
-        return 0
-    if first_side:
-        return 1
-    if second_side:
-        return -1
-    
-    return None #If fails.
+    side, _ = classify_constrainst(polytope, constrainst_a, constrainst_b, space, tolerance)
+    return side
 
 def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_rule = 'minimum'):
     """Seperate a polytope into two polytopes according to a constrainst Ax < b.
@@ -245,7 +594,7 @@ def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_
         Value representing b for the constrainst Ax <= b.
     confidence : float, optional
         The confidence level given by a DM, which will determine the possibility 
-        of the second polytope.
+        of the second polytope. Quantized if the polytope is.
     fusion_rule : string
         The T-norm used for merging information.
         
@@ -261,10 +610,16 @@ def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_
     ValueError
         If the confidence is not in the interval [0,1].
     """
-    if confidence < 0 or confidence > 1:
+    #A quantized confidence is in [0,possibility_scale].
+    full = get_full_possibility(confidence)
+    if confidence < 0 or confidence > full:
         raise ValueError('The confidence has to be in the interval [0,1].')
     polytope_1 = deepcopy(polytope)
     polytope_2 = deepcopy(polytope)
-    polytope_1.add_answer(constrainst_a, constrainst_b, 1, fusion_rule)
-    polytope_2.add_answer(-constrainst_a, -constrainst_b, 1-confidence, fusion_rule)
+    polytope_1.add_answer(constrainst_a, constrainst_b, full, fusion_rule)
+    polytope_2.add_answer(-constrainst_a, -constrainst_b, full-confidence, fusion_rule)
+    vertices = polytope.get_vertices()
+    if vertices is not None:
+        polytope_1.set_vertices(clip_polygon(vertices, constrainst_a, constrainst_b))
+        polytope_2.set_vertices(clip_polygon(vertices, -constrainst_a, -constrainst_b))
     return polytope_1, polytope_2
\ No newline at end of file
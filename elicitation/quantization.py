@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Possibilities in fixed point: uint16 in units of 1/possibility_scale.
+
+Confidences have two decimals, so the minimum and Lukasiewicz T-norms are
+exact on this grid, and the product is rounded at each fusion (never to 0, so
+the same cells are kept). The uint16 dtype tells a quantized possibility from
+a float one."""
+
+import numpy as np
+
+possibility_scale = 10000 #Units of 1e-4, the full possibility fits in uint16.
+
+def quantize(possibilities):
+    """
+    Quantize possibilities.
+
+    Parameters
+    ----------
+    possibilities : array_like
+        Possibilities in [0,1].
+
+    Returns
+    -------
+    array_like
+        The possibilities in units of 1/possibility_scale (uint16).
+    """
+    return np.round(np.asarray(possibilities, dtype = float) * possibility_scale).astype(np.uint16)
+
+def dequantize(possibilities):
+    """
+    Possibilities as floats, quantized or not.
+
+    Parameters
+    ----------
+    possibilities : array_like
+        Possibilities.
+
+    Returns
+    -------
+    array_like
+        The possibilities in [0,1] (float).
+    """
+    if is_quantized(possibilities):
+        return np.asarray(possibilities, dtype = float) / possibility_scale
+    return np.asarray(possibilities, dtype = float)
+
+def is_quantized(possibilities):
+    """
+    Check if possibilities are quantized.
+
+    Parameters
+    ----------
+    possibilities : array_like
+        Possibilities (a scalar or a sequence).
+
+    Returns
+    -------
+    bool
+        If they are in units of 1/possibility_scale.
+    """
+    return np.asarray(possibilities).dtype == np.uint16
+
+def get_full_possibility(possibilities):
+    """
+    The possibility 1, in the representation of some possibilities.
+
+    Parameters
+    ----------
+    possibilities : array_like
+        Possibilities.
+
+    Returns
+    -------
+    integer or float
+        possibility_scale (uint16) if they are quantized, 1 otherwise.
+    """
+    if is_quantized(possibilities):
+        return np.uint16(possibility_scale)
+    return 1
@@ -6,12 +6,14 @@ import numpy as np
 class RandomQuestionStrategy():
     """Random questions"""
 
-    def __init__(self, alternatives):
+    def __init__(self, alternatives, rng = None):
         """
         Parameters
         ----------
         alternatives : array_like
             Alternatives.
+        rng : RandomState, optional
+            Random generator. The default is None (the global one of numpy.random).
 
         Returns
         -------
@@ -19,9 +21,17 @@ class RandomQuestionStrategy():
 
         """
         self._alternatives = alternatives
+        self._rng = np.random if rng is None else rng
         self._nb_alternatives = len(alternatives)
-        self._visited_pairs = np.zeros((self._nb_alternatives,self._nb_alternatives))
-        np.fill_diagonal(self._visited_pairs, 1)
+        #Opponents already visited by each alternative (only the visited pairs are stored).
+        self._visited_pairs = {}
+        #Alternatives with at least one unvisited pair, with swap-remove.
+        self._available = np.arange(0, self._nb_alternatives)
+        self._available_position = np.arange(0, self._nb_alternatives)
+        self._nb_available = self._nb_alternatives if self._nb_alternatives > 1 else 0
+        #Lazy Fisher-Yates permutation of the opponents of each alternative.
+        self._permutations = {}
+        self._nb_drawn = {}
 
     def set_pair_visited(self, alt_idx_1,alt_idx_2):
         """
@@ -39,12 +49,39 @@ class RandomQuestionStrategy():
         None.
 
         """
-        self._visited_pairs[alt_idx_1,alt_idx_2] = 1
-        self._visited_pairs[alt_idx_2,alt_idx_1] = 1
+        if alt_idx_1 == alt_idx_2 or alt_idx_2 in self._visited_pairs.get(alt_idx_1, ()):
+            return
+        for alt_idx, other_idx in ((alt_idx_1, alt_idx_2), (alt_idx_2, alt_idx_1)):
+            visited = self._visited_pairs.setdefault(alt_idx, set())
+            visited.add(other_idx)
+            if len(visited) == self._nb_alternatives - 1:
+                self._remove_available(alt_idx)
+
+    def _remove_available(self, alt_idx):
+        """
+        Remove an alternative whose pairs were all visited (swap-remove).
+
+        Parameters
+        ----------
+        alt_idx : integrer
+            The alternative.
+
+        Returns
+        -------
+        None.
+
+        """
+        position = self._available_position[alt_idx]
+        last_idx = self._available[self._nb_available - 1]
+        self._available[position] = last_idx
+        self._available_position[last_idx] = position
+        self._available[self._nb_available - 1] = alt_idx
+        self._available_position[alt_idx] = self._nb_available - 1
+        self._nb_available -= 1
 
     def give_candidate(self):
         """
-        Get a candidate (random).
+        Get a candidate (random), among the alternatives with an unvisited pair.
 
         Returns
         -------
@@ -55,18 +92,17 @@ class RandomQuestionStrategy():
 
         """
         candidate_alt_id = -1
-        alternatives_random = np.arange(0, self._nb_alternatives)
-        np.random.shuffle(alternatives_random)
-        for i in alternatives_random:
-            if not np.all(self._visited_pairs[i,:] == 1):
-                candidate_alt_id = i
-                break
+        if self._nb_available > 0:
+            candidate_alt_id = self._available[self._rng.randint(0, self._nb_available)]
         candidate_alt = self._alternatives[candidate_alt_id]
         return candidate_alt, candidate_alt_id
 
     def give_oponent(self, candidate_alt_id):
         """
-        Get a random opponent
+        Get a random opponent, among the unvisited pairs of the candidate.
+
+        Opponents are drawn from a lazy Fisher-Yates permutation, skipping
+        those already visited from the other side.
 
         Parameters
         ----------
@@ -82,14 +118,20 @@ class RandomQuestionStrategy():
 
         """
         worst_alt_id = -1
-        alternatives_random = np.arange(0, self._nb_alternatives)
-        np.random.shuffle(alternatives_random)
-        for j in alternatives_random:
-            if self._visited_pairs[candidate_alt_id,j] != 1:
+        permutation = self._permutations.setdefault(candidate_alt_id, {})
+        nb_drawn = self._nb_drawn.get(candidate_alt_id, 0)
+        visited = self._visited_pairs.get(candidate_alt_id, ())
+        while nb_drawn < self._nb_alternatives:
+            k = self._rng.randint(nb_drawn, self._nb_alternatives)
+            j = permutation.get(k, k)
+            permutation[k] = permutation.get(nb_drawn, nb_drawn)
+            permutation.pop(nb_drawn, None)
+            nb_drawn += 1
+            if j != candidate_alt_id and j not in visited:
                 worst_alt_id = j
                 break
-        self._visited_pairs[candidate_alt_id, worst_alt_id] = 1
-        self._visited_pairs[worst_alt_id, candidate_alt_id] = 1
+        self._nb_drawn[candidate_alt_id] = nb_drawn
+        if worst_alt_id != -1:
+            self.set_pair_visited(candidate_alt_id, worst_alt_id)
         worst_alt = self._alternatives[worst_alt_id]
         return worst_alt, worst_alt_id
-    
\ No newline at end of file
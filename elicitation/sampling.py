@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Weights drawn inside a polytope by a hit-and-run walk, for the approximate
+values of the cells with many parameters."""
+
+import numpy as np
+from scipy.linalg import null_space
+from scipy.optimize import linprog
+from elicitation.budget import add_lp
+from elicitation.instrumentation import solve_lp
+
+def _get_inequalities(polytope):
+    """
+    Inequality constrainsts of a polytope with its bounds, Gx <= h.
+    """
+    A_ub, b_ub, _, _ = polytope.get_constrainsts()
+    bounds = polytope.get_bounds()
+    nb_parameters = len(bounds)
+    rows = []
+    values = []
+    if A_ub is not None:
+        rows.append(np.atleast_2d(np.asarray(A_ub, dtype = float)))
+        values.append(np.asarray(b_ub, dtype = float).reshape(-1))
+    identity = np.eye(nb_parameters)
+    for i, (bound_min, bound_max) in enumerate(bounds):
+        if bound_min is not None:
+            rows.append(-identity[i:i+1])
+            values.append(np.asarray([-bound_min], dtype = float))
+        if bound_max is not None:
+            rows.append(identity[i:i+1])
+            values.append(np.asarray([bound_max], dtype = float))
+    if len(rows) == 0:
+        return np.zeros((0, nb_parameters)), np.zeros(0)
+    return np.vstack(rows), np.concatenate(values)
+
+def _get_directions(polytope):
+    """
+    Orthonormal basis of the directions keeping the equality constrainsts.
+    """
+    _, _, A_eq, _ = polytope.get_constrainsts()
+    nb_parameters = len(polytope.get_bounds())
+    if A_eq is None:
+        return np.eye(nb_parameters)
+    return null_space(np.atleast_2d(np.asarray(A_eq, dtype = float)))
+
+def get_chebyshev_center(polytope, budget = None):
+    """
+    Center of the largest ball inside a polytope (in its equality constrainsts).
+
+    Parameters
+    ----------
+    polytope : Polytope
+        The polytope.
+    budget : Budget, optional
+        LP budget, the LP is counted. The default is None.
+
+    Returns
+    -------
+    array_like
+        The center, None if the polytope is empty.
+    float
+        The radius.
+    """
+    G, h = _get_inequalities(polytope)
+    _, _, A_eq, b_eq = polytope.get_constrainsts()
+    directions = _get_directions(polytope)
+    #Distance to each constrainst along the directions keeping the equalities.
+    norms = np.linalg.norm(G @ directions, axis = 1)
+    nb_parameters = G.shape[1]
+    c = np.zeros(nb_parameters + 1)
+    c[-1] = -1
+    A_eq_center = None
+    if A_eq is not None:
+        A_eq = np.atleast_2d(np.asarray(A_eq, dtype = float))
+        A_eq_center = np.hstack((A_eq, np.zeros((A_eq.shape[0], 1))))
+    add_lp(budget)
+    linprog_res = solve_lp('chebyshev_center', linprog, c = c,
+                           A_ub = np.hstack((G, norms[:,np.newaxis])), b_ub = h,
+                           A_eq = A_eq_center, b_eq = b_eq,
+                           bounds = [(None, None)] * nb_parameters + [(0, None)],
+                           method = 'highs')
+    if linprog_res.x is None:
+        return None, 0
+    return linprog_res.x[0:nb_parameters], linprog_res.x[-1]
+
+def sample_polytope(polytope, nb_samples, rng, budget = None):
+    """
+    Draw weights inside a polytope with a hit-and-run walk from its Chebyshev
+    center: at each step, a random direction (keeping the equality
+    constrainsts), and a point drawn uniformly on the chord. The ends of the
+    chords are kept too, as the optimum of a linear function is on the
+    boundary.
+
+    Parameters
+    ----------
+    polytope : Polytope
+        The polytope.
+    nb_samples : integer
+        Number of steps of the walk.
+    rng : Generator
+        Random generator.
+    budget : Budget, optional
+        LP budget, for the center. The default is None.
+
+    Returns
+    -------
+    array_like
+        2-D array, the center then the samples and the ends of the chords,
+        one per row. Empty if the polytope is empty.
+    """
+    center, radius = get_chebyshev_center(polytope, budget)
+    nb_parameters = len(polytope.get_bounds())
+    if center is None:
+        return np.zeros((0, nb_parameters))
+    directions = _get_directions(polytope)
+    if radius <= 0 or directions.shape[1] == 0:
+        return center[np.newaxis,:]
+    G, h = _get_inequalities(polytope)
+    steps = rng.standard_normal((nb_samples, directions.shape[1])) @ directions.T
+    steps /= np.linalg.norm(steps, axis = 1)[:,np.newaxis]
+    steps_G = steps @ G.T
+    uniforms = rng.random(nb_samples)
+    samples = np.zeros((3 * nb_samples + 1, nb_parameters))
+    samples[0] = center
+    point = center
+    slack = np.maximum(h - G @ center, 0)
+    for i in range(0, nb_samples):
+        step_G = steps_G[i]
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            limits = slack / step_G
+        t_max = np.min(limits[step_G > 0], initial = np.inf)
+        t_min = np.max(limits[step_G < 0], initial = -np.inf)
+        samples[3*i+2] = point + t_min * steps[i]
+        samples[3*i+3] = point + t_max * steps[i]
+        t = t_min + uniforms[i] * (t_max - t_min)
+        point = point + t * steps[i]
+        slack = np.maximum(slack - t * step_G, 0)
+        samples[3*i+1] = point
+    return samples
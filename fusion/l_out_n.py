@@ -3,7 +3,10 @@
 
 import itertools
 import numpy as np
+from scipy.optimize import milp, LinearConstraint, Bounds
 from elicitation.fusion import tnorm, tconorm
+from elicitation.instrumentation import solve_lp
+from elicitation.quantization import get_full_possibility
 
 def find_incorrect_answers(polytope_list):
     """
@@ -22,10 +25,66 @@ def find_incorrect_answers(polytope_list):
     """
     all_detected_incorrect_answers = []
     for polytope in polytope_list:
-        detected_incorrect_answers = len(np.where(np.asarray(polytope.get_answers()) < 1)[0])
+        answers = np.asarray(polytope.get_answers())
+        detected_incorrect_answers = len(np.where(answers < get_full_possibility(answers))[0])
         all_detected_incorrect_answers.append(detected_incorrect_answers)
     return all_detected_incorrect_answers
 
+def find_min_incorrect_answers(A_ub, b_ub, model, margin = 1e-6):
+    """
+    Determine the minimal number of incorrect answers directly from the answers,
+    without building the polytopes.
+
+    It is the minimal number of constrainsts to drop so that the model space is
+    not empty, found with a big-M MILP: each answer gets a binary variable
+    relaxing its constrainst. The kept constrainsts have to hold with a margin,
+    as the polytopes only keep cells with an interior. The margin has to be
+    above the feasibility tolerance of the solver (1e-7 for HiGHS), otherwise
+    a point only touching the constrainsts is feasible and fewer errors are
+    counted than in the polytopes.
+
+    Parameters
+    ----------
+    A_ub : array_like
+        2-D array of values representing A for the constrainsts Ax <= b.
+    b_ub : array_like
+        1-D array of values representing b for the constrainsts Ax <= b.
+    model : Model
+        The model.
+    margin : float, optional
+        The kept constrainsts have to hold as A_i x <= b_i - margin * ||A_i||.
+        The default is 1e-6.
+
+    Returns
+    -------
+    integer
+        Minimal number of incorrect answers.
+
+    """
+    A_ub = np.asarray(A_ub, dtype = float)
+    if A_ub.ndim == 1:
+        A_ub = A_ub[np.newaxis,:]
+    b_ub = np.asarray(b_ub, dtype = float).reshape(-1)
+    n, p = A_ub.shape
+    margin = margin * np.linalg.norm(A_ub, axis = 1)
+    constraints = model.get_model_constrainsts()
+    bounds = np.asarray(constraints['bounds'], dtype = float)
+    #Max of Ax - b on the bounds: relaxing by it makes the constrainst always true.
+    big_m = np.sum(np.maximum(A_ub * bounds[:,0], A_ub * bounds[:,1]), axis = 1) - b_ub
+    big_m = np.maximum(big_m, 0) + margin + 1
+    c = np.concatenate((np.zeros(p), np.ones(n)))
+    A_eq = constraints['A_eq']
+    milp_constraints = [LinearConstraint(np.hstack((A_ub, -np.diag(big_m))), -np.inf, b_ub - margin),
+                        LinearConstraint(np.hstack((A_eq, np.zeros((A_eq.shape[0], n)))),
+                                         constraints['b_eq'], constraints['b_eq'])]
+    integrality = np.concatenate((np.zeros(p), np.ones(n)))
+    milp_bounds = Bounds(np.concatenate((bounds[:,0], np.zeros(n))),
+                         np.concatenate((bounds[:,1], np.ones(n))))
+    milp_res = solve_lp('find_min_incorrect_answers', milp, c,
+                        constraints = milp_constraints, integrality = integrality,
+                        bounds = milp_bounds)
+    return int(np.round(milp_res.fun))
+
 def k_among_n_fusion(polytope_list, k, n):
     """
     l-out-of-k fusion as shown in the paper.
@@ -4,6 +4,8 @@
 import itertools
 import numpy as np
 from elicitation.fusion import tnorm
+from elicitation.budget import is_exhausted
+from elicitation.quantization import is_quantized, get_full_possibility
 
 def get_answers(polytope_list, nb_questions):
     """
@@ -22,7 +24,9 @@ def get_answers(polytope_list, nb_questions):
         All the answers.
 
     """
-    all_answers = np.zeros((len(polytope_list), nb_questions))
+    #Quantized answers stay in uint16.
+    dtype = np.uint16 if is_quantized(polytope_list[0].get_possibility()) else float
+    all_answers = np.zeros((len(polytope_list), nb_questions), dtype = dtype)
     for i in range(0, len(polytope_list)):
         all_answers[i,:] = polytope_list[i].get_answers()
     return all_answers
@@ -49,7 +53,7 @@ def is_subset_element_in_list(element, list_to_check):
             return True
     return False
 
-def find_all_maximum_coherent_subsets(answers, n):
+def find_all_maximum_coherent_subsets(answers, n, budget = None):
     """
     Find all the coherent subsets regardless of size.
 
@@ -59,6 +63,9 @@ def find_all_maximum_coherent_subsets(answers, n):
         The answers.
     n : integer
         The number of answers.
+    budget : Budget, optional
+        Time budget. Once exhausted, only the subsets found so far (the
+        largest ones) are returned. The default is None (no limit).
 
     Returns
     -------
@@ -67,10 +74,13 @@ def find_all_maximum_coherent_subsets(answers, n):
 
     """
     mcs_list = []
+    full = get_full_possibility(answers)
     combs_k = list(itertools.chain(*[itertools.combinations(range(0,n),k) for k in range(n,0,-1)]))
     for comb_k in combs_k:
+        if is_exhausted(budget):
+            break
         selected_answers = answers[:,list(comb_k)]
-        if (selected_answers == np.ones(len(comb_k))).all(1).any():
+        if (selected_answers == full).all(1).any():
             if is_subset_element_in_list(comb_k, mcs_list) is False:
                 mcs_list.append(list(comb_k))
     return mcs_list
@@ -95,11 +105,12 @@ def find_coherent_subsets(answers, k, n):
 
     """
     cs_list = []
+    full = get_full_possibility(answers)
     combs_k = itertools.combinations(range(0,n),k)
     for comb_k in combs_k:
         for answers_poly in answers:
             selected_answers = answers_poly[list(comb_k)]
-            if np.min(selected_answers) == 1:
+            if np.min(selected_answers) == full:
                 flag = 0
                 for l in cs_list:
                     if set(comb_k).issubset(set(l)):
@@ -152,7 +163,7 @@ def update_possibility_list(all_answers, best_cs, tnorm_rule = "product"):
         The updated confidence degrees list.
     """
     nb_polytopes = all_answers.shape[0]
-    possibility_list = np.zeros(nb_polytopes)
+    possibility_list = np.zeros(nb_polytopes, dtype = all_answers.dtype)
     subset_answers = all_answers[:, best_cs]
     for i in range(0, nb_polytopes):
         possibility_list[i] = tnorm(subset_answers[i,:], tnorm_rule)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Configurations of the experiments and where their data is."""
+
+import itertools
+
+def get_data_path(nb_parameters, conf_type, nb_questions):
+    """
+    Folder of the dataset and results of a configuration.
+
+    Parameters
+    ----------
+    nb_parameters : integer
+        Number of criteria.
+    conf_type : string
+        Type of confidence degrees.
+    nb_questions : integer
+        Number of questions.
+
+    Returns
+    -------
+    string
+        The folder, ending with '/'.
+    """
+    return 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
+
+def make_configurations(grid):
+    """
+    All the configurations of a grid.
+
+    Parameters
+    ----------
+    grid : dict
+        List of values for each setting (nb_parameters, nb_questions, conf_type,
+        nb_repetitions, nb_alternatives...).
+
+    Returns
+    -------
+    list
+        One dict per combination of values, with its folder ('path').
+    """
+    keys = list(grid)
+    configurations = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        configuration = dict(zip(keys, values))
+        configuration['path'] = get_data_path(configuration['nb_parameters'],
+                                              configuration['conf_type'],
+                                              configuration['nb_questions'])
+        configurations.append(configuration)
+    return configurations
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""Schedule the repetitions of a stage on a process pool according to their cost."""
+
+import time
+import heapq
+import multiprocessing
+from queue import Queue
+import numpy as np
+from elicitation.instrumentation import LPCollector
+from elicitation.elicitation import clear_recommendation_memo
+from elicitation.choice_calculation import set_sampling_task
+from pipeline.telemetry import init_worker, send_record
+
+def estimate_costs(rational_all):
+    """
+    Estimate the relative cost of each repetition: the number of cells and of
+    coherent subsets grows exponentially with the number of irrational answers.
+
+    Parameters
+    ----------
+    rational_all : array_like
+        2-D array, 1 if the answer is rational, 0 otherwise, for each repetition.
+
+    Returns
+    -------
+    array_like
+        The estimated cost of each repetition.
+    """
+    rational_all = np.asarray(rational_all)
+    nb_questions = rational_all.shape[1]
+    nb_errors = nb_questions - np.count_nonzero(rational_all, axis = 1)
+    return nb_questions * 2.0**nb_errors
+
+def get_number_of_workers(costs, max_workers = None, durations = None):
+    """
+    Number of workers for a stage: max_workers (at most one per task). The
+    pool is only made smaller from measured durations of the tasks, if the
+    longest-first schedule finishes as early with fewer workers.
+
+    Parameters
+    ----------
+    costs : array_like
+        The estimated cost of each task, giving the order of the tasks.
+    max_workers : integer, optional
+        Maximal number of workers. The default is None (all cores but two,
+        at most 30).
+    durations : array_like, optional
+        Measured duration of each task, in seconds, as in the run log of a
+        previous run (see StageReporter.get_durations). The default is None.
+
+    Returns
+    -------
+    integer
+        The number of workers.
+    """
+    costs = np.asarray(costs, dtype = float)
+    if max_workers is None:
+        max_workers = min(max(multiprocessing.cpu_count() - 2, 1), 30)
+    nb_workers = int(max(1, min(max_workers, len(costs))))
+    if durations is None:
+        return nb_workers
+    durations = np.asarray(durations, dtype = float)[np.argsort(-costs, kind = 'stable')]
+    makespan = get_makespan(durations, nb_workers)
+    for nb_fewer_workers in range(1, nb_workers):
+        if get_makespan(durations, nb_fewer_workers) <= makespan:
+            return nb_fewer_workers
+    return nb_workers
+
+def get_makespan(durations, nb_workers):
+    """
+    Time to run tasks on a pool, each task sent in order to the first free worker.
+
+    Parameters
+    ----------
+    durations : array_like
+        Duration of each task, in the order they are sent.
+    nb_workers : integer
+        Number of workers.
+
+    Returns
+    -------
+    float
+        Time when the last task finishes.
+    """
+    ends = [0.0] * nb_workers
+    for duration in durations:
+        heapq.heappush(ends, heapq.heappop(ends) + duration)
+    return max(ends)
+
+def run_stage(function, arguments, costs = None, initializer = None, initargs = (),
+              processes = None, collector = None, reporter = None, stage = None):
+    """
+    Run a function on each set of arguments in a pool, longest tasks first,
+    one task at a time per worker.
+
+    Parameters
+    ----------
+    function : callable
+        The function (defined at the top level of a module).
+    arguments : iterable
+        One tuple of arguments per task.
+    costs : array_like, optional
+        The estimated cost of each task. The default is None (same cost).
+    initializer : callable, optional
+        Called by each worker when it starts. The default is None.
+    initargs : tuple, optional
+        Arguments of the initializer. The default is ().
+    processes : integer, optional
+        Number of workers. The default is None (see get_number_of_workers,
+        with the durations of the previous run of the stage in the reporter).
+    collector : LPCollector, optional
+        If given, the LPs of each task are collected by the worker and merged
+        in it. The default is None.
+    reporter : StageReporter, optional
+        If given, each task sends its record to it. The default is None.
+    stage : string, optional
+        Name of the stage for the reporter. The default is None (name of the function).
+
+    Returns
+    -------
+    list
+        The results, in the order of the arguments.
+    """
+    arguments = list(arguments)
+    results = [None] * len(arguments)
+    for i, result in iterate_stage(function, arguments, costs, initializer, initargs,
+                                   processes, collector, reporter, stage):
+        results[i] = result
+    return results
+
+def iterate_stage(function, arguments, costs = None, initializer = None, initargs = (),
+                  processes = None, collector = None, reporter = None, stage = None,
+                  chunk_size = None):
+    """
+    Run a function on each set of arguments in a pool, longest tasks first,
+    and give each result as soon as it is finished. With a chunk size, at
+    most chunk_size tasks are in the pool at once (arguments and results),
+    a new one being sent as each result arrives.
+
+    Parameters
+    ----------
+    function : callable
+        The function (defined at the top level of a module).
+    arguments : iterable
+        One tuple of arguments per task.
+    costs : array_like, optional
+        The estimated cost of each task. The default is None (same cost).
+    initializer : callable, optional
+        Called by each worker when it starts. The default is None.
+    initargs : tuple, optional
+        Arguments of the initializer. The default is ().
+    processes : integer, optional
+        Number of workers. The default is None (see get_number_of_workers,
+        with the durations of the previous run of the stage in the reporter).
+    collector : LPCollector, optional
+        If given, the LPs of each task are collected by the worker and merged
+        in it. The default is None.
+    reporter : StageReporter, optional
+        If given, each task sends its record to it. The default is None.
+    stage : string, optional
+        Name of the stage for the reporter. The default is None (name of the function).
+    chunk_size : integer, optional
+        Maximal number of tasks in the pool at once. The default is None (all).
+
+    Yields
+    ------
+    integer
+        The position of the task in the arguments.
+    object
+        Its result.
+    """
+    arguments = list(arguments)
+    nb_tasks = len(arguments)
+    if costs is None:
+        costs = np.ones(nb_tasks)
+    costs = np.asarray(costs, dtype = float)
+    if chunk_size is None:
+        chunk_size = max(nb_tasks, 1)
+    order = np.argsort(-costs, kind = 'stable')
+    collect = collector is not None
+    report = reporter is not None
+    queue = None
+    durations = None
+    if report:
+        stage = function.__name__ if stage is None else stage
+        durations = reporter.get_durations(stage, nb_tasks)
+        queue = reporter.start_stage(stage, nb_tasks)
+    if processes is None:
+        processes = get_number_of_workers(costs, durations = durations)
+    with multiprocessing.Pool(processes = processes, initializer = _init_worker,
+                              initargs = (queue, initializer, initargs)) as pool:
+        #Filled by the result thread of the pool: a result or an exception.
+        finished = Queue()
+        def send(position):
+            task = (function, order[position], arguments[order[position]], collect, report)
+            pool.apply_async(_run_task, (task,), callback = finished.put,
+                             error_callback = finished.put)
+        nb_sent = min(chunk_size, nb_tasks)
+        for position in range(0, nb_sent):
+            send(position)
+        for _ in range(0, nb_tasks):
+            task_result = finished.get()
+            if isinstance(task_result, BaseException):
+                raise task_result
+            if nb_sent < nb_tasks:
+                send(nb_sent)
+                nb_sent += 1
+            i, result, collected = task_result
+            if collect:
+                collector.merge(collected)
+            yield i, result
+    if report:
+        reporter.end_stage()
+
+def _init_worker(queue, initializer, initargs):
+    """
+    Initialise a worker: the queue of the reporter, then the initializer of the stage.
+
+    Parameters
+    ----------
+    queue : SimpleQueue
+        The queue of the reporter, None if there is none.
+    initializer : callable
+        Initializer of the stage, None if there is none.
+    initargs : tuple
+        Arguments of the initializer.
+
+    Returns
+    -------
+    None.
+    """
+    init_worker(queue)
+    if initializer is not None:
+        initializer(*initargs)
+
+def _run_task(task):
+    """
+    Run one task and keep its position.
+
+    Parameters
+    ----------
+    task : tuple
+        The function, the position, the arguments, if the LPs are collected and
+        if the task is reported.
+
+    Returns
+    -------
+    integer
+        The position.
+    object
+        The result.
+    dict
+        What was collected, None if nothing.
+    """
+    function, i, arguments, collect, report = task
+    set_sampling_task(i)
+    if not collect and not report:
+        result = function(*arguments)
+        #The memo refers to the values of the task.
+        clear_recommendation_memo()
+        return i, result, None
+    start_time = time.time()
+    with LPCollector() as collector:
+        result = function(*arguments)
+    clear_recommendation_memo()
+    collected = collector.to_dict()
+    if report:
+        send_record(time.time() - start_time,
+                    sum(sum(nb_cells) for nb_cells in collected['cells']),
+                    collector.get_nb_lp(), collected['events'], i)
+    return i, result, collected if collect else None
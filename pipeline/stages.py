@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""Stages of the elicitation of a repetition (possibilist, l-out-of-n, MCS,
+epsilon), the whole pipeline of a repetition, and the files of the results."""
+
+import pickle
+import numpy as np
+from scipy.optimize import linprog
+from elicitation.elicitation import get_polytopes, get_recommendation, get_recommendations
+from alternatives.alternative_set import AlternativeSet, as_alternative_set
+from elicitation.models import ModelWeightedSum
+from elicitation.budget import Budget
+from elicitation.instrumentation import solve_lp, record_event
+from elicitation.polytope import Polytope
+from fusion.l_out_n import find_incorrect_answers, find_min_incorrect_answers, k_among_n_fusion
+from fusion.mcs import get_answers, find_all_maximum_coherent_subsets, update_possibility_list
+
+criteria = ("minimax regret", "maximax", "maximin")
+criteria_values = {"minimax regret": 'pmr', "maximax": 'max', "maximin": 'min'}
+cell_tolerance = 1e-9 #Of the cuts of the polytopes.
+error_margin = 1e-6 #Of the kept answers in the MILP of the number of errors, above the solver tolerance.
+
+def polytopes(model_values, confidence, A, b, time_budget = None, lp_budget = None,
+              quantized = False):
+    """
+    Polytopes of a repetition.
+    """
+    list_polytopes = get_polytopes(ModelWeightedSum(model_values), confidence, A, b,
+                                   reduced = True, budget = Budget(time_budget, lp_budget),
+                                   prune = True, quantized = quantized, tolerance = cell_tolerance)
+    return list_polytopes
+
+def recommendation_possibilist(polytope_list, possibility_list, alternatives,
+                               model_values, time_budget = None, lp_budget = None):
+    """
+    Possibilist recommendation of each criterion, and the values of the polytopes.
+    """
+    budget = Budget(time_budget, lp_budget)
+    res = get_recommendations(polytope_list, possibility_list, alternatives,
+                              ModelWeightedSum(model_values), budget = budget)
+    d = {}
+    for criterion in criteria:
+        d[criterion] = {}
+        d[criterion]['best_alternative_zero'] = res[criterion]['zero']["best_alternative"]
+        d[criterion]['real_regret_zero'] = res[criterion]['zero']["real_regret"]
+        d[criterion]['best_alternative_ignorance'] = res[criterion]['ignorance']["best_alternative"]
+        d[criterion]['real_regret_ignorance'] = res[criterion]['ignorance']["real_regret"]
+    d['value_list'] = res['value_list']
+    d['partial'] = budget.is_exhausted()
+    return d
+
+def get_number_errors(A, b, model_values, margin = error_margin):
+    """
+    Minimal number of incorrect answers (see find_min_incorrect_answers).
+    """
+    nb_detected_incorrect_answers = find_min_incorrect_answers(A, b, ModelWeightedSum(model_values),
+                                                               margin)
+    return nb_detected_incorrect_answers
+
+def l_out_of_n(polytope_list, nb_detected_incorrect_answers):
+    """
+    Possibility of each polytope after the l-out-of-n fusion. The number of
+    errors is at least the one of the least incorrect polytope, so that one
+    polytope keeps the possibility 1.
+    """
+    nb_polytope_errors = min(find_incorrect_answers(polytope_list))
+    if nb_detected_incorrect_answers < nb_polytope_errors:
+        record_event('l_out_of_n_undercount')
+        nb_detected_incorrect_answers = nb_polytope_errors
+    nb_questions = len(polytope_list[0].get_answers())
+    possibility_list = k_among_n_fusion(polytope_list, nb_questions - nb_detected_incorrect_answers,
+                                        nb_questions)
+    return possibility_list
+
+def recommendation_l_out_of_n(value_list, possibility_list, alternatives, model_values,
+                              criterion):
+    """
+    Recommendation of a criterion after the l-out-of-n fusion.
+    """
+    res = get_recommendation(value_list, possibility_list, alternatives,
+                             ModelWeightedSum(model_values), criterion,
+                             polytopes = False)
+    return res
+
+def list_all_mcs(polytope_list, confidence, time_budget = None, lp_budget = None):
+    """
+    All the maximum coherent subsets of answers.
+    """
+    nb_questions = len(confidence)
+    answers = get_answers(polytope_list, nb_questions)
+    budget = Budget(time_budget, lp_budget)
+    mcs_list = find_all_maximum_coherent_subsets(answers, nb_questions, budget)
+    d = {}
+    d['mcs'] = mcs_list
+    d['confidence'] = [confidence[mcs] for mcs in mcs_list]
+    d['confidence_mean'] = np.asarray([np.mean(confidence[mcs]) for mcs in mcs_list])
+    d['size'] = np.asarray([len(mcs) for mcs in mcs_list])
+    d['answers'] = answers
+    d['partial'] = budget.is_exhausted()
+    return d
+
+def recommendation_all_mcs(mcs_list, polytope_list, value_list, answers,
+                           alternatives, model_values, criterion):
+    """
+    Recommendation of a criterion with each maximum coherent subset.
+    """
+    model = ModelWeightedSum(model_values)
+    alternative_set = as_alternative_set(alternatives, model)
+    real_regret_list = []
+    for i in range(0, len(mcs_list)):
+        mcs = mcs_list[i]
+        updated_possibility_list = update_possibility_list(answers, mcs, "product")
+        real_regret_list.append(get_recommendation(value_list, updated_possibility_list,
+                                                   alternative_set, model,
+                                                   criterion, polytopes = False))
+    return real_regret_list
+
+def skipped_recommendation():
+    """
+    Recommendation of a skipped stage: l-out-of-n and MCS need all the
+    polytopes, they are skipped if the polytopes are partial.
+    """
+    return {'best_alternative': -1, 'real_regret': np.nan}
+
+def skipped_mcs():
+    """
+    Maximum coherent subsets of a skipped stage (see skipped_recommendation).
+    """
+    d = {}
+    d['mcs'] = []
+    d['confidence'] = []
+    d['confidence_mean'] = np.zeros(0)
+    d['size'] = np.zeros(0, dtype = int)
+    d['answers'] = None
+    d['partial'] = True
+    return d
+
+def epsilon_consistency(A_ub, b_ub, alternatives, model_values):
+    """
+    Recommendation of each criterion once the answers are relaxed to be consistent.
+    """
+    model = ModelWeightedSum(model_values)
+    constraints = model.get_model_constrainsts()
+    A_eq = constraints['A_eq']
+    b_eq = constraints['b_eq']
+    bounds = constraints['bounds']
+    n, p = A_ub.shape
+    c = np.ones((p+n,1))
+    c[0:p] = 0
+    A_ub_new = np.hstack((A_ub, -np.identity(n)))
+    A_eq_new = np.hstack((A_eq, np.ones((1,n))))
+    bounds_new = bounds
+    bounds_new = bounds_new + tuple((0, None) for _ in range(n))
+    linprog_res = solve_lp('epsilon_consistency', linprog, c, A_ub_new, b_ub, A_eq_new,
+                           b_eq, bounds_new, method = 'highs')
+    b_ub_new = b_ub + linprog_res.x[p:]
+    new_polytope = Polytope(A_ub,b_ub_new,A_eq,b_eq, bounds)
+    res = get_recommendations([new_polytope], [1], alternatives, model,
+                              inconsistency_types = ('zero',))
+    res = {criterion: res[criterion]['zero'] for criterion in criteria}
+    return res
+
+def run_repetition(alternatives, model_values, confidence, A, b,
+                   time_budget = None, lp_budget = None, quantized = False):
+    """
+    All the stages of a repetition, in one task. The alternatives are
+    prepared once for all the recommendations.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    model_values : array_like
+        Parameters of the model of the DM.
+    confidence : array_like
+        Confidence degrees of the answers.
+    A : array_like
+        2-D array of values representing A for the constrainsts of the answers Ax <= b.
+    b : array_like
+        1-D array of values representing b for the constrainsts of the answers Ax <= b.
+    time_budget : float, optional
+        Time budget of each stage, in seconds. The default is None.
+    lp_budget : integer, optional
+        LP budget of each stage. The default is None.
+    quantized : bool, optional
+        Possibilities in fixed point (see get_polytopes). The default is False.
+
+    Returns
+    -------
+    dict
+        Results of each stage, as used by write_results (without the polytopes).
+        If the polytopes are partial, l-out-of-n and MCS are skipped (see
+        skipped_recommendation).
+    """
+    alternative_set = AlternativeSet(alternatives, ModelWeightedSum(model_values))
+    polytope_res = polytopes(model_values, confidence, A, b, time_budget, lp_budget, quantized)
+    polytope_list = polytope_res.pop('polytope_list')
+    possibility_list = polytope_res.pop('possibility_list')
+    d = {}
+    d['polytopes'] = polytope_res
+    d['possibilist'] = recommendation_possibilist(polytope_list, possibility_list,
+                                                  alternative_set, model_values,
+                                                  time_budget, lp_budget)
+    value_list = d['possibilist'].pop('value_list')
+    d['number_errors'] = get_number_errors(A, b, model_values)
+    d['l_out_of_n'] = {}
+    d['mcs_recommendation'] = {}
+    if polytope_res['partial']:
+        d['mcs'] = skipped_mcs()
+        for criterion in criteria:
+            d['l_out_of_n'][criterion] = skipped_recommendation()
+            d['mcs_recommendation'][criterion] = []
+        d['epsilon'] = epsilon_consistency(A, b, alternative_set, model_values)
+        return d
+    l_out_of_n_possibility_list = l_out_of_n(polytope_list, d['number_errors'])
+    d['mcs'] = list_all_mcs(polytope_list, confidence, time_budget, lp_budget)
+    for criterion in criteria:
+        d['l_out_of_n'][criterion] = recommendation_l_out_of_n(value_list[criteria_values[criterion]],
+                                                               l_out_of_n_possibility_list,
+                                                               alternative_set, model_values,
+                                                               criterion)
+        d['mcs_recommendation'][criterion] = recommendation_all_mcs(d['mcs']['mcs'], polytope_list,
+                                                                    value_list[criteria_values[criterion]],
+                                                                    d['mcs']['answers'],
+                                                                    alternative_set, model_values,
+                                                                    criterion)
+    d['epsilon'] = epsilon_consistency(A, b, alternative_set, model_values)
+    return d
+
+def get_result_row(result):
+    """
+    What the result files keep of a repetition.
+
+    Parameters
+    ----------
+    result : dict
+        Results of a repetition, as given by run_repetition.
+
+    Returns
+    -------
+    dict
+        One entry per file (possibilist, l_out_of_n, mcs, epsilon), with the
+        values of the repetition for each key of the file.
+    """
+    row = {'possibilist': {}, 'l_out_of_n': {}, 'mcs': {}, 'epsilon': {}}
+    for criterion in criteria:
+        name = criterion.replace(' ', '_')
+        row['possibilist']['real_regret_' + name + '_zero'] = result['possibilist'][criterion]['real_regret_zero']
+        row['possibilist']['real_regret_' + name + '_ignorance'] = result['possibilist'][criterion]['real_regret_ignorance']
+    row['possibilist']['inconsistency'] = result['polytopes']['inconsistency'][-1]
+    row['possibilist']['partial'] = result['polytopes']['partial'] or result['possibilist']['partial']
+
+    for criterion in criteria:
+        row['l_out_of_n']['real_regret_' + criterion.replace(' ', '_') + '_l_out_of_n'] = result['l_out_of_n'][criterion]['real_regret']
+    row['l_out_of_n']['nb_errors_detected'] = result['number_errors']
+
+    for key in ('mcs', 'confidence', 'confidence_mean', 'size', 'partial'):
+        row['mcs'][key] = result['mcs'][key]
+    for criterion in criteria:
+        row['mcs']['real_regret_' + criterion.replace(' ', '_') + '_mcs'] = np.asarray([mcs['real_regret'] for mcs in result['mcs_recommendation'][criterion]])
+
+    for criterion in criteria:
+        row['epsilon']['real_regret_' + criterion.replace(' ', '_') + '_epsilon'] = result['epsilon'][criterion]['real_regret']
+    return row
+
+#Keys of the files kept as lists (one value of any size per repetition),
+#the others are arrays.
+list_keys = {'possibilist': (), 'l_out_of_n': ('nb_errors_detected',),
+             'mcs': ('mcs', 'confidence', 'confidence_mean', 'size',
+                     'real_regret_minimax_regret_mcs', 'real_regret_maximax_mcs',
+                     'real_regret_maximin_mcs'),
+             'epsilon': ()}
+
+def write_result_rows(path, rows):
+    """
+    Write possibilist.pk, l_out_of_n.pk, mcs.pk and epsilon.pk.
+
+    Parameters
+    ----------
+    path : string
+        Folder of the configuration.
+    rows : list
+        Row of each repetition, as given by get_result_row.
+
+    Returns
+    -------
+    None.
+    """
+    for name, keys in list_keys.items():
+        with open(path + name + '.pk','wb') as f:
+            d = {}
+            if len(rows) > 0:
+                for key in rows[0][name]:
+                    d[key] = [row[name][key] for row in rows]
+                    if key not in keys:
+                        d[key] = np.asarray(d[key])
+            pickle.dump(d,f)
+
+def write_results(path, results):
+    """
+    Write possibilist.pk, l_out_of_n.pk, mcs.pk and epsilon.pk.
+
+    Parameters
+    ----------
+    path : string
+        Folder of the configuration.
+    results : list
+        Results of each repetition, as given by run_repetition.
+
+    Returns
+    -------
+    None.
+    """
+    write_result_rows(path, [get_result_row(result) for result in results])
+
+def append_result_row(f, i, row):
+    """
+    Append the row of a repetition to an open stream file.
+
+    Parameters
+    ----------
+    f : file
+        The stream file, opened in 'ab'.
+    i : integer
+        Position of the repetition.
+    row : dict
+        Row of the repetition, as given by get_result_row.
+
+    Returns
+    -------
+    None.
+    """
+    pickle.dump((int(i), row), f)
+    f.flush()
+
+def read_result_rows(file_path):
+    """
+    Rows of a stream file, in the order of the repetitions.
+
+    Parameters
+    ----------
+    file_path : string
+        The stream file.
+
+    Returns
+    -------
+    dict
+        Row of each repetition written, by position.
+    """
+    rows = {}
+    with open(file_path, 'rb') as f:
+        while True:
+            try:
+                i, row = pickle.load(f)
+            except EOFError:
+                break
+            rows[i] = row
+    return dict(sorted(rows.items()))
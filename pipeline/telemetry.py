@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""Progress and telemetry of the stages: workers send a record per task on a
+queue, drained by a reporter thread in the parent."""
+
+import os
+import sys
+import json
+import time
+import threading
+import multiprocessing
+import numpy as np
+try:
+    import resource
+except ImportError: #Not on Windows: no peak RSS.
+    resource = None
+
+_queue = None
+
+class StageReporter:
+    """
+    Report the progress of a stage (throughput, ETA) from the records of its
+    tasks, then summarise it (latencies, memory, cells) in a run log.
+    """
+
+    def __init__(self, log_path = None, interval = 10):
+        """
+        Parameters
+        ----------
+        log_path : string, optional
+            JSON lines file of the summary of each stage. They are written in
+            log_path + '.tmp', which replaces it on close: if the run stops
+            before, the summaries of the previous run are kept (they give the
+            durations of the tasks). The default is None (no log).
+        interval : float, optional
+            Minimal time between two progress lines, in seconds. The default is 10.
+        """
+        self._log_path = log_path
+        self._interval = interval
+        self._queue = None
+        self._thread = None
+        self._stage = None
+        self._nb_tasks = 0
+        self._records = []
+        self._start_time = None
+        self._previous_summaries = {}
+        if log_path is not None:
+            try:
+                with open(log_path, 'r') as f:
+                    for line in f:
+                        summary = json.loads(line)
+                        self._previous_summaries[summary['stage']] = summary
+            except (IOError, ValueError):
+                self._previous_summaries = {}
+            open(log_path + '.tmp', 'w').close()
+
+    def start_stage(self, stage, nb_tasks):
+        """
+        Start draining the records of a stage.
+
+        Parameters
+        ----------
+        stage : string
+            Name of the stage.
+        nb_tasks : integer
+            Number of tasks of the stage.
+
+        Returns
+        -------
+        SimpleQueue
+            The queue on which the workers send their records.
+
+        """
+        self._stage = stage
+        self._nb_tasks = nb_tasks
+        self._records = []
+        self._queue = multiprocessing.SimpleQueue()
+        self._start_time = time.time()
+        self._thread = threading.Thread(target = self._drain, daemon = True)
+        self._thread.start()
+        return self._queue
+
+    def end_stage(self):
+        """
+        Stop draining, print the summary of the stage and log it.
+
+        Returns
+        -------
+        dict
+            The summary of the stage.
+
+        """
+        self._queue.put(None)
+        self._thread.join()
+        summary = self.get_summary()
+        print(format_summary(summary))
+        if self._log_path is not None:
+            with open(self._log_path + '.tmp', 'a') as f:
+                f.write(json.dumps(summary) + '\n')
+        self._queue = None
+        self._thread = None
+        return summary
+
+    def close(self):
+        """
+        Replace the log by the summaries of this run.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._log_path is not None:
+            os.replace(self._log_path + '.tmp', self._log_path)
+
+    def get_durations(self, stage, nb_tasks):
+        """
+        Durations of the tasks of a stage in the previous run (from the log).
+
+        Parameters
+        ----------
+        stage : string
+            Name of the stage.
+        nb_tasks : integer
+            Number of tasks of the stage.
+
+        Returns
+        -------
+        array_like
+            The duration of each task, in seconds, None if they are not all
+            known for this number of tasks.
+
+        """
+        durations = self._previous_summaries.get(stage, {}).get('durations')
+        if durations is None or len(durations) != nb_tasks or None in durations:
+            return None
+        return np.asarray(durations, dtype = float)
+
+    def get_summary(self):
+        """
+        Summarise the records of the stage.
+
+        Returns
+        -------
+        dict
+            Number of tasks, time, throughput, latencies, peak RSS per worker
+            (in KB, empty if unknown), cells, LPs and the duration of each task (by position, None if
+            unknown).
+
+        """
+        duration = time.time() - self._start_time
+        latencies = np.asarray([record['time'] for record in self._records])
+        peak_rss = {}
+        for record in self._records:
+            if record['peak_rss'] is not None:
+                pid = str(record['pid'])
+                peak_rss[pid] = max(peak_rss.get(pid, 0), record['peak_rss'])
+        d = {}
+        d['stage'] = self._stage
+        d['nb_tasks'] = len(self._records)
+        d['time'] = duration
+        d['throughput'] = len(self._records) / duration if duration > 0 else 0.0
+        d['latency_p50'] = float(np.percentile(latencies, 50)) if len(latencies) > 0 else 0.0
+        d['latency_p95'] = float(np.percentile(latencies, 95)) if len(latencies) > 0 else 0.0
+        d['latency_max'] = float(np.max(latencies)) if len(latencies) > 0 else 0.0
+        d['peak_rss'] = peak_rss
+        d['nb_cells'] = int(sum(record['nb_cells'] for record in self._records))
+        d['nb_lp'] = int(sum(record['nb_lp'] for record in self._records))
+        d['durations'] = [None] * self._nb_tasks
+        for record in self._records:
+            if record['task'] is not None and record['task'] < self._nb_tasks:
+                d['durations'][record['task']] = record['time']
+        d['events'] = {}
+        for record in self._records:
+            for event, nb in record['events'].items():
+                d['events'][event] = d['events'].get(event, 0) + nb
+        return d
+
+    def _drain(self):
+        """
+        Receive the records until the end of the stage, printing the progress
+        at most every interval seconds.
+        """
+        last_print = time.time()
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            self._records.append(record)
+            now = time.time()
+            if now - last_print >= self._interval:
+                last_print = now
+                print(format_progress(self._stage, len(self._records), self._nb_tasks,
+                                      now - self._start_time), flush = True)
+
+def format_progress(stage, nb_done, nb_tasks, duration):
+    """
+    Progress line of a stage.
+
+    Parameters
+    ----------
+    stage : string
+        Name of the stage.
+    nb_done : integer
+        Number of finished tasks.
+    nb_tasks : integer
+        Number of tasks.
+    duration : float
+        Time since the start of the stage.
+
+    Returns
+    -------
+    string
+        The progress line.
+
+    """
+    throughput = nb_done / duration if duration > 0 else 0.0
+    eta = (nb_tasks - nb_done) / throughput if throughput > 0 else float('inf')
+    return "%s: %d/%d tasks, %.2f tasks/s, ETA %.0f s" % (stage, nb_done, nb_tasks,
+                                                          throughput, eta)
+
+def format_summary(summary):
+    """
+    Summary line of a stage.
+
+    Parameters
+    ----------
+    summary : dict
+        The summary of the stage.
+
+    Returns
+    -------
+    string
+        The summary line.
+
+    """
+    if summary['peak_rss']:
+        peak_rss = "%.0f MB" % (max(summary['peak_rss'].values()) / 1024)
+    else:
+        peak_rss = "unknown"
+    line = ("%s: %d tasks in %.2f s (%.2f tasks/s), latency p50 %.3f s p95 %.3f s, "
+            "peak RSS %s, %d cells, %d LPs") % (summary['stage'], summary['nb_tasks'],
+                                               summary['time'], summary['throughput'],
+                                               summary['latency_p50'], summary['latency_p95'],
+                                               peak_rss, summary['nb_cells'],
+                                               summary['nb_lp'])
+    for name, event in (('memo', 'recommendation_memo'), ('LP cache', 'lp_cache')):
+        nb_hits = summary['events'].get(event + '_hit', 0)
+        nb_misses = summary['events'].get(event + '_miss', 0)
+        if nb_hits + nb_misses > 0:
+            line += ", %s hits %d/%d" % (name, nb_hits, nb_hits + nb_misses)
+    nb_screened = summary['events'].get('screening_alternative', 0)
+    if nb_screened > 0:
+        line += ", escalated alternatives %d/%d, ambiguous %d/%d" % (
+            summary['events'].get('screening_escalation', 0), nb_screened,
+            summary['events'].get('screening_ambiguous', 0),
+            summary['events'].get('screening_recommendation', 0))
+    return line
+
+def init_worker(queue):
+    """
+    Keep the queue of the stage in a worker.
+
+    Parameters
+    ----------
+    queue : SimpleQueue
+        The queue of the stage.
+
+    Returns
+    -------
+    None.
+
+    """
+    global _queue
+    _queue = queue
+
+def send_record(duration, nb_cells, nb_lp, events = None, task = None):
+    """
+    Send the record of a task from a worker, if there is a reporter.
+
+    Parameters
+    ----------
+    duration : float
+        Time of the task, in seconds.
+    nb_cells : integer
+        Number of cells processed by the task.
+    nb_lp : integer
+        Number of LPs solved by the task.
+    events : dict, optional
+        Number of times each event happened in the task. The default is None.
+    task : integer, optional
+        Position of the task in the stage. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    if _queue is None:
+        return
+    record = {}
+    record['pid'] = multiprocessing.current_process().pid
+    record['time'] = duration
+    record['peak_rss'] = get_peak_rss()
+    record['nb_cells'] = nb_cells
+    record['nb_lp'] = nb_lp
+    record['events'] = {} if events is None else events
+    record['task'] = None if task is None else int(task)
+    _queue.put(record)
+
+def get_peak_rss():
+    """
+    Peak resident memory of the process.
+
+    Returns
+    -------
+    float
+        The peak RSS in KB, None if unknown (no resource module, on Windows).
+
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Bytes on macOS, KB on Linux.
+    if sys.platform == 'darwin':
+        return peak_rss / 1024
+    return peak_rss
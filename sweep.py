@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Datasets and elicitations of a grid of configurations, in one shared pool.
+
+The alternatives, models and pareto efficient alternatives are made once for
+all the configurations with the same criteria, repetitions and alternatives,
+and the confidence degrees once for all the configurations with the same type
+of confidence, repetitions and questions, each with its own random generator
+(see get_rng). A configuration whose dataset.pk exists keeps it."""
+
+import os
+import time
+import zlib
+import pickle
+from functools import partial
+import numpy as np
+from alternatives.data_preparation import generate_alternatives_score, get_pareto_efficient_mask_batch
+from elicitation.models import ModelWeightedSum
+from elicitation.elicitation import make_questions_random_batch
+from elicitation.dm import get_confidence_rational
+from elicitation.dataset import get_dataset_constrainsts
+from elicitation.lp_cache import LPCache
+from elicitation.choice_calculation import set_evaluation
+from pipeline.config import make_configurations
+from pipeline.scheduling import estimate_costs, run_stage
+from pipeline.telemetry import StageReporter
+from pipeline.stages import run_repetition, write_results
+
+grid = {'nb_parameters': [4],
+        'nb_questions': [5, 10, 15],
+        'conf_type': ['uniform'],
+        'nb_repetitions': [300],
+        'nb_alternatives': [50]}
+seed = 0
+time_budget = None #Per repetition and stage, in seconds.
+lp_budget = None #Per repetition and stage.
+log_path = 'data/sweep_log.jsonl'
+lp_cache = False #Cache the values of the cells solved with LPs, in each worker.
+lp_cache_path = None #Folder where the cache is also kept, for the next runs.
+quantized = False #Possibilities in fixed point, in units of 1e-4.
+nb_samples = None #Samples of each cell instead of LPs: approximate values, for many criteria.
+
+def get_rng(key):
+    """
+    Random generator of some data, from the seed and the key of the data: the
+    streams of different data are independent, and do not depend on the order
+    of the configurations.
+
+    Parameters
+    ----------
+    key : tuple
+        What is drawn and the parameters it depends on.
+
+    Returns
+    -------
+    RandomState
+        The generator.
+    """
+    seed_sequence = np.random.SeedSequence([seed, zlib.crc32(repr(key).encode())])
+    return np.random.RandomState(np.random.MT19937(seed_sequence))
+
+def get_alternatives(nb_parameters, nb_repetitions, nb_alternatives, rng):
+    """
+    Alternatives, models of the DM and pareto efficient alternatives of each repetition.
+
+    Parameters
+    ----------
+    nb_parameters : integer
+        Number of criteria.
+    nb_repetitions : integer
+        Number of repetitions.
+    nb_alternatives : integer
+        Number of alternatives.
+    rng : RandomState
+        Random generator.
+
+    Returns
+    -------
+    dict
+        Alternatives ('alternatives'), models ('model') and pareto masks ('pareto_mask').
+    """
+    alternatives_all = np.zeros((nb_repetitions, nb_alternatives, nb_parameters))
+    for i in range(0, nb_repetitions):
+        alternatives_all[i,:,:] = generate_alternatives_score(nb_alternatives,
+                                                              nb_parameters = nb_parameters,
+                                                              value = nb_parameters/2,
+                                                              rng = rng)
+    d = {}
+    d['alternatives'] = alternatives_all
+    d['model'] = rng.dirichlet(np.ones(nb_parameters), size = nb_repetitions)
+    d['pareto_mask'] = get_pareto_efficient_mask_batch(alternatives_all)
+    return d
+
+def get_dataset(configuration, shared):
+    """
+    Dataset of a configuration, from its dataset.pk if it exists, otherwise
+    made from the shared data and saved.
+
+    Parameters
+    ----------
+    configuration : dict
+        The configuration.
+    shared : dict
+        Data already made for other configurations, updated.
+
+    Returns
+    -------
+    dict
+        The dataset, as made by make_datasets.py.
+    """
+    path = configuration['path']
+    if os.path.exists(path + 'dataset.pk'):
+        with open(path + 'dataset.pk','rb') as f:
+            return pickle.load(f)
+
+    key = ('alternatives', configuration['nb_parameters'], configuration['nb_repetitions'],
+           configuration['nb_alternatives'])
+    if key not in shared:
+        shared[key] = get_alternatives(configuration['nb_parameters'],
+                                       configuration['nb_repetitions'],
+                                       configuration['nb_alternatives'], get_rng(key))
+    alternatives = shared[key]
+    key = ('confidence', configuration['conf_type'], configuration['nb_repetitions'],
+           configuration['nb_questions'])
+    if key not in shared:
+        shared[key] = get_confidence_rational(configuration['conf_type'],
+                                              configuration['nb_repetitions'],
+                                              configuration['nb_questions'], get_rng(key))
+    confidence_values_all, rational_all = shared[key]
+
+    key = ('questions', configuration['nb_parameters'], configuration['conf_type'],
+           configuration['nb_repetitions'], configuration['nb_questions'],
+           configuration['nb_alternatives'])
+    dataset = make_questions_random_batch(alternatives['alternatives'], alternatives['model'],
+                                          configuration['nb_questions'], rational_all,
+                                          ModelWeightedSum,
+                                          pareto_mask_all = alternatives['pareto_mask'],
+                                          rng = get_rng(key))
+    d = {}
+    d['alternatives'] = alternatives['alternatives']
+    d['model'] = alternatives['model']
+    d['confidence'] = confidence_values_all
+    d['rational'] = rational_all
+    d['questions'] = dataset['questions']
+    if not os.path.exists(path):
+        os.makedirs(path)
+    with open(path + 'dataset.pk','wb') as f:
+        pickle.dump(d,f)
+    return d
+
+def run_sweep(configurations):
+    """
+    Elicitations of all the repetitions of all the configurations, as one
+    stage, then the results of each configuration in its folder.
+
+    Parameters
+    ----------
+    configurations : list
+        The configurations, as given by make_configurations.
+
+    Returns
+    -------
+    None.
+    """
+    shared = {}
+    arguments = []
+    costs = []
+    slices = []
+    for configuration in configurations:
+        d = get_dataset(configuration, shared)
+        A_all, b_all = get_dataset_constrainsts(d, ModelWeightedSum)
+        start = len(arguments)
+        arguments.extend(zip(d['alternatives'], d['model'], d['confidence'], A_all, b_all))
+        costs.extend(estimate_costs(d['rational']))
+        slices.append(slice(start, len(arguments)))
+
+    reporter = StageReporter(log_path)
+    start_time = time.time()
+    cache = LPCache(path = lp_cache_path) if lp_cache else None
+    results = run_stage(partial(run_repetition, time_budget = time_budget, lp_budget = lp_budget,
+                                quantized = quantized),
+                        arguments, costs, initializer = set_evaluation,
+                        initargs = (cache, nb_samples, seed),
+                        reporter = reporter, stage = 'sweep')
+    print("Time sweep: ", time.time() - start_time)
+    for configuration, configuration_slice in zip(configurations, slices):
+        write_results(configuration['path'], results[configuration_slice])
+
+if __name__ == '__main__':
+
+    if not os.path.exists('data'):
+        os.makedirs('data')
+    run_sweep(make_configurations(grid))
@@ -7,11 +7,12 @@ Created on Thu Apr  6 15:43:55 2023
 
 import numpy as np
 from scipy.stats import wilcoxon
+from pipeline.config import get_data_path
 
 conf_type = 'strong'
 nb_questions = 15
 nb_parameters = 4
-path_data = 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
+path_data = get_data_path(nb_parameters, conf_type, nb_questions)
 path_results = 'results/comparison_uncertainty_strategy/'
 
 if __name__ == '__main__':
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Number of errors of the l-out-of-n fusion."""
+
+import numpy as np
+from elicitation.models import ModelWeightedSum
+from elicitation.elicitation import get_polytopes
+from fusion.l_out_n import find_incorrect_answers, find_min_incorrect_answers, k_among_n_fusion
+from pipeline.stages import (l_out_of_n, recommendation_possibilist, recommendation_l_out_of_n,
+                             criteria, criteria_values)
+
+#Repetition 126 of the sweep dataset with 3 criteria, 3 questions, 200
+#repetitions, 8 alternatives and seed 10: the answers only hold on a set
+#without interior, so a margin under the solver tolerance finds no error.
+A = np.asarray([[ 0.09865065953038765,  0.9343910377563227 , -0.9656473843109662 ],
+                [ 0.2046283521076997 , -0.4483659358419296 ,  0.1950629141616782 ],
+                [-0.30327901163808735, -0.4860251019143932 ,  0.770584470149288  ]])
+b = np.zeros(3)
+model_values = np.asarray([0.28540520228385446, 0.563271313895558, 0.1513234838205875])
+confidence = np.asarray([0.28, 0.43, 0.37])
+
+def get_polytope_list():
+    model = ModelWeightedSum(model_values)
+    return get_polytopes(model, confidence, A, b, reduced = True, prune = True)['polytope_list']
+
+def test_min_incorrect_answers_as_polytopes():
+    polytope_list = get_polytope_list()
+    nb_errors = find_min_incorrect_answers(A, b, ModelWeightedSum(model_values))
+    assert nb_errors == min(find_incorrect_answers(polytope_list)) == 1
+
+def test_l_out_of_n_keeps_full_possibility():
+    polytope_list = get_polytope_list()
+    assert np.max(l_out_of_n(polytope_list, 0)) == 1
+
+def test_recommendation_without_full_possibility():
+    polytope_list = get_polytope_list()
+    alternatives = np.random.default_rng(0).uniform(size = (6, 3))
+    possibilist = recommendation_possibilist(polytope_list, [polytope.get_possibility()
+                                                             for polytope in polytope_list],
+                                             alternatives, model_values)
+    #All the answers correct: no polytope has the possibility 1 (an array).
+    possibility_list = k_among_n_fusion(polytope_list, 3, 3)
+    assert np.max(possibility_list) < 1
+    for criterion in criteria:
+        res = recommendation_l_out_of_n(possibilist['value_list'][criteria_values[criterion]],
+                                        possibility_list, alternatives, model_values, criterion)
+        assert 0 <= res['best_alternative'] < len(alternatives)
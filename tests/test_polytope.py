@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Sides of the constrainsts on the polytopes."""
+
+import numpy as np
+from elicitation.geometry import ReducedSpace
+from elicitation.polytope import Polytope, classify_constrainst, remove_redundant_constrainsts
+
+A_eq = np.ones((1, 3))
+b_eq = np.ones(1)
+bounds = [(0, 1)] * 3
+
+def test_classify_empty_polytope():
+    #x0 <= -0.5 on the simplex: the polytope is empty.
+    polytope = Polytope(np.asarray([[1., 0., 0.]]), np.asarray([-0.5]), A_eq, b_eq, bounds)
+    side, degenerate = classify_constrainst(polytope, [0., 1., 0.], 0.5)
+    assert side is None and degenerate
+    side, degenerate = classify_constrainst(polytope, [0., 1., 0.], 0.5,
+                                            ReducedSpace(A_eq, b_eq, bounds))
+    assert side is None and degenerate
+
+def test_classify_empty_vertices():
+    polytope = Polytope(None, None, A_eq, b_eq, bounds, vertices = np.zeros((0, 3)))
+    side, _ = classify_constrainst(polytope, [0., 1., 0.], 0.5)
+    assert side is None
+
+def test_classify_sides():
+    polytope = Polytope(np.asarray([[1., 0., 0.]]), np.asarray([0.5]), A_eq, b_eq, bounds)
+    assert classify_constrainst(polytope, [1., 0., 0.], 0.8)[0] == 1
+    assert classify_constrainst(polytope, [-1., 0., 0.], -0.8)[0] == -1
+    assert classify_constrainst(polytope, [0., 1., 0.], 0.5)[0] == 0
+
+def test_remove_redundant_same_vertex():
+    #The segment x0 = 0.2, x1 <= 0.5, with the end x1 = 0.5 given twice, and a
+    #vertex doubled within 1e-6: the segment seems to be a polygon.
+    A_ub = np.asarray([[1., 0., 0.], [-1., 0., 0.], [0., 1., 0.], [0., 2., 0.]])
+    b_ub = np.asarray([0.2, -0.2, 0.5, 1.])
+    vertices = np.asarray([[0.2, 0., 0.8], [0.2 + 1e-6, 0., 0.8 - 1e-6], [0.2, 0.5, 0.3]])
+    for space in (None, ReducedSpace(A_eq, b_eq, bounds)):
+        polytope = Polytope(A_ub, b_ub, A_eq, b_eq, bounds, vertices = vertices)
+        assert remove_redundant_constrainsts(polytope, space) == 1
+        #One of the two ends is kept.
+        assert np.sum(polytope.get_constrainsts()[0][:,1] > 0) == 1
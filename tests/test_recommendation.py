@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Recommendations from the values of the polytopes."""
+
+import numpy as np
+from elicitation.models import ModelWeightedSum
+from elicitation.elicitation import (get_recommendation, get_recommendations,
+                                     clear_recommendation_memo)
+from elicitation.instrumentation import LPCollector
+from test_l_out_n import get_polytope_list, model_values
+
+def test_memo_on_new_arrays():
+    polytope_list = get_polytope_list()
+    possibility_list = [polytope.get_possibility() for polytope in polytope_list]
+    alternatives = np.random.default_rng(1).uniform(size = (8, 3))
+    model = ModelWeightedSum(model_values)
+    values = get_recommendations(polytope_list, possibility_list, alternatives, model,
+                                 inconsistency_types = ('zero',))['value_list']
+    clear_recommendation_memo()
+    with LPCollector() as collector:
+        #New lists and arrays each time: the AlternativeSet is built again.
+        res = [get_recommendation(list(values['pmr']), list(possibility_list), alternatives.copy(),
+                                  model, polytopes = False) for _ in range(0, 2)]
+        get_recommendation(list(values['pmr']), [possibility / 2 for possibility in possibility_list],
+                           alternatives.copy(), model, polytopes = False)
+    events = collector.to_dict()['events']
+    assert res[0]['best_alternative'] == res[1]['best_alternative']
+    assert events['recommendation_memo_hit'] == 1
+    assert events['recommendation_memo_miss'] == 2